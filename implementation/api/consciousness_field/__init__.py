@@ -10,6 +10,11 @@ from .field_operator import (
     DoubleSlitSimulator,
     demonstrate_consciousness_field
 )
+from .phi_monitor import (
+    StreamingPhiMonitor,
+    PhiActivationEvent,
+    demonstrate_streaming_monitor
+)
 
 __all__ = [
     'PhiActivationCalculator',
@@ -17,7 +22,10 @@ __all__ = [
     'ConsciousnessFieldOperator',
     'QuantumConsciousnessState',
     'DoubleSlitSimulator', 
-    'demonstrate_consciousness_field'
+    'demonstrate_consciousness_field',
+    'StreamingPhiMonitor',
+    'PhiActivationEvent',
+    'demonstrate_streaming_monitor'
 ]
 
 __version__ = "1.0.0"
@@ -0,0 +1,246 @@
+import time
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+COMPONENTS = ('learning_capacity', 'choice_capability', 'educational_participation')
+
+@dataclass
+class PhiActivationEvent:
+    """Threshold crossing of windowed φ(S) for a single subject"""
+    subject_id: str
+    event_type: str  # 'activation' or 'deactivation'
+    phi_total: float
+    timestamp: float
+
+class StreamingPhiMonitor:
+    """
+    Sliding-window φ(S) = LC(S) × CC(S) × EP(S) monitor over live state streams
+    Keeps per-subject ring buffers with running sums so every sample costs O(1)
+    """
+
+    def __init__(self, window_size: int = 32,
+                 activation_threshold: float = 0.8,
+                 deactivation_threshold: Optional[float] = None,
+                 component_thresholds: Optional[Dict[str, float]] = None,
+                 component_scale: float = 1.0,
+                 initial_capacity: int = 1024,
+                 on_event: Optional[Callable[[PhiActivationEvent], None]] = None):
+        if window_size < 1:
+            raise ValueError("window_size must be at least 1")
+
+        self.window_size = window_size
+        self.activation_threshold = activation_threshold
+        # Hysteresis: subjects deactivate only once φ drops below this level
+        self.deactivation_threshold = (activation_threshold if deactivation_threshold is None
+                                       else deactivation_threshold)
+        self.component_scale = component_scale
+        self.on_event = on_event
+
+        # Optional per-component minimums in sample units, e.g. ConsciousnessActivationSystem's
+        # {'learning_capacity': 60, 'choice_capability': 50, 'educational_participation': 70}
+        # with component_scale=100
+        self.component_thresholds = dict(component_thresholds or {})
+        self._component_minimums = np.array([
+            self.component_thresholds.get(name, -np.inf) for name in COMPONENTS
+        ]) / component_scale
+
+        self._index: Dict[str, int] = {}
+        self._subject_ids: List[str] = []
+        self._allocate(max(1, initial_capacity))
+
+    def _allocate(self, capacity: int, n_existing: int = 0):
+        """Allocate (or grow) per-subject window storage"""
+        # Columns: learning capacity, choice capability, educational participation, φ
+        buffer = np.zeros((capacity, self.window_size, 4))
+        sums = np.zeros((capacity, 4))
+        counts = np.zeros(capacity, dtype=np.int64)
+        heads = np.zeros(capacity, dtype=np.int64)
+        activated = np.zeros(capacity, dtype=bool)
+
+        n = n_existing
+        if n:
+            buffer[:n] = self._buffer[:n]
+            sums[:n] = self._sums[:n]
+            counts[:n] = self._counts[:n]
+            heads[:n] = self._heads[:n]
+            activated[:n] = self._activated[:n]
+
+        self._buffer, self._sums = buffer, sums
+        self._counts, self._heads, self._activated = counts, heads, activated
+
+    def _subject_indices(self, subject_ids: Sequence[str]) -> np.ndarray:
+        """Map subject ids to row indices, registering unseen subjects"""
+        indices = np.empty(len(subject_ids), dtype=np.int64)
+        for k, subject_id in enumerate(subject_ids):
+            index = self._index.get(subject_id)
+            if index is None:
+                index = len(self._subject_ids)
+                self._index[subject_id] = index
+                self._subject_ids.append(subject_id)
+            indices[k] = index
+
+        if len(self._subject_ids) > len(self._counts):
+            self._allocate(max(len(self._subject_ids), 2 * len(self._counts)),
+                           n_existing=len(self._counts))
+        return indices
+
+    def update(self, subject_id: str, learning_capacity: float,
+               choice_capability: float, educational_participation: float,
+               timestamp: Optional[float] = None) -> Optional[PhiActivationEvent]:
+        """Push one measurement; returns an event if the subject crossed a threshold"""
+        events = self.update_batch([subject_id], [learning_capacity], [choice_capability],
+                                   [educational_participation],
+                                   None if timestamp is None else [timestamp])
+        return events[0] if events else None
+
+    def update_batch(self, subject_ids: Sequence[str],
+                     learning_capacity: Sequence[float],
+                     choice_capability: Sequence[float],
+                     educational_participation: Sequence[float],
+                     timestamps: Optional[Sequence[float]] = None) -> List[PhiActivationEvent]:
+        """
+        Push a batch of measurements for many subjects in one vectorized pass
+        Samples are applied in order; repeated subjects are handled in successive rounds
+        """
+        indices = self._subject_indices(subject_ids)
+        components = np.column_stack([
+            np.asarray(learning_capacity, dtype=float),
+            np.asarray(choice_capability, dtype=float),
+            np.asarray(educational_participation, dtype=float)
+        ]) / self.component_scale
+        values = np.column_stack([components, np.prod(components, axis=1)])
+
+        if timestamps is None:
+            timestamps = np.full(len(indices), time.time())
+        else:
+            timestamps = np.asarray(timestamps, dtype=float)
+
+        # Occurrence rank of each sample within its subject (stable, so order is kept)
+        order = np.argsort(indices, kind='stable')
+        sorted_indices = indices[order]
+        group_start = np.r_[0, np.flatnonzero(np.diff(sorted_indices)) + 1]
+        group_sizes = np.diff(np.r_[group_start, len(sorted_indices)])
+        ranks = np.empty(len(indices), dtype=np.int64)
+        ranks[order] = np.arange(len(indices)) - np.repeat(group_start, group_sizes)
+
+        events = []
+        for rank in range(int(ranks.max()) + 1 if len(ranks) else 0):
+            selected = np.flatnonzero(ranks == rank)
+            events.extend(self._apply(indices[selected], values[selected], timestamps[selected]))
+
+        return events
+
+    def _apply(self, rows: np.ndarray, values: np.ndarray,
+               timestamps: np.ndarray) -> List[PhiActivationEvent]:
+        """Apply one sample to each of a set of distinct subjects"""
+        heads = self._heads[rows]
+        full = self._counts[rows] == self.window_size
+
+        # Running sums: add entering sample, retract the one it overwrites
+        leaving = np.where(full[:, None], self._buffer[rows, heads], 0.0)
+        self._sums[rows] += values - leaving
+        self._buffer[rows, heads] = values
+        self._counts[rows] = np.minimum(self._counts[rows] + 1, self.window_size)
+        self._heads[rows] = (heads + 1) % self.window_size
+
+        # Re-sum once per full window to keep floating-point drift bounded
+        wrapped = rows[self._heads[rows] == 0]
+        if len(wrapped):
+            self._sums[wrapped] = self._buffer[wrapped].sum(axis=1)
+
+        means = self._sums[rows] / self._counts[rows, None]
+        phi = means[:, 3]
+        components_ok = np.all(means[:, :3] >= self._component_minimums, axis=1)
+
+        was_active = self._activated[rows]
+        now_active = np.where(was_active,
+                              phi >= self.deactivation_threshold,
+                              phi >= self.activation_threshold) & components_ok
+        self._activated[rows] = now_active
+
+        events = []
+        for k in np.flatnonzero(now_active != was_active):
+            event = PhiActivationEvent(
+                subject_id=self._subject_ids[rows[k]],
+                event_type='activation' if now_active[k] else 'deactivation',
+                phi_total=float(phi[k]),
+                timestamp=float(timestamps[k])
+            )
+            if self.on_event is not None:
+                self.on_event(event)
+            events.append(event)
+
+        return events
+
+    def windowed_phi(self, subject_id: str) -> Dict:
+        """Current windowed φ(S) for a subject, in calculate_consciousness_activation format"""
+        index = self._index.get(subject_id)
+        if index is None or self._counts[index] == 0:
+            raise KeyError(f"No samples recorded for subject: {subject_id}")
+
+        means = self._sums[index] / self._counts[index]
+        return {
+            'phi_total': float(means[3]),
+            'activated': bool(self._activated[index]),
+            'components': {name: float(means[i] * self.component_scale)
+                           for i, name in enumerate(COMPONENTS)},
+            'sample_count': int(self._counts[index])
+        }
+
+    def windowed_phi_all(self) -> np.ndarray:
+        """Windowed φ(S) for every registered subject (NaN where no samples yet)"""
+        n = len(self._subject_ids)
+        counts = self._counts[:n]
+        phi = np.full(n, np.nan)
+        observed = counts > 0
+        phi[observed] = self._sums[:n, 3][observed] / counts[observed]
+        return phi
+
+    def active_subjects(self) -> List[str]:
+        """Subjects currently above the activation threshold"""
+        n = len(self._subject_ids)
+        return [self._subject_ids[i] for i in np.flatnonzero(self._activated[:n])]
+
+    def reset(self, subject_id: str):
+        """Clear the window of a single subject"""
+        index = self._index.get(subject_id)
+        if index is None:
+            return
+        self._buffer[index] = 0.0
+        self._sums[index] = 0.0
+        self._counts[index] = 0
+        self._heads[index] = 0
+        self._activated[index] = False
+
+    @property
+    def subject_count(self) -> int:
+        return len(self._subject_ids)
+
+# Example usage
+def demonstrate_streaming_monitor():
+    """Demonstrate streaming φ(S) monitoring over many subjects"""
+    monitor = StreamingPhiMonitor(window_size=16, activation_threshold=0.8,
+                                  deactivation_threshold=0.75)
+
+    n_subjects = 2000
+    subject_ids = [f"subject_{i}" for i in range(n_subjects)]
+    base_levels = np.random.uniform(0.85, 0.99, n_subjects)
+
+    events = []
+    for step in range(64):
+        noise = np.random.normal(0, 0.02, (3, n_subjects))
+        levels = np.clip(base_levels + noise, 0.0, 1.0)
+        events.extend(monitor.update_batch(subject_ids, *levels, timestamps=np.full(n_subjects, step)))
+
+    activations = sum(1 for e in events if e.event_type == 'activation')
+    deactivations = len(events) - activations
+
+    print(f"Subjects monitored: {monitor.subject_count}")
+    print(f"Activation events: {activations}, deactivation events: {deactivations}")
+    print(f"Currently active: {len(monitor.active_subjects())}")
+    print(f"subject_0: {monitor.windowed_phi('subject_0')}")
+    return monitor
+
+if __name__ == "__main__":
+    demonstrate_streaming_monitor()
@@ -9,12 +9,35 @@ from .geodesic_navigator import (
     LearningPathVisualizer,
     demonstrate_educational_navigation
 )
+from .metric_field import (
+    MetricField,
+    ConstantMetric,
+    ComplexityMetric,
+    CallableMetric,
+    PolynomialMetric,
+    ChristoffelGridCache
+)
+from .geodesic_cache import GeodesicCache
+from .learning_curves import fit_retention_curves, fit_skill_curves
+from .curriculum_planner import CurriculumGraph
+from .metric_learning import MetricEstimator
 
 __all__ = [
     'EducationalManifold',
     'LearningState', 
     'LearningPathVisualizer',
-    'demonstrate_educational_navigation'
+    'demonstrate_educational_navigation',
+    'MetricField',
+    'ConstantMetric',
+    'ComplexityMetric',
+    'CallableMetric',
+    'PolynomialMetric',
+    'ChristoffelGridCache',
+    'GeodesicCache',
+    'fit_retention_curves',
+    'fit_skill_curves',
+    'CurriculumGraph',
+    'MetricEstimator'
 ]
 
 __version__ = "1.0.0"
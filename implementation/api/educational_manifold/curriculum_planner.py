@@ -0,0 +1,221 @@
+import heapq
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+from scipy.spatial import cKDTree
+from typing import Dict, Optional
+
+class CurriculumGraph:
+    """
+    Discrete curriculum over the educational manifold
+    Nodes are knowledge states (courses, modules, grid cells); undirected edges are
+    weighted by the metric length of the step times a complexity penalty. Queries run
+    A* with the larger of a metric lower bound and ALT landmark bounds as heuristic
+    """
+
+    def __init__(self, manifold, states: np.ndarray, edges: np.ndarray,
+                 complexity_penalty: float = 1.0, n_landmarks: int = 16,
+                 chunk_size: int = 100000, seed: Optional[int] = None):
+        self.manifold = manifold
+        self.states = np.asarray(states, dtype=float)
+        self.n_nodes = len(self.states)
+        self.complexity_penalty = complexity_penalty
+        self._tree = None
+        self._best = None
+        self._parent = None
+
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        edges = edges[edges[:, 0] != edges[:, 1]]
+        weights = self._edge_weights(edges, chunk_size)
+
+        # Symmetric CSR adjacency; duplicate edges keep their cheapest weight
+        rows = np.concatenate([edges[:, 0], edges[:, 1]])
+        cols = np.concatenate([edges[:, 1], edges[:, 0]])
+        data = np.concatenate([weights, weights])
+        order = np.lexsort((data, cols, rows))
+        rows, cols, data = rows[order], cols[order], data[order]
+        unique = np.r_[True, (np.diff(rows) != 0) | (np.diff(cols) != 0)]
+        self.adjacency = csr_matrix((data[unique], (rows[unique], cols[unique])),
+                                    shape=(self.n_nodes, self.n_nodes))
+        self._indptr = self.adjacency.indptr
+        self._indices = self.adjacency.indices
+        self._weights = self.adjacency.data
+
+        # Every edge costs at least this much per unit of Euclidean length, so
+        # the scaled straight-line distance never overestimates the remaining cost
+        step_lengths = np.linalg.norm(self.states[edges[:, 1]] - self.states[edges[:, 0]], axis=1)
+        ratios = weights / np.where(step_lengths > 0, step_lengths, np.inf)
+        self.cost_per_length = float(ratios.min()) if len(ratios) else 0.0
+
+        self.landmarks = np.zeros(0, dtype=np.int64)
+        self.landmark_distances = np.zeros((self.n_nodes, 0))
+        if n_landmarks > 0 and self.n_nodes > 1:
+            self.select_landmarks(n_landmarks, seed)
+
+    @classmethod
+    def from_grid(cls, manifold, lower=0.0, upper=1.0, resolution: int = 10, **kwargs) -> "CurriculumGraph":
+        """Regular grid over a box of knowledge space with axis-neighbour edges"""
+        dimension = manifold.dimension
+        lower = np.broadcast_to(np.asarray(lower, dtype=float), (dimension,))
+        upper = np.broadcast_to(np.asarray(upper, dtype=float), (dimension,))
+        axes = [np.linspace(lower[k], upper[k], resolution) for k in range(dimension)]
+        states = np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1).reshape(-1, dimension)
+
+        index = np.arange(len(states)).reshape((resolution,) * dimension)
+        edges = []
+        for k in range(dimension):
+            head = np.take(index, np.arange(resolution - 1), axis=k).ravel()
+            tail = np.take(index, np.arange(1, resolution), axis=k).ravel()
+            edges.append(np.column_stack([head, tail]))
+        return cls(manifold, states, np.concatenate(edges), **kwargs)
+
+    @classmethod
+    def from_states(cls, manifold, states: np.ndarray, n_neighbors: int = 8, **kwargs) -> "CurriculumGraph":
+        """Catalog of knowledge states connected to their nearest neighbours"""
+        states = np.asarray(states, dtype=float)
+        k = min(n_neighbors + 1, len(states))
+        _, neighbours = cKDTree(states).query(states, k=k)
+        neighbours = np.atleast_2d(neighbours)
+        edges = np.column_stack([np.repeat(np.arange(len(states)), k - 1), neighbours[:, 1:].ravel()])
+        return cls(manifold, states, edges, **kwargs)
+
+    def _edge_weights(self, edges: np.ndarray, chunk_size: int) -> np.ndarray:
+        """Midpoint-rule metric length × (1 + penalty × complexity), evaluated in chunks"""
+        weights = np.empty(len(edges))
+        for begin in range(0, len(edges), chunk_size):
+            chunk = edges[begin:begin + chunk_size]
+            head, tail = self.states[chunk[:, 0]], self.states[chunk[:, 1]]
+            midpoint, step = 0.5 * (head + tail), tail - head
+
+            # Riemannian counterpart |g| = V|Λ|Vᵀ keeps time-like steps positive
+            eigenvalues, eigenvectors = np.linalg.eigh(self.manifold.metric_field.metric(midpoint))
+            projected = np.einsum('...ji,...j->...i', eigenvectors, step)
+            length = np.sqrt(np.sum(np.abs(eigenvalues) * projected**2, axis=-1))
+
+            complexity = self.manifold.calculate_complexity_profile(midpoint)
+            weights[begin:begin + len(chunk)] = length * (1.0 + self.complexity_penalty * complexity)
+        return weights
+
+    def select_landmarks(self, n_landmarks: int, seed: Optional[int] = None):
+        """Farthest-point landmark selection with one Dijkstra sweep per landmark"""
+        rng = np.random.default_rng(seed)
+        landmarks = [int(rng.integers(self.n_nodes))]
+        distances = []
+        for _ in range(n_landmarks):
+            sweep = dijkstra(self.adjacency, directed=False, indices=landmarks[-1])
+            distances.append(sweep)
+            # Next landmark: the reachable node farthest from every landmark so far
+            nearest = np.min(np.where(np.isfinite(distances), distances, -np.inf), axis=0)
+            candidate = int(np.argmax(nearest))
+            if len(distances) == n_landmarks or candidate in landmarks:
+                break
+            landmarks.append(candidate)
+
+        self.landmarks = np.array(landmarks[:len(distances)], dtype=np.int64)
+        # Node-major layout: one contiguous row per node for neighbour lookups. Unreachable
+        # nodes get a huge finite distance so bounds across components stay well defined
+        distances = np.stack(distances, axis=1)
+        self.landmark_distances = np.ascontiguousarray(np.where(np.isfinite(distances), distances, 1e300))
+
+    def heuristic(self, nodes: np.ndarray, target: int) -> np.ndarray:
+        """Admissible, consistent lower bound on the remaining cost to the target"""
+        return self._bound(np.asarray(nodes), self.states[target], self.landmark_distances[target])
+
+    def _bound(self, nodes: np.ndarray, target_state: np.ndarray,
+               target_landmarks: np.ndarray) -> np.ndarray:
+        """Larger of the metric lower bound and the ALT bounds of every landmark"""
+        offset = self.states[nodes] - target_state
+        bound = self.cost_per_length * np.sqrt(np.einsum('...i,...i->...', offset, offset))
+        if len(target_landmarks):
+            # Triangle inequality per landmark: |d(L, t) − d(L, v)| ≤ d(v, t)
+            difference = np.abs(self.landmark_distances[nodes] - target_landmarks)
+            bound = np.maximum(bound, difference.max(axis=-1))
+        return bound
+
+    def nearest_node(self, state: np.ndarray) -> int:
+        """Graph node closest to a continuous knowledge state"""
+        if self._tree is None:
+            self._tree = cKDTree(self.states)
+        return int(self._tree.query(np.asarray(state, dtype=float))[1])
+
+    def shortest_path(self, source: int, target: int) -> Dict:
+        """A* between two node indices"""
+        indptr, indices, weights = self._indptr, self._indices, self._weights
+        if self._best is None:
+            # Search state persists between queries; only touched entries are reset
+            self._best = np.full(self.n_nodes, np.inf)
+            self._parent = np.full(self.n_nodes, -1, dtype=np.int64)
+        best, parent = self._best, self._parent
+        target_state, target_landmarks = self.states[target], self.landmark_distances[target]
+
+        best[source] = 0.0
+        touched = [np.array([source])]
+        heap = [(float(self.heuristic(np.array([source]), target)[0]), 0.0, source)]
+        expanded = 0
+
+        while heap:
+            _, negative_cost, node = heapq.heappop(heap)
+            if node == target:
+                break
+            if -negative_cost > best[node]:
+                continue  # Stale entry superseded by a cheaper one
+            expanded += 1
+
+            begin, end = indptr[node], indptr[node + 1]
+            neighbours = indices[begin:end]
+            costs = best[node] + weights[begin:end]
+            improved = costs < best[neighbours]
+            if not improved.any():
+                continue
+            neighbours, costs = neighbours[improved], costs[improved]
+            best[neighbours] = costs
+            parent[neighbours] = node
+            touched.append(neighbours)
+
+            # Equal estimates favour the deeper node
+            estimates = costs + self._bound(neighbours, target_state, target_landmarks)
+            for neighbour, cost, estimate in zip(neighbours.tolist(), costs.tolist(), estimates.tolist()):
+                heapq.heappush(heap, (estimate, -cost, neighbour))
+
+        cost = float(best[target])
+        found = np.isfinite(cost)
+        path = []
+        if found:
+            node = target
+            while node != -1:
+                path.append(node)
+                node = int(parent[node]) if node != source else -1
+            path.reverse()
+
+        touched = np.concatenate(touched)
+        best[touched] = np.inf
+        parent[touched] = -1
+
+        return {
+            'path': np.array(path, dtype=np.int64),
+            'states': self.states[path] if found else np.zeros((0, self.states.shape[1])),
+            'cost': cost,
+            'found': found,
+            'nodes_expanded': expanded
+        }
+
+    def plan(self, start: np.ndarray, target: np.ndarray) -> Dict:
+        """Optimal learning sequence between the nodes nearest two knowledge states"""
+        return self.shortest_path(self.nearest_node(start), self.nearest_node(target))
+
+# Example usage
+def demonstrate_curriculum_planning():
+    """Plan a learning sequence over a gridded 3D knowledge space"""
+    from .geodesic_navigator import EducationalManifold
+
+    manifold = EducationalManifold(dimension=3)
+    graph = CurriculumGraph.from_grid(manifold, 0.0, 1.0, resolution=40, seed=0)
+    result = graph.plan([0.1, 0.2, 0.1], [0.9, 0.8, 0.7])
+
+    print(f"Curriculum nodes: {graph.n_nodes}, landmarks: {len(graph.landmarks)}")
+    print(f"Sequence length: {len(result['path'])}, cost: {result['cost']:.3f}")
+    print(f"Nodes expanded: {result['nodes_expanded']}")
+    return result
+
+if __name__ == "__main__":
+    demonstrate_curriculum_planning()
@@ -0,0 +1,155 @@
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+class GeodesicCache:
+    """
+    LRU/TTL memo of geodesic results keyed by quantized (start, target)
+    Optionally serves near misses by shifting a cached neighbour's path
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl: Optional[float] = None,
+                 quantization: float = 1e-3, interpolation_tolerance: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.quantization = quantization
+        self.interpolation_tolerance = interpolation_tolerance
+
+        # key -> (inserted_at, start, target, result)
+        self._entries: "OrderedDict[Tuple, Tuple[float, np.ndarray, np.ndarray, Dict]]" = OrderedDict()
+        self._endpoint_matrix = None  # Stacked (start, target) rows for neighbour search
+        self._endpoint_keys = []
+
+        self.hits = 0
+        self.interpolated_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def make_key(self, start: np.ndarray, target: np.ndarray, *context: Hashable) -> Tuple:
+        """Quantized cache key; context carries dimension, metric version and solver options"""
+        quantized = np.round(np.concatenate([start, target]) / self.quantization).astype(np.int64)
+        return (tuple(quantized.tolist()),) + context
+
+    def get(self, key: Tuple, start: np.ndarray, target: np.ndarray) -> Optional[Dict]:
+        """Cached result for the key, an interpolated neighbour, or None"""
+        entry = self._entries.get(key)
+        if entry is not None and self._expired(entry):
+            self._remove(key)
+            self.expirations += 1
+            entry = None
+
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(self._copy_result(entry[3]), cache_hit='exact')
+
+        if self.interpolation_tolerance is not None:
+            result = self._interpolate(key, start, target)
+            if result is not None:
+                self.interpolated_hits += 1
+                return self._copy_result(result)
+
+        self.misses += 1
+        return None
+
+    def put(self, key: Tuple, start: np.ndarray, target: np.ndarray, result: Dict):
+        """Store a freshly computed result, evicting the least recently used entry"""
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic(), np.array(start, dtype=float),
+                              np.array(target, dtype=float), self._copy_result(result, frozen=True))
+        self._endpoint_matrix = None
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    @staticmethod
+    def _copy_result(result: Dict, frozen: bool = False) -> Dict:
+        """
+        Result with its arrays copied, so callers and the cache never share a buffer
+        Stored copies are made read-only; copies handed out are writable
+        """
+        copied = dict(result)
+        for name, value in result.items():
+            if isinstance(value, np.ndarray):
+                copied[name] = value.copy()
+                copied[name].flags.writeable = not frozen
+        return copied
+
+    def _interpolate(self, key: Tuple, start: np.ndarray, target: np.ndarray) -> Optional[Dict]:
+        """Shift the nearest cached path with the same context onto the new endpoints"""
+        if not self._entries:
+            return None
+        if self._endpoint_matrix is None:
+            self._endpoint_keys = list(self._entries.keys())
+            self._endpoint_matrix = np.array([np.concatenate([entry[1], entry[2]])
+                                              for entry in self._entries.values()])
+
+        query = np.concatenate([start, target])
+        if self._endpoint_matrix.shape[1] != len(query):
+            return None
+        # Chebyshev distance: every coordinate must lie within tolerance
+        distances = np.max(np.abs(self._endpoint_matrix - query), axis=1)
+        for index in np.argsort(distances):
+            if distances[index] > self.interpolation_tolerance:
+                return None
+            neighbour_key = self._endpoint_keys[index]
+            if neighbour_key[1:] != key[1:] or neighbour_key not in self._entries:
+                continue
+            entry = self._entries[neighbour_key]
+            if self._expired(entry):
+                continue
+            self._entries.move_to_end(neighbour_key)
+            return self._shift_result(entry[3], start - entry[1], target - entry[2], start, target)
+        return None
+
+    @staticmethod
+    def _shift_result(result: Dict, start_shift: np.ndarray, target_shift: np.ndarray,
+                      start: np.ndarray, target: np.ndarray) -> Dict:
+        """Blend endpoint shifts along the path so it runs from start to target"""
+        time_points = result['time']
+        fraction = (time_points / time_points[-1] if time_points[-1] > 0
+                    else np.zeros_like(time_points))[:, None]
+        trajectory = result['trajectory'] + start_shift * (1 - fraction) + target_shift * fraction
+
+        optimal_distance = np.linalg.norm(start - target)
+        actual_distance = np.linalg.norm(trajectory[-1] - target)
+        shifted = dict(result)
+        shifted.update({
+            'trajectory': trajectory,
+            'final_position': trajectory[-1],
+            'efficiency': 1.0 - actual_distance / optimal_distance if optimal_distance > 0 else 1.0,
+            'cache_hit': 'interpolated'
+        })
+        if 'velocity' in result and time_points[-1] > 0:
+            shifted['velocity'] = result['velocity'] + (target_shift - start_shift) / time_points[-1]
+        return shifted
+
+    def _expired(self, entry) -> bool:
+        return self.ttl is not None and time.monotonic() - entry[0] > self.ttl
+
+    def _remove(self, key: Tuple):
+        del self._entries[key]
+        self._endpoint_matrix = None
+
+    def clear(self):
+        self._entries.clear()
+        self._endpoint_matrix = None
+
+    def statistics(self) -> Dict:
+        """Hit/miss counters for sizing the cache"""
+        lookups = self.hits + self.interpolated_hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'interpolated_hits': self.interpolated_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_rate': (self.hits + self.interpolated_hits) / lookups if lookups else 0.0
+        }
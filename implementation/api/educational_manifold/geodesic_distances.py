@@ -0,0 +1,106 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from scipy.sparse.csgraph import dijkstra
+from scipy.spatial.distance import cdist
+from typing import Optional
+
+from .curriculum_planner import CurriculumGraph
+
+# Graph and output shipped once to each process-pool worker of the Dijkstra sweeps
+_worker_adjacency = None
+_worker_output = None
+
+def _initialize_distance_worker(adjacency, output_path):
+    global _worker_adjacency, _worker_output
+    _worker_adjacency = adjacency
+    _worker_output = np.load(output_path, mmap_mode='r+') if output_path is not None else None
+
+def _graph_distance_block(begin: int, end: int, n_states: int):
+    block = dijkstra(_worker_adjacency, directed=False, indices=np.arange(begin, end))[:, :n_states]
+    if _worker_output is None:
+        return block
+    _worker_output[begin:end] = block
+    _worker_output.flush()
+    return None
+
+def metric_square_root(metric: np.ndarray) -> np.ndarray:
+    """Symmetric square root of |g| = V|Λ|Vᵀ, so that |g|-lengths become Euclidean"""
+    eigenvalues, eigenvectors = np.linalg.eigh(np.asarray(metric, dtype=float))
+    return (eigenvectors * np.sqrt(np.abs(eigenvalues))) @ eigenvectors.T
+
+def geodesic_distance_matrix(manifold, states: np.ndarray, out=None, block_size: int = 512,
+                             n_neighbors: int = 10, n_auxiliary: int = 0, dtype=np.float64,
+                             n_workers: Optional[int] = 1, seed: Optional[int] = None) -> np.ndarray:
+    """
+    All-pairs geodesic distances between knowledge states, written in row blocks
+    Lengths use the Riemannian counterpart |g| of the metric, as in CurriculumGraph.
+    Flat metrics have straight geodesics and an exact closed form; curved metrics
+    are approximated by shortest paths on a kNN graph, optionally densified with
+    n_auxiliary uniform states in the cohort's bounding box. Pairs in different
+    graph components are infinite. Graph row blocks are computed serially, or in a
+    process pool of n_workers (None: one per CPU).
+
+    out is None (in-memory array), an (N, N) array to fill, or a path for a .npy
+    memmap that np.load(path, mmap_mode='r') reopens without loading it all
+    """
+    states = np.asarray(states, dtype=float)
+    n_states = len(states)
+    if states.ndim != 2 or states.shape[1] != manifold.dimension:
+        raise ValueError(f"Expected states of shape (N, {manifold.dimension})")
+
+    output_path = None
+    if out is None:
+        out = np.empty((n_states, n_states), dtype=dtype)
+    elif isinstance(out, (str, Path)):
+        output_path = Path(out)
+        out = np.lib.format.open_memmap(output_path, mode='w+', dtype=dtype, shape=(n_states, n_states))
+    elif out.shape != (n_states, n_states):
+        raise ValueError(f"Output must have shape ({n_states}, {n_states})")
+
+    if manifold.metric_field.is_flat:
+        transformed = states @ metric_square_root(manifold.metric_field.metric(states[:1])[0])
+        for begin in range(0, n_states, block_size):
+            out[begin:begin + block_size] = cdist(transformed[begin:begin + block_size], transformed)
+    else:
+        _graph_distances(manifold, states, out, output_path, block_size,
+                         n_neighbors, n_auxiliary, n_workers, seed)
+
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
+
+def _graph_distances(manifold, states: np.ndarray, out: np.ndarray, output_path: Optional[Path],
+                     block_size: int, n_neighbors: int, n_auxiliary: int,
+                     n_workers: Optional[int], seed: Optional[int]):
+    """Row blocks of multi-source Dijkstra over the kNN graph of the cohort"""
+    n_states = len(states)
+    nodes = states
+    if n_auxiliary > 0:
+        rng = np.random.default_rng(seed)
+        auxiliary = rng.uniform(states.min(axis=0), states.max(axis=0), (n_auxiliary, states.shape[1]))
+        nodes = np.vstack([states, auxiliary])  # Cohort first: its rows are columns [:N]
+    adjacency = CurriculumGraph.from_states(manifold, nodes, n_neighbors=n_neighbors,
+                                            complexity_penalty=0.0, n_landmarks=0).adjacency
+
+    blocks = [(begin, min(begin + block_size, n_states)) for begin in range(0, n_states, block_size)]
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = min(n_workers, len(blocks))
+    if n_workers > 1:
+        # Workers write memmap rows themselves; in-memory blocks come back to the parent
+        if output_path is not None:
+            out.flush()
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_initialize_distance_worker,
+                                 initargs=(adjacency, output_path)) as pool:
+            futures = [(begin, end, pool.submit(_graph_distance_block, begin, end, n_states))
+                       for begin, end in blocks]
+            for begin, end, future in futures:
+                block = future.result()
+                if block is not None:
+                    out[begin:end] = block
+        return
+
+    for begin, end in blocks:
+        out[begin:end] = dijkstra(adjacency, directed=False, indices=np.arange(begin, end))[:, :n_states]
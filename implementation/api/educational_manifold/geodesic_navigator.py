@@ -1,15 +1,71 @@
+import copy
+import os
+import pickle
 import numpy as np
-from scipy.integrate import solve_ivp
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from scipy.integrate import solve_ivp, solve_bvp, OdeSolution
+from scipy.optimize import minimize, root
+from typing import Dict, List, Optional
 import matplotlib.pyplot as plt
 
+from .metric_field import MetricField, ConstantMetric, ChristoffelGridCache
+from .geodesic_cache import GeodesicCache
+from . import learning_curves, path_compression
+from .geodesic_distances import geodesic_distance_matrix
+
+# Dormand–Prince 5(4) tableau for the batch integrator
+_DP_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+    [35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84]
+]
+_DP_B = np.array([35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84, 0.0])
+_DP_E = _DP_B - np.array([5179/57600, 0.0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40])
+
+GEODESIC_OUTPUT_MODES = ('full', 'endpoints', 'resampled', 'simplified')
+
+# Manifold shipped once to each process-pool worker of find_optimal_learning_path
+_worker_manifold = None
+
+def _initialize_path_worker(manifold):
+    global _worker_manifold
+    _worker_manifold = manifold
+
+def _refine_path_candidate(start, target, initial_velocity, limits, max_evaluations):
+    return _worker_manifold._refine_path_candidate(start, target, initial_velocity,
+                                                   limits, max_evaluations)
+
 class EducationalManifold:
     """Implementation of educational manifold 𝔼 = (M, g, ∇)"""
     
-    def __init__(self, dimension: int = 5):
+    def __init__(self, dimension: int = 5, metric_field: Optional[MetricField] = None):
         self.dimension = dimension
+        self.convergence_tolerance = 0.01
+        self.near_target_radius = 1e-3  # Attraction becomes linear inside this radius
+        self.bvp_warm_start_radius = 0.2
+        self.bvp_warm_start_capacity = 256
+        self._bvp_solutions = []
         self.metric_tensor = self._initialize_metric()
         self.complexity_weights = self._compute_complexity_weights()
         
+        # Position-dependent metric g(x); the constant metric_tensor is the flat default
+        self.metric_field = metric_field or ConstantMetric(self.metric_tensor)
+        self.metric_version = 0
+        self._christoffel_cache = None
+        self._geodesic_cache = None
+        self._metric_picklable = None  # (metric version, whether the metric field pickles)
+        
+        # Learning-curve constants (days); fit_*_curves estimates them per learner
+        self.retention_tau = learning_curves.RETENTION_TAU
+        self.retention_asymptote = learning_curves.RETENTION_ASYMPTOTE
+        self.acquisition_tau = learning_curves.ACQUISITION_TAU
+        self.skill_beta = learning_curves.SKILL_BETA
+        
     def _initialize_metric(self) -> np.ndarray:
         """Initialize educational space metric tensor"""
         metric = np.eye(self.dimension)
@@ -20,37 +76,818 @@ class EducationalManifold:
         """Compute complexity weights for different dimensions"""
         return np.array([1.0 + 0.3 * i for i in range(self.dimension)])
     
+    def set_metric_field(self, metric_field: MetricField):
+        """Replace the metric field and invalidate everything derived from it"""
+        if metric_field.dimension != self.dimension:
+            raise ValueError(f"Metric field dimension {metric_field.dimension} "
+                             f"does not match manifold dimension {self.dimension}")
+        self.metric_field = metric_field
+        self.metric_version += 1
+        self._bvp_solutions = []
+        if self._geodesic_cache is not None:
+            self._geodesic_cache.clear()
+        if self._christoffel_cache is not None:
+            cache = self._christoffel_cache
+            self.enable_christoffel_cache(cache.lower, cache.upper, cache.resolution)
+    
+    def enable_christoffel_cache(self, lower=0.0, upper=1.0, resolution: int = 8):
+        """Cache Christoffel symbols on a grid over [lower, upper]^dimension for the geodesic RHS"""
+        self._christoffel_cache = ChristoffelGridCache(self.metric_field, lower, upper, resolution)
+        return self._christoffel_cache
+    
+    def enable_geodesic_cache(self, max_entries: int = 4096, ttl: Optional[float] = None,
+                              quantization: float = 1e-3,
+                              interpolation_tolerance: Optional[float] = None) -> GeodesicCache:
+        """
+        Memoize compute_learning_geodesic by quantized (start, target), dimension, metric
+        version and the solver options that change the path
+        With interpolation_tolerance set, near misses reuse a shifted neighbouring path
+        """
+        self._geodesic_cache = GeodesicCache(max_entries, ttl, quantization, interpolation_tolerance)
+        return self._geodesic_cache
+    
+    def disable_geodesic_cache(self):
+        self._geodesic_cache = None
+    
+    def geodesic_cache_statistics(self) -> Dict:
+        """Hit/miss statistics of the geodesic cache"""
+        if self._geodesic_cache is None:
+            return {'enabled': False}
+        return dict(self._geodesic_cache.statistics(), enabled=True)
+    
+    def compute_christoffel_symbols(self, position: np.ndarray) -> np.ndarray:
+        """Christoffel symbols Γ^m_ij at one position (d, d, d) or a batch (..., d, d, d)"""
+        if self._christoffel_cache is not None and not self.metric_field.is_flat:
+            return self._christoffel_cache.christoffel_symbols(position)
+        return self.metric_field.christoffel_symbols(position)
+    
     def compute_learning_geodesic(self, start: np.ndarray, target: np.ndarray, 
-                                max_time: float = 100.0) -> Dict:
-        """Compute geodesic - optimal learning path"""
+                                max_time: float = 100.0, dense_output: bool = False,
+                                output: str = 'full', n_output_points: int = 101,
+                                simplify_tolerance: float = 1e-3) -> Dict:
+        """
+        Compute geodesic - optimal learning path
+        Integration stops at the first terminal event inside the convergence tolerance.
+        output selects the returned samples: 'full' (every solver step), 'endpoints',
+        'resampled' (n_output_points uniform in time) or 'simplified' (Ramer–Douglas–Peucker
+        within simplify_tolerance); the cache always holds the full path
+        """
+        if output not in GEODESIC_OUTPUT_MODES:
+            raise ValueError(f"output must be one of {GEODESIC_OUTPUT_MODES}, got {output!r}")
+        start = np.asarray(start, dtype=float)
+        target = np.asarray(target, dtype=float)
+        
+        # Dense interpolants are not memoized
+        cache_key = None
+        if self._geodesic_cache is not None and not dense_output:
+            cache_key = self._geodesic_cache.make_key(start, target, self.dimension, self.metric_version,
+                                                      max_time, self.convergence_tolerance,
+                                                      self.near_target_radius)
+            cached = self._geodesic_cache.get(cache_key, start, target)
+            if cached is not None:
+                if cached['cache_hit'] == 'interpolated':
+                    cached['complexity_profile'] = self.calculate_complexity_profile(cached['trajectory'])
+                return self._compress_geodesic_output(cached, target, output, n_output_points,
+                                                      simplify_tolerance)
+        
+        result = self._integrate_learning_geodesic(
+            start, target, self._optimal_initial_direction(start, target), max_time, dense_output)
+        
+        if cache_key is not None:
+            self._geodesic_cache.put(cache_key, start, target, result)
+        
+        return self._compress_geodesic_output(result, target, output, n_output_points, simplify_tolerance)
+    
+    def _compress_geodesic_output(self, result: Dict, target: np.ndarray, output: str,
+                                  n_output_points: int, simplify_tolerance: float) -> Dict:
+        """Reduce the per-step samples of a geodesic result to the requested output mode"""
+        if output == 'full':
+            return result
+        
+        time_points, trajectory, velocity = result['time'], result['trajectory'], result['velocity']
+        if output == 'resampled' and result.get('dense_solution') is not None:
+            time_points = np.linspace(time_points[0], time_points[-1], n_output_points)
+            states = result['dense_solution'](time_points)
+            trajectory, velocity = states[:self.dimension].T, states[self.dimension:].T
+            complexity_profile = self.calculate_complexity_profile(trajectory)
+        elif output == 'resampled':
+            trajectory, velocity, time_points = self._resample_geodesic(
+                time_points, trajectory, velocity, target, n_output_points)
+            complexity_profile = self.calculate_complexity_profile(trajectory)
+        else:
+            if output == 'endpoints':
+                kept = np.unique([0, len(time_points) - 1])
+            else:
+                kept = path_compression.simplify_path(trajectory, simplify_tolerance)
+            trajectory, velocity, time_points = trajectory[kept], velocity[kept], time_points[kept]
+            complexity_profile = result['complexity_profile'][kept]
+        
+        compressed = dict(result)
+        compressed.update({
+            'trajectory': trajectory,
+            'velocity': velocity,
+            'time': time_points,
+            'complexity_profile': complexity_profile,
+            'output': output,
+            'solver_points': len(result['time'])
+        })
+        return compressed
+    
+    def _resample_geodesic(self, time_points: np.ndarray, trajectory: np.ndarray,
+                           velocity: np.ndarray, target: np.ndarray, n_points: int):
+        """Cubic Hermite resampling of solver steps onto a uniform time grid"""
+        grid = np.linspace(time_points[0], time_points[-1], n_points)
+        if len(time_points) < 2:
+            return (np.repeat(trajectory[:1], n_points, axis=0),
+                    np.repeat(velocity[:1], n_points, axis=0), grid)
+        
+        # Position derivatives are the stored velocities; velocity derivatives the geodesic RHS
+        acceleration = self._geodesic_acceleration(trajectory, velocity, target)
+        step = np.clip(np.searchsorted(time_points, grid, side='right') - 1, 0, len(time_points) - 2)
+        dt = (time_points[step + 1] - time_points[step])[:, None]
+        fraction = (grid - time_points[step])[:, None] / dt
+        positions = self._hermite_interpolate(trajectory[step], velocity[step], trajectory[step + 1],
+                                              velocity[step + 1], dt, fraction)
+        velocities = self._hermite_interpolate(velocity[step], acceleration[step], velocity[step + 1],
+                                               acceleration[step + 1], dt, fraction)
+        return positions, velocities, grid
+    
+    def _integrate_learning_geodesic(self, start: np.ndarray, target: np.ndarray,
+                                     initial_velocity: np.ndarray, max_time: float,
+                                     dense_output: bool = False,
+                                     max_complexity: Optional[float] = None) -> Dict:
+        """
+        Integrate the geodesic from a given initial velocity with terminal events
+        With max_complexity set, integration is cut off as soon as the path crosses it
+        """
+        tolerance = self.convergence_tolerance
         
         def geodesic_equation(t, y):
             """Geodesic equation in educational space"""
             positions = y[:self.dimension]
             velocities = y[self.dimension:]
             
-            # Simplified implementation
-            acceleration = -0.1 * (positions - target) / np.linalg.norm(positions - target)
+            acceleration = self._geodesic_acceleration(positions, velocities, target)
             
             return np.concatenate([velocities, acceleration])
         
-        initial_velocity = self._optimal_initial_direction(start, target)
+        def target_reached(t, y):
+            """Learner enters the convergence tolerance around the target"""
+            return np.linalg.norm(y[:self.dimension] - target) - tolerance
+        target_reached.terminal = True
+        target_reached.direction = -1
+        
+        # Large steps can fly through the tolerance sphere between two event checks,
+        # so every closest approach and turning point also ends a segment
+        def closest_approach(t, y):
+            """Radial velocity turns from approaching to receding"""
+            return np.dot(y[:self.dimension] - target, y[self.dimension:])
+        closest_approach.terminal = True
+        closest_approach.direction = 1
+        
+        def turning_point(t, y):
+            """Radial velocity turns from receding to approaching"""
+            return np.dot(y[:self.dimension] - target, y[self.dimension:])
+        turning_point.terminal = True
+        turning_point.direction = -1
+        
+        events = [target_reached, None]
+        if max_complexity is not None:
+            def complexity_exceeded(t, y):
+                """Path climbs above the complexity limit"""
+                return self.calculate_complexity_profile(y[:self.dimension]) - max_complexity
+            complexity_exceeded.terminal = True
+            complexity_exceeded.direction = 1
+            events.append(complexity_exceeded)
+        
         y0 = np.concatenate([start, initial_velocity])
         
-        solution = solve_ivp(geodesic_equation, [0, max_time], y0, 
-                           method='RK45', dense_output=True)
+        times, states, segments = [np.zeros(1)], [y0[:, None]], []
+        rhs_evaluations = 0
+        converged = np.linalg.norm(start - target) < tolerance
+        # A start already above the limit never crosses it upwards, so check it directly
+        pruned = (max_complexity is not None and not converged and
+                  self.calculate_complexity_profile(start) > max_complexity)
+        approaching = np.dot(start - target, initial_velocity) <= 0
+        t_start = 0.0
+        
+        while not converged and not pruned and t_start < max_time:
+            events[1] = closest_approach if approaching else turning_point
+            solution = solve_ivp(geodesic_equation, [t_start, max_time], y0, 
+                               method='RK45', dense_output=dense_output, events=events)
+            
+            rhs_evaluations += solution.nfev
+            times.append(solution.t[1:])
+            states.append(solution.y[:, 1:])
+            if dense_output:
+                segments.append(solution.sol)
+            
+            if solution.status != 1:
+                break
+            
+            y0, t_start = solution.y[:, -1], solution.t[-1]
+            converged = (solution.t_events[0].size > 0 or
+                         np.linalg.norm(y0[:self.dimension] - target) < tolerance)
+            if not converged and max_complexity is not None and solution.t_events[2].size > 0:
+                pruned = True
+                break
+            approaching = not approaching
         
-        trajectory = solution.y[:self.dimension].T
+        time = np.concatenate(times)
+        states = np.concatenate(states, axis=1)
+        trajectory = states[:self.dimension].T
         efficiency = self._calculate_learning_efficiency(trajectory, target)
         
-        return {
+        result = {
             'trajectory': trajectory,
-            'time': solution.t,
+            'velocity': states[self.dimension:].T,
+            'time': time,
             'efficiency': efficiency,
             'final_position': trajectory[-1],
-            'converged': np.linalg.norm(trajectory[-1] - target) < 0.01
+            'converged': bool(converged),
+            'complexity_profile': self.calculate_complexity_profile(trajectory),
+            'rhs_evaluations': rhs_evaluations
+        }
+        
+        if dense_output:
+            result['dense_solution'] = self._join_dense_segments(segments) if segments else None
+        if max_complexity is not None:
+            result['pruned'] = pruned
+        
+        return result
+    
+    def _join_dense_segments(self, segments: List[OdeSolution]) -> OdeSolution:
+        """Join per-segment dense outputs into one continuous interpolant"""
+        ts = np.concatenate([segments[0].ts] + [segment.ts[1:] for segment in segments[1:]])
+        interpolants = [interpolant for segment in segments for interpolant in segment.interpolants]
+        return OdeSolution(ts, interpolants)
+    
+    def find_optimal_learning_path(self, start: np.ndarray, target: np.ndarray,
+                                   constraints: Optional[Dict] = None, n_starts: int = 8,
+                                   refine_evaluations: int = 100,
+                                   n_workers: Optional[int] = 1,
+                                   seed: Optional[int] = None) -> Dict:
+        """
+        Constrained optimal learning path over initial-velocity parameterizations
+        Multi-start candidates are refined serially, or in a process pool of n_workers
+        (None: one per CPU); a candidate crossing max_complexity is cut off at the
+        crossing and dropped without refinement
+        """
+        start = np.asarray(start, dtype=float)
+        target = np.asarray(target, dtype=float)
+        constraints = constraints or {}
+        limits = {
+            'max_complexity': constraints.get('max_complexity'),
+            'min_efficiency': constraints.get('min_efficiency'),
+            'max_time': constraints.get('max_time', constraints.get('max_duration', 100.0))
+        }
+        
+        # Candidate 0 is the unconstrained geodesic; the rest perturb its direction and speed
+        rng = np.random.default_rng(seed)
+        base_velocity = self._optimal_initial_direction(start, target)
+        speed = max(np.linalg.norm(base_velocity), 2.1e-2)
+        candidates = [base_velocity] + [
+            base_velocity * rng.uniform(0.5, 3.0) + rng.normal(0.0, 2 * speed, self.dimension)
+            for _ in range(n_starts - 1)
+        ]
+        
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        n_workers = min(n_workers, len(candidates))
+        worker_manifold = self._path_worker_manifold() if n_workers > 1 else None
+        
+        task_arguments = (repeat(start), repeat(target), candidates,
+                          repeat(limits), repeat(refine_evaluations))
+        if worker_manifold is not None:
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_initialize_path_worker,
+                                     initargs=(worker_manifold,)) as pool:
+                outcomes = list(pool.map(_refine_path_candidate, *task_arguments))
+        else:
+            outcomes = [self._refine_path_candidate(*arguments) for arguments in zip(*task_arguments)]
+        
+        best_velocity, best_score, _ = min(outcomes, key=lambda outcome: outcome[1])
+        
+        # Final path is integrated without pruning so violations are reported in full
+        result = self._integrate_learning_geodesic(start, target, best_velocity, limits['max_time'])
+        violations = self._path_constraint_violations(result, limits)
+        result.update({
+            'constraints_met': not violations,
+            'constraint_violations': violations,
+            'initial_velocity': best_velocity,
+            'objective': best_score,
+            'candidates_evaluated': len(outcomes),
+            'candidates_pruned': sum(1 for outcome in outcomes if outcome[2])
+        })
+        return result
+    
+    def _path_worker_manifold(self) -> Optional['EducationalManifold']:
+        """
+        Copy of the manifold to ship to pool workers, without the geodesic cache and
+        stored BVP solutions, or None when the metric field cannot be pickled (e.g. a
+        CallableMetric built from lambdas); the check runs once per metric version
+        """
+        if self._metric_picklable is None or self._metric_picklable[0] != self.metric_version:
+            try:
+                pickle.dumps(self.metric_field)
+                picklable = True
+            except (pickle.PicklingError, AttributeError, TypeError):
+                picklable = False
+            self._metric_picklable = (self.metric_version, picklable)
+        if not self._metric_picklable[1]:
+            return None
+        worker_manifold = copy.copy(self)
+        worker_manifold._geodesic_cache = None
+        worker_manifold._bvp_solutions = []
+        return worker_manifold
+    
+    def _refine_path_candidate(self, start: np.ndarray, target: np.ndarray,
+                               initial_velocity: np.ndarray, limits: Dict,
+                               max_evaluations: int):
+        """Nelder–Mead refinement of one candidate; returns (velocity, score, pruned)"""
+        def evaluate(velocity):
+            result = self._integrate_learning_geodesic(start, target, velocity, limits['max_time'],
+                                                       max_complexity=limits['max_complexity'])
+            return self._path_candidate_score(result, start, target, limits), result.get('pruned', False)
+        
+        score, pruned = evaluate(initial_velocity)
+        if pruned:
+            return initial_velocity, score, True
+        
+        # Simplex edges on the scale of the learning speed rather than scipy's 5% default
+        step = max(np.linalg.norm(initial_velocity), 2.1e-2)
+        simplex = np.vstack([initial_velocity, initial_velocity + step * np.eye(self.dimension)])
+        solution = minimize(lambda velocity: evaluate(velocity)[0], initial_velocity,
+                            method='Nelder-Mead',
+                            options={'maxfev': max_evaluations, 'initial_simplex': simplex,
+                                     'xatol': 1e-5, 'fatol': 1e-6})
+        if solution.fun < score:
+            return solution.x, float(solution.fun), False
+        return initial_velocity, score, False
+    
+    def _path_candidate_score(self, result: Dict, start: np.ndarray, target: np.ndarray,
+                              limits: Dict) -> float:
+        """Penalized objective: efficiency first, detours second, constraint misses dominate"""
+        straight_distance = np.linalg.norm(target - start)
+        path_length = np.sum(np.linalg.norm(np.diff(result['trajectory'], axis=0), axis=1))
+        detour = path_length / straight_distance - 1.0 if straight_distance > 0 else 0.0
+        
+        penalty = float(result.get('pruned', False))
+        if limits['min_efficiency'] is not None:
+            penalty += max(0.0, limits['min_efficiency'] - result['efficiency'])
+        return -result['efficiency'] + 0.1 * detour + 10.0 * penalty
+    
+    def _path_constraint_violations(self, result: Dict, limits: Dict) -> Dict:
+        """Violated constraints with their limit and achieved value"""
+        achieved = {
+            'max_complexity': float(np.max(result['complexity_profile'])),
+            'min_efficiency': float(result['efficiency']),
+            'max_time': float(result['time'][-1]) if result['converged'] else np.inf
+        }
+        violations = {}
+        for name, limit in limits.items():
+            if limit is None:
+                continue
+            violated = achieved[name] < limit if name.startswith('min_') else achieved[name] > limit
+            if violated:
+                violations[name] = {'limit': limit, 'value': achieved[name]}
+        return violations
+    
+    def calculate_complexity_profile(self, trajectory: np.ndarray) -> np.ndarray:
+        """
+        Weighted knowledge complexity Σ wᵢ|xᵢ| / dimension at each point of a path
+        Accepts one state (dimension,), a path (T, dimension) or stacked paths (..., T, dimension)
+        """
+        return np.abs(np.asarray(trajectory, dtype=float)) @ (self.complexity_weights / self.dimension)
+    
+    def solve_geodesic_bvp(self, start: np.ndarray, target: np.ndarray,
+                           duration: Optional[float] = None, warm_start: bool = True,
+                           tol: float = 1e-4, max_nodes: int = 5000,
+                           shooting_segments: int = 8) -> Dict:
+        """
+        Solve the two-point boundary-value geodesic with both endpoints fixed
+        Uses solve_bvp collocation, falling back to multiple shooting; solved pairs
+        are kept to warm-start later nearby requests
+        """
+        start = np.asarray(start, dtype=float)
+        target = np.asarray(target, dtype=float)
+        dim = self.dimension
+        if duration is None:
+            duration = self._arrival_time_estimate(start, target)
+        
+        def geodesic_equation(t, y):
+            """Geodesic equation for a (2·dimension, m) block of mesh states"""
+            positions, velocities = y[:dim].T, y[dim:].T
+            acceleration = self._geodesic_acceleration(positions, velocities, target)
+            return np.vstack([y[dim:], acceleration.T])
+        
+        def boundary_conditions(ya, yb):
+            return np.concatenate([ya[:dim] - start, yb[:dim] - target])
+        
+        mesh, guess, warm_started = self._bvp_initial_guess(start, target, duration, warm_start)
+        solution = solve_bvp(geodesic_equation, boundary_conditions, mesh, guess,
+                             tol=tol, max_nodes=max_nodes)
+        
+        # Collocation always runs first; shooting residual evaluations are counted apart
+        collocation_iterations, shooting_evaluations = solution.niter, 0
+        if solution.success:
+            method, time, states = 'collocation', solution.x, solution.y
+        else:
+            shooting = self._solve_geodesic_multiple_shooting(
+                start, target, duration, shooting_segments, solution.sol
+            )
+            method, time, states = 'multiple_shooting', shooting['time'], shooting['states']
+            shooting_evaluations = shooting['evaluations']
+        
+        converged = np.linalg.norm(states[:dim, -1] - target) < tol and \
+                    np.linalg.norm(states[:dim, 0] - start) < tol
+        if converged:
+            # Endpoints are constraints of the problem, not approximations
+            states[:dim, 0], states[:dim, -1] = start, target
+            self._store_bvp_solution(start, target, duration, time, states)
+        
+        trajectory = states[:dim].T
+        return {
+            'trajectory': trajectory,
+            'velocity': states[dim:].T,
+            'time': time,
+            'efficiency': self._calculate_learning_efficiency(trajectory, target),
+            'final_position': trajectory[-1],
+            'converged': bool(converged),
+            'method': method,
+            'collocation_iterations': collocation_iterations,
+            'shooting_evaluations': shooting_evaluations,
+            'warm_started': warm_started
+        }
+    
+    def _arrival_time_estimate(self, start: np.ndarray, target: np.ndarray) -> float:
+        """Straight-line arrival time under the optimal initial velocity and constant pull"""
+        distance = np.linalg.norm(target - start)
+        v0, a = 2.1e-2, 0.1
+        return max((-v0 + np.sqrt(v0**2 + 2 * a * distance)) / a, 1e-3)
+    
+    def _bvp_initial_guess(self, start: np.ndarray, target: np.ndarray,
+                           duration: float, warm_start: bool):
+        """Initial mesh and states: nearest solved pair if available, else a straight line"""
+        dim = self.dimension
+        neighbour = self._nearest_bvp_solution(start, target) if warm_start else None
+        
+        if neighbour is None:
+            fraction = np.linspace(0.0, 1.0, 11)
+            positions = start[:, None] + (target - start)[:, None] * fraction
+            velocities = np.repeat(((target - start) / duration)[:, None], len(fraction), axis=1)
+            return fraction * duration, np.vstack([positions, velocities]), False
+        
+        # Shift the neighbour's path so it matches the new endpoints, rescaled in time
+        fraction, positions, velocities, neighbour_duration, neighbour_start, neighbour_target = neighbour
+        start_shift, target_shift = start - neighbour_start, target - neighbour_target
+        positions = positions + start_shift[:, None] * (1 - fraction) + target_shift[:, None] * fraction
+        velocities = (velocities * neighbour_duration / duration
+                      + ((target_shift - start_shift) / duration)[:, None])
+        return fraction * duration, np.vstack([positions, velocities]), True
+    
+    def _nearest_bvp_solution(self, start: np.ndarray, target: np.ndarray):
+        """Closest previously solved (start, target) pair within the warm-start radius"""
+        if not self._bvp_solutions:
+            return None
+        keys = np.array([np.concatenate([entry[4], entry[5]]) for entry in self._bvp_solutions])
+        distances = np.linalg.norm(keys - np.concatenate([start, target]), axis=1)
+        nearest = int(np.argmin(distances))
+        if distances[nearest] > self.bvp_warm_start_radius:
+            return None
+        return self._bvp_solutions[nearest]
+    
+    def _store_bvp_solution(self, start: np.ndarray, target: np.ndarray, duration: float,
+                            time: np.ndarray, states: np.ndarray):
+        """Remember a solved pair for warm-starting neighbouring requests"""
+        dim = self.dimension
+        self._bvp_solutions.append((time / duration, states[:dim].copy(), states[dim:].copy(),
+                                    duration, start.copy(), target.copy()))
+        if len(self._bvp_solutions) > self.bvp_warm_start_capacity:
+            self._bvp_solutions.pop(0)
+    
+    def _solve_geodesic_multiple_shooting(self, start: np.ndarray, target: np.ndarray,
+                                          duration: float, n_segments: int,
+                                          initial_solution=None, substeps: int = 20) -> Dict:
+        """Multiple shooting: all segments integrated at once with vectorized RK4"""
+        dim = self.dimension
+        nodes = np.linspace(0.0, duration, n_segments + 1)
+        h = duration / (n_segments * substeps)
+        
+        if initial_solution is not None:
+            node_states = initial_solution(nodes[:-1]).T
+        else:
+            fraction = nodes[:-1, None] / duration
+            node_states = np.hstack([start + (target - start) * fraction,
+                                     np.tile((target - start) / duration, (n_segments, 1))])
+        
+        def rhs(y):
+            positions, velocities = y[:, :dim], y[:, dim:]
+            return np.hstack([velocities, self._geodesic_acceleration(positions, velocities, target)])
+        
+        def propagate(y, record=False):
+            path = [y]
+            for _ in range(substeps):
+                k1 = rhs(y)
+                k2 = rhs(y + 0.5 * h * k1)
+                k3 = rhs(y + 0.5 * h * k2)
+                k4 = rhs(y + h * k3)
+                y = y + h / 6.0 * (k1 + 2 * k2 + 2 * k3 + k4)
+                if record:
+                    path.append(y)
+            return np.stack(path, axis=1) if record else y
+        
+        def residual(z):
+            y = z.reshape(n_segments, 2 * dim)
+            end = propagate(y)
+            return np.concatenate([
+                y[0, :dim] - start,
+                (end[:-1] - y[1:]).ravel(),  # Continuity between segments
+                end[-1, :dim] - target
+            ])
+        
+        solution = root(residual, node_states.ravel(), method='hybr')
+        segments = propagate(solution.x.reshape(n_segments, 2 * dim), record=True)
+        
+        # Drop the duplicated node at the start of every segment but the first
+        states = np.concatenate([segments[0]] + [segment[1:] for segment in segments[1:]])
+        time = np.linspace(0.0, duration, n_segments * substeps + 1)
+        return {'time': time, 'states': states.T, 'evaluations': solution.nfev}
+    
+    def compute_learning_geodesics_batch(self, starts: np.ndarray, targets: np.ndarray,
+                                         max_time: float = 100.0, n_points: int = 101,
+                                         rtol: float = 1e-3, atol: float = 1e-6,
+                                         max_step: float = np.inf,
+                                         tolerance: Optional[float] = None,
+                                         chunk_size: int = 10000) -> Dict:
+        """
+        Compute geodesics for many learners at once
+        Integrates an (N, 2·dimension) state array with a vectorized Dormand–Prince 5(4)
+        scheme; every row keeps its own step size and stops once it reaches its target
+        """
+        starts = np.atleast_2d(np.asarray(starts, dtype=float))
+        targets = np.atleast_2d(np.asarray(targets, dtype=float))
+        if targets.shape[0] == 1 and starts.shape[0] > 1:
+            targets = np.broadcast_to(targets, starts.shape)
+        if starts.shape != targets.shape or starts.shape[1] != self.dimension:
+            raise ValueError(f"starts and targets must have shape (N, {self.dimension})")
+        tolerance = self.convergence_tolerance if tolerance is None else tolerance
+        
+        n_learners = starts.shape[0]
+        time_grid = np.linspace(0.0, max_time, n_points)
+        trajectories = np.empty((n_learners, n_points, self.dimension))
+        final_positions = np.empty((n_learners, self.dimension))
+        converged = np.zeros(n_learners, dtype=bool)
+        convergence_time = np.full(n_learners, np.nan)
+        steps = np.zeros(n_learners, dtype=np.int64)
+        failed = np.zeros(n_learners, dtype=bool)
+        rhs_evaluations = 0
+        
+        # Chunking bounds the working set of the stage arrays for very large cohorts
+        for begin in range(0, n_learners, chunk_size):
+            rows = slice(begin, min(begin + chunk_size, n_learners))
+            chunk = self._integrate_geodesic_batch(
+                starts[rows], targets[rows], time_grid, rtol, atol, max_step, tolerance
+            )
+            trajectories[rows] = chunk['trajectories']
+            final_positions[rows] = chunk['final_positions']
+            converged[rows] = chunk['converged']
+            convergence_time[rows] = chunk['convergence_time']
+            steps[rows] = chunk['steps']
+            failed[rows] = chunk['failed']
+            rhs_evaluations += chunk['rhs_evaluations']
+        
+        return {
+            'trajectories': trajectories,
+            'time': time_grid,
+            'efficiencies': self._calculate_learning_efficiency_batch(starts, final_positions, targets),
+            'final_positions': final_positions,
+            'complexity_profiles': self.calculate_complexity_profile(trajectories),
+            'converged': converged,
+            'convergence_time': convergence_time,
+            'steps': steps,
+            'failed': failed,
+            'rhs_evaluations': rhs_evaluations
+        }
+    
+    def _integrate_geodesic_batch(self, starts: np.ndarray, targets: np.ndarray,
+                                  time_grid: np.ndarray, rtol: float, atol: float,
+                                  max_step: float, tolerance: float) -> Dict:
+        """
+        Vectorized embedded RK integration with per-row step control
+        Rows whose state or error estimate stops being finite, or whose step size
+        falls below 1e-12·max_time, are stopped and reported as failed
+        """
+        n_rows, dim = starts.shape
+        max_time = time_grid[-1]
+        min_step = 1e-12 * max_time
+        
+        def rhs(y, target):
+            positions, velocities = y[:, :dim], y[:, dim:]
+            acceleration = self._geodesic_acceleration(positions, velocities, target)
+            return np.concatenate([velocities, acceleration], axis=1)
+        
+        y = np.concatenate([starts, self._optimal_initial_direction_batch(starts, targets)], axis=1)
+        f = rhs(y, targets)
+        rhs_evaluations = n_rows
+        t = np.zeros(n_rows)
+        
+        # Initial step from the ratio of state to derivative magnitude
+        scale = atol + rtol * np.abs(y)
+        d0 = np.sqrt(np.mean((y / scale) ** 2, axis=1))
+        d1 = np.sqrt(np.mean((f / scale) ** 2, axis=1))
+        h = np.where((d0 < 1e-5) | (d1 < 1e-5), 1e-6, 0.01 * d0 / np.maximum(d1, 1e-300))
+        h = np.minimum(np.minimum(h, max_step), max_time)
+        
+        trajectories = np.empty((n_rows, len(time_grid), dim))
+        trajectories[:, 0] = starts
+        next_output = np.ones(n_rows, dtype=np.int64)
+        converged = np.linalg.norm(starts - targets, axis=1) < tolerance
+        convergence_time = np.where(converged, 0.0, np.nan)
+        final_positions = starts.copy()
+        steps = np.zeros(n_rows, dtype=np.int64)
+        failed = ~np.all(np.isfinite(y) & np.isfinite(f), axis=1) | ~np.all(np.isfinite(targets), axis=1)
+        converged &= ~failed
+        convergence_time[failed] = np.nan
+        active = ~converged & ~failed & (max_time > 0)
+        
+        while np.any(active):
+            rows = np.flatnonzero(active)
+            y_a, f_a, t_a, target_a = y[rows], f[rows], t[rows], targets[rows]
+            h_a = np.minimum(h[rows], max_time - t_a)
+            
+            # Dormand–Prince stages (FSAL: stage 7 is f at the new state)
+            k = [f_a]
+            for stage in range(1, 7):
+                increment = sum(a * k_j for a, k_j in zip(_DP_A[stage], k) if a != 0.0)
+                k.append(rhs(y_a + h_a[:, None] * increment, target_a))
+            rhs_evaluations += 6 * len(rows)
+            
+            y_new = y_a + h_a[:, None] * sum(b * k_j for b, k_j in zip(_DP_B, k) if b != 0.0)
+            error = h_a[:, None] * sum(e * k_j for e, k_j in zip(_DP_E, k) if e != 0.0)
+            error_scale = atol + rtol * np.maximum(np.abs(y_a), np.abs(y_new))
+            error_norm = np.sqrt(np.mean((error / error_scale) ** 2, axis=1))
+            
+            accepted = error_norm <= 1.0
+            factor = np.where(error_norm == 0.0, 5.0,
+                              np.clip(0.9 * np.maximum(error_norm, 1e-10) ** -0.2, 0.2, 5.0))
+            h[rows] = np.minimum(h_a * np.where(accepted, factor, np.minimum(factor, 1.0)), max_step)
+            
+            # NaN errors or non-finite accepted states cannot recover; neither can vanishing steps
+            diverged = np.isnan(error_norm) | (accepted & ~np.all(np.isfinite(y_new), axis=1)) | (h[rows] < min_step)
+            if np.any(diverged):
+                failed[rows[diverged]] = True
+                active[rows[diverged]] = False
+                accepted &= ~diverged
+            
+            if not np.any(accepted):
+                continue
+            
+            rows = rows[accepted]
+            y0, f0, t0, dt = y_a[accepted], f_a[accepted], t_a[accepted], h_a[accepted]
+            y1, f1 = y_new[accepted], k[6][accepted]
+            target_a = target_a[accepted]
+            steps[rows] += 1
+            
+            # Closest approach to the target inside the step, from the cubic Hermite interpolant
+            closest_fraction, closest_position = self._closest_approach(
+                y0[:, :dim], f0[:, :dim], y1[:, :dim], f1[:, :dim], dt, target_a
+            )
+            arrived = np.linalg.norm(closest_position - target_a, axis=1) < tolerance
+            t_end = t0 + np.where(arrived, closest_fraction, 1.0) * dt
+            
+            # Fill uniform output points falling inside this step
+            while True:
+                output_index = next_output[rows]
+                pending = output_index < len(time_grid)
+                pending[pending] &= time_grid[output_index[pending]] <= t_end[pending] + 1e-12
+                if not np.any(pending):
+                    break
+                fraction = (time_grid[output_index[pending]] - t0[pending]) / dt[pending]
+                points = self._hermite_interpolate(
+                    y0[pending, :dim], f0[pending, :dim], y1[pending, :dim], f1[pending, :dim],
+                    dt[pending, None], fraction[:, None]
+                )
+                trajectories[rows[pending], output_index[pending]] = points
+                next_output[rows[pending]] += 1
+            
+            y[rows], f[rows], t[rows] = y1, f1, t0 + dt
+            final_positions[rows] = np.where(arrived[:, None], closest_position, y1[:, :dim])
+            
+            done_rows = rows[arrived]
+            converged[done_rows] = True
+            convergence_time[done_rows] = t_end[arrived]
+            active[done_rows] = False
+            active[rows[t[rows] >= max_time]] = False
+        
+        # Learners that reached the target stay there for the remaining output points
+        for row in np.flatnonzero(next_output < len(time_grid)):
+            trajectories[row, next_output[row]:] = final_positions[row]
+        
+        return {
+            'trajectories': trajectories,
+            'final_positions': final_positions,
+            'complexity_profiles': self.calculate_complexity_profile(trajectories),
+            'converged': converged,
+            'convergence_time': convergence_time,
+            'steps': steps,
+            'failed': failed,
+            'rhs_evaluations': rhs_evaluations
         }
     
+    @staticmethod
+    def _hermite_interpolate(y0: np.ndarray, f0: np.ndarray, y1: np.ndarray, f1: np.ndarray,
+                             dt: np.ndarray, s: np.ndarray) -> np.ndarray:
+        """Cubic Hermite interpolation at step fractions s (all arguments broadcast)"""
+        h00 = 2 * s**3 - 3 * s**2 + 1
+        h10 = s**3 - 2 * s**2 + s
+        h01 = -2 * s**3 + 3 * s**2
+        h11 = s**3 - s**2
+        return h00 * y0 + h10 * dt * f0 + h01 * y1 + h11 * dt * f1
+    
+    def _closest_approach(self, x0: np.ndarray, v0: np.ndarray, x1: np.ndarray, v1: np.ndarray,
+                          dt: np.ndarray, targets: np.ndarray, n_samples: int = 8,
+                          n_refine: int = 24):
+        """Step fraction and position of minimum distance to target along each step"""
+        args = (x0[:, None], v0[:, None], x1[:, None], v1[:, None], dt[:, None, None])
+        
+        # Coarse bracket of the minimum, then golden-section refinement inside it
+        grid = np.linspace(0.0, 1.0, n_samples + 1)
+        samples = self._hermite_interpolate(*args, grid[None, :, None])
+        nearest = np.argmin(np.linalg.norm(samples - targets[:, None], axis=2), axis=1)
+        low = grid[np.maximum(nearest - 1, 0)]
+        high = grid[np.minimum(nearest + 1, n_samples)]
+        
+        def distance(s):
+            point = self._hermite_interpolate(*args, s[:, None, None])[:, 0]
+            return np.linalg.norm(point - targets, axis=1)
+        
+        ratio = (np.sqrt(5.0) - 1.0) / 2.0
+        for _ in range(n_refine):
+            left = high - ratio * (high - low)
+            right = low + ratio * (high - low)
+            keep_left = distance(left) < distance(right)
+            high = np.where(keep_left, right, high)
+            low = np.where(keep_left, low, left)
+        
+        fraction = (low + high) / 2.0
+        return fraction, self._hermite_interpolate(*args, fraction[:, None, None])[:, 0]
+    
+    def geodesic_distance_matrix(self, states: np.ndarray, out=None, **kwargs) -> np.ndarray:
+        """Blocked all-pairs geodesic distances, see geodesic_distances.geodesic_distance_matrix"""
+        return geodesic_distance_matrix(self, states, out, **kwargs)
+    
+    def knowledge_retention_curve(self, initial_retention, time_days, educational_quality=1.0):
+        """Predict knowledge retention R(t); broadcasts over learners, days and qualities"""
+        return learning_curves.knowledge_retention(initial_retention, time_days, educational_quality,
+                                                   self.retention_tau, self.retention_asymptote)
+    
+    def skill_acquisition_curve(self, time_days, max_skill=1.0, learning_rate=1.0):
+        """Model skill development S(t); broadcasts over learners, days and rates"""
+        return learning_curves.skill_acquisition(time_days, max_skill, learning_rate,
+                                                 self.acquisition_tau, self.skill_beta)
+    
+    def fit_retention_curves(self, time_days, retention, **kwargs) -> Dict:
+        """Batched per-learner retention fit, see learning_curves.fit_retention_curves"""
+        return learning_curves.fit_retention_curves(time_days, retention, **kwargs)
+    
+    def fit_skill_curves(self, time_days, skills, max_skill: Optional[float] = None, **kwargs) -> Dict:
+        """Batched per-learner skill-acquisition fit, see learning_curves.fit_skill_curves"""
+        return learning_curves.fit_skill_curves(time_days, skills, max_skill, **kwargs)
+    
+    def _geodesic_acceleration(self, positions: np.ndarray, velocities: np.ndarray,
+                               target: np.ndarray) -> np.ndarray:
+        """Acceleration term of the geodesic equation for one or many learners"""
+        acceleration = self._target_attraction(positions, target)
+        
+        # Curvature term -Γ^m_ij v^i v^j of the geodesic equation
+        if not self.metric_field.is_flat:
+            christoffel = self.compute_christoffel_symbols(positions)
+            acceleration = acceleration - np.einsum('...mij,...i,...j->...m',
+                                                    christoffel, velocities, velocities)
+        return acceleration
+    
+    def _target_attraction(self, positions: np.ndarray, target: np.ndarray) -> np.ndarray:
+        """Pull toward the target that drives learners along the geodesic"""
+        offset = positions - target
+        distance = np.linalg.norm(offset, axis=-1, keepdims=True)
+        # Constant-magnitude pull far away, a smooth linear spring near the target
+        # instead of dividing by a vanishing distance
+        return -0.1 * offset / np.maximum(distance, self.near_target_radius)
+    
+    def _optimal_initial_direction_batch(self, starts: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """Vectorized optimal initial direction for many learners"""
+        direction = targets - starts
+        norm = np.linalg.norm(direction, axis=1, keepdims=True)
+        return np.where(norm > 0, direction / np.where(norm > 0, norm, 1.0) * 2.1e-2, 0.0)
+    
+    def _calculate_learning_efficiency_batch(self, starts: np.ndarray, final_positions: np.ndarray,
+                                             targets: np.ndarray) -> np.ndarray:
+        """Vectorized learning efficiency for many learners"""
+        optimal_distance = np.linalg.norm(starts - targets, axis=1)
+        actual_distance = np.linalg.norm(final_positions - targets, axis=1)
+        safe_distance = np.where(optimal_distance > 0, optimal_distance, 1.0)
+        return np.where(optimal_distance > 0, 1.0 - actual_distance / safe_distance, 1.0)
+    
     def _optimal_initial_direction(self, start: np.ndarray, target: np.ndarray) -> np.ndarray:
         """Compute optimal initial direction"""
         direction = target - start
@@ -0,0 +1,179 @@
+import numpy as np
+from typing import Callable, Dict, Optional, Sequence
+
+RETENTION_TAU = 45.0        # days
+RETENTION_ASYMPTOTE = 0.15
+ACQUISITION_TAU = 21.0      # days
+SKILL_BETA = 0.67
+
+def knowledge_retention(initial_retention, time_days, educational_quality=1.0,
+                        tau: float = RETENTION_TAU, asymptote: float = RETENTION_ASYMPTOTE) -> np.ndarray:
+    """
+    R(t) = R_∞ + (R₀ − R_∞) exp(−t/τ) with τ and R_∞ scaled by educational quality
+    All arguments broadcast, so (learner, day, quality) grids evaluate in one call
+    """
+    initial_retention = np.asarray(initial_retention, dtype=float)
+    educational_quality = np.asarray(educational_quality, dtype=float)
+    asymptotic_retention = np.minimum(asymptote * educational_quality, initial_retention)
+    decay = np.exp(-np.asarray(time_days, dtype=float) / (tau * educational_quality))
+    return asymptotic_retention + (initial_retention - asymptotic_retention) * decay
+
+def skill_acquisition(time_days, max_skill=1.0, learning_rate=1.0,
+                      tau: float = ACQUISITION_TAU, beta: float = SKILL_BETA) -> np.ndarray:
+    """S(t) = S_max (1 − exp(−t/τ))^β with τ shortened by the learning rate; broadcasts"""
+    tau_acquisition = tau / np.asarray(learning_rate, dtype=float)
+    growth = -np.expm1(-np.asarray(time_days, dtype=float) / tau_acquisition)
+    return np.asarray(max_skill, dtype=float) * growth ** beta
+
+def fit_retention_curves(time_days, retention, max_iterations: int = 50,
+                         tolerance: float = 1e-10) -> Dict:
+    """
+    Fit R₀, R_∞ and τ for many learners at once
+    retention is (n_learners, n_observations) with NaN for missing samples; time_days
+    is either the same shape or one shared (n_observations,) schedule
+    """
+    times, values, mask = _observation_grid(time_days, retention)
+
+    # Closed-form start: with τ fixed, R is linear in (R₀, R_∞)
+    decay = np.exp(-times / RETENTION_TAU)
+    basis = np.stack([decay, 1.0 - decay], axis=-1)
+    linear = _batched_linear_least_squares(basis, values, mask)
+    params = np.column_stack([linear, np.full(len(values), np.log(RETENTION_TAU))])
+
+    def model(params, times):
+        # Parameters: R₀, R_∞, log τ
+        initial, asymptote, log_tau = params[:, 0:1], params[:, 1:2], params[:, 2:3]
+        scaled_time = times / np.exp(log_tau)
+        decay = np.exp(-scaled_time)
+        prediction = asymptote + (initial - asymptote) * decay
+        jacobian = np.stack([decay, 1.0 - decay,
+                             (initial - asymptote) * decay * scaled_time], axis=-1)
+        return prediction, jacobian
+
+    params, cost, iterations, converged = _levenberg_marquardt(
+        model, params, times, values, mask, max_iterations, tolerance)
+
+    return {
+        'initial_retention': params[:, 0],
+        'asymptotic_retention': params[:, 1],
+        'tau': np.exp(params[:, 2]),
+        'rmse': np.sqrt(cost / np.maximum(mask.sum(axis=1), 1)),
+        'converged': converged,
+        'iterations': iterations
+    }
+
+def fit_skill_curves(time_days, skills, max_skill: Optional[float] = None,
+                     max_iterations: int = 50, tolerance: float = 1e-10) -> Dict:
+    """
+    Fit S_max, τ and β for many learners at once (S_max held fixed when given)
+    Starts from the closed-form log-linear fit log S = log S_max + β log(1 − e^(−t/τ))
+    """
+    times, values, mask = _observation_grid(time_days, skills)
+    # S(0) = 0 for every parameter choice, so only t > 0, S > 0 samples carry information
+    mask &= (times > 0) & (values > 0)
+    safe_times = np.where(mask, times, 1.0)
+
+    log_growth = np.log(-np.expm1(-safe_times / ACQUISITION_TAU))
+    log_values = np.log(np.where(mask, values, 1.0))
+    if max_skill is None:
+        basis = np.stack([np.ones_like(log_growth), log_growth], axis=-1)
+        linear = _batched_linear_least_squares(basis, log_values, mask)
+    else:
+        beta = _batched_linear_least_squares(log_growth[..., None], log_values - np.log(max_skill), mask)
+        linear = np.column_stack([np.full(len(values), np.log(max_skill)), beta[:, 0]])
+    params = np.column_stack([linear, np.full(len(values), np.log(ACQUISITION_TAU))])
+
+    def model(params, times):
+        # Parameters: log S_max, β, log τ
+        log_scale, beta, log_tau = params[:, 0:1], params[:, 1:2], params[:, 2:3]
+        scaled_time = times / np.exp(log_tau)
+        growth = -np.expm1(-scaled_time)
+        log_growth = np.log(growth)
+        prediction = np.exp(log_scale + beta * log_growth)
+        d_log_growth = -np.exp(-scaled_time) * scaled_time / growth
+        jacobian = np.stack([prediction, prediction * log_growth,
+                             prediction * beta * d_log_growth], axis=-1)
+        return prediction, jacobian
+
+    free = [1, 2] if max_skill is not None else [0, 1, 2]
+    params, cost, iterations, converged = _levenberg_marquardt(
+        model, params, safe_times, values, mask, max_iterations, tolerance, free)
+
+    return {
+        'max_skill': np.exp(params[:, 0]),
+        'beta': params[:, 1],
+        'tau': np.exp(params[:, 2]),
+        'rmse': np.sqrt(cost / np.maximum(mask.sum(axis=1), 1)),
+        'converged': converged,
+        'iterations': iterations
+    }
+
+def _observation_grid(time_days, values):
+    """Broadcast times against (n_learners, n_observations) values and mask NaNs"""
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    times = np.broadcast_to(np.asarray(time_days, dtype=float), values.shape)
+    mask = ~(np.isnan(values) | np.isnan(times))
+    return np.where(mask, times, 0.0), np.where(mask, values, 0.0), mask
+
+def _batched_linear_least_squares(basis: np.ndarray, values: np.ndarray,
+                                  mask: np.ndarray, ridge: float = 1e-12) -> np.ndarray:
+    """Per-learner normal-equation solve; basis is (n, m, p)"""
+    basis = basis * mask[..., None]
+    gram = np.einsum('nmp,nmq->npq', basis, basis) + ridge * np.eye(basis.shape[-1])
+    moment = np.einsum('nmp,nm->np', basis, values * mask)
+    return np.linalg.solve(gram, moment[..., None])[..., 0]
+
+def _levenberg_marquardt(model: Callable, params: np.ndarray, times: np.ndarray,
+                         values: np.ndarray, mask: np.ndarray, max_iterations: int,
+                         tolerance: float, free: Optional[Sequence[int]] = None):
+    """
+    Damped Gauss–Newton on every learner simultaneously
+    Each row keeps its own damping and stops once its cost no longer improves
+    """
+    params = params.copy()
+    free = list(range(params.shape[1])) if free is None else list(free)
+    n_learners = len(params)
+
+    def evaluate(rows, row_params):
+        prediction, jacobian = model(row_params, times[rows])
+        residual = np.where(mask[rows], prediction - values[rows], 0.0)
+        jacobian = jacobian[..., free] * mask[rows, :, None]
+        return residual, jacobian, np.sum(residual**2, axis=1)
+
+    residual, jacobian, cost = evaluate(np.arange(n_learners), params)
+    damping = np.full(n_learners, 1e-3)
+    converged = np.zeros(n_learners, dtype=bool)
+    active = np.isfinite(cost)
+    iterations = 0
+
+    while iterations < max_iterations and active.any():
+        iterations += 1
+        rows = np.flatnonzero(active)
+        jtj = np.einsum('nmp,nmq->npq', jacobian[rows], jacobian[rows])
+        jtr = np.einsum('nmp,nm->np', jacobian[rows], residual[rows])
+        diagonal = np.einsum('npp->np', jtj)
+        system = jtj + (damping[rows, None] * diagonal + 1e-12)[..., None] * np.eye(len(free))
+        step = -np.linalg.solve(system, jtr[..., None])[..., 0]
+
+        trial = params[rows].copy()
+        trial[:, free] += step
+        trial_residual, trial_jacobian, trial_cost = evaluate(rows, trial)
+
+        improved = np.isfinite(trial_cost) & (trial_cost < cost[rows])
+        accepted = rows[improved]
+        gain = cost[accepted] - trial_cost[improved]
+        params[accepted] = trial[improved]
+        residual[accepted] = trial_residual[improved]
+        jacobian[accepted] = trial_jacobian[improved]
+        cost[accepted] = trial_cost[improved]
+        damping[rows] = np.where(improved, damping[rows] * 0.3, damping[rows] * 10.0)
+
+        # Converged: negligible relative gain, or a step too small to matter
+        small_gain = np.zeros(len(rows), dtype=bool)
+        small_gain[improved] = gain <= tolerance * (1.0 + cost[accepted])
+        small_step = np.max(np.abs(step), axis=1) <= tolerance * (1.0 + np.max(np.abs(trial[:, free]), axis=1))
+        done = small_gain | small_step
+        converged[rows[done]] = True
+        active[rows[done | (damping[rows] > 1e10)]] = False
+
+    return params, cost, iterations, converged
@@ -0,0 +1,253 @@
+import itertools
+import numpy as np
+from typing import Callable, Optional
+
+class MetricField:
+    """
+    Position-dependent metric tensor g_ij(x) of the educational manifold
+    Subclasses provide metric(); derivatives default to central finite differences
+    """
+
+    def __init__(self, dimension: int, finite_difference_step: float = 1e-5):
+        self.dimension = dimension
+        self.finite_difference_step = finite_difference_step
+
+    @property
+    def is_flat(self) -> bool:
+        """True when the Christoffel symbols vanish everywhere"""
+        return False
+
+    def metric(self, positions: np.ndarray) -> np.ndarray:
+        """Metric tensors g_ij for positions of shape (..., dimension)"""
+        raise NotImplementedError
+
+    def metric_derivatives(self, positions: np.ndarray) -> np.ndarray:
+        """Derivatives ∂_k g_ij, indexed [..., k, i, j]"""
+        positions = np.asarray(positions, dtype=float)
+        h = self.finite_difference_step
+        offsets = h * np.eye(self.dimension)
+
+        # Row k of the perturbed block is shifted along axis k
+        forward = self.metric(positions[..., None, :] + offsets)
+        backward = self.metric(positions[..., None, :] - offsets)
+        return (forward - backward) / (2 * h)
+
+    def christoffel_symbols(self, positions: np.ndarray) -> np.ndarray:
+        """Christoffel symbols Γ^m_ij for positions of shape (..., dimension)"""
+        positions = np.asarray(positions, dtype=float)
+        if self.is_flat:
+            return np.zeros(positions.shape[:-1] + (self.dimension,) * 3)
+
+        inverse = np.linalg.inv(self.metric(positions))
+        dg = self.metric_derivatives(positions)
+
+        # Γ^m_ij = ½ g^mk (∂_i g_kj + ∂_j g_ki − ∂_k g_ij)
+        first_kind = np.swapaxes(dg, -3, -2)  # ∂_i g_kj indexed [k, i, j]
+        lowered = first_kind + np.swapaxes(first_kind, -1, -2) - dg
+        shape = lowered.shape
+        return 0.5 * np.matmul(inverse, lowered.reshape(shape[:-2] + (-1,))).reshape(shape)
+
+class ConstantMetric(MetricField):
+    """Constant metric, e.g. the Minkowski-like default of EducationalManifold"""
+
+    def __init__(self, matrix: np.ndarray):
+        matrix = np.asarray(matrix, dtype=float)
+        super().__init__(matrix.shape[0])
+        self.matrix = matrix
+
+    @property
+    def is_flat(self) -> bool:
+        return True
+
+    def metric(self, positions: np.ndarray) -> np.ndarray:
+        positions = np.asarray(positions)
+        return np.broadcast_to(self.matrix, positions.shape[:-1] + self.matrix.shape)
+
+    def metric_derivatives(self, positions: np.ndarray) -> np.ndarray:
+        positions = np.asarray(positions)
+        return np.zeros(positions.shape[:-1] + (self.dimension,) * 3)
+
+class ComplexityMetric(MetricField):
+    """
+    Conformal metric g(x) = (1 + κ Σ wᵢ xᵢ²) g₀ growing with knowledge complexity
+    Derivatives are analytic: ∂_k g_ij = 2 κ w_k x_k g₀_ij
+    """
+
+    def __init__(self, base_metric: np.ndarray, complexity_weights: np.ndarray,
+                 curvature_strength: float = 0.5):
+        base_metric = np.asarray(base_metric, dtype=float)
+        super().__init__(base_metric.shape[0])
+        self.base_metric = base_metric
+        self.complexity_weights = np.asarray(complexity_weights, dtype=float)
+        self.curvature_strength = curvature_strength
+        self._base_inverse = np.linalg.inv(base_metric)
+        self._identity = np.eye(self.dimension)
+
+    def conformal_factor(self, positions: np.ndarray) -> np.ndarray:
+        positions = np.asarray(positions, dtype=float)
+        return 1.0 + self.curvature_strength * np.sum(self.complexity_weights * positions**2, axis=-1)
+
+    def metric(self, positions: np.ndarray) -> np.ndarray:
+        return self.conformal_factor(positions)[..., None, None] * self.base_metric
+
+    def metric_derivatives(self, positions: np.ndarray) -> np.ndarray:
+        positions = np.asarray(positions, dtype=float)
+        gradient = 2 * self.curvature_strength * self.complexity_weights * positions
+        return gradient[..., :, None, None] * self.base_metric
+
+    def christoffel_symbols(self, positions: np.ndarray) -> np.ndarray:
+        """Closed form for conformal metrics: Γ^m_ij = δ^m_i ∂_jσ + δ^m_j ∂_iσ − g₀_ij g₀^mk ∂_kσ"""
+        positions = np.asarray(positions, dtype=float)
+        # σ = ½ ln(conformal factor)
+        d_sigma = (self.curvature_strength * self.complexity_weights * positions
+                   / self.conformal_factor(positions)[..., None])
+        raised = d_sigma @ self._base_inverse.T  # g₀^mk ∂_kσ
+        return (self._identity[:, :, None] * d_sigma[..., None, None, :]
+                + self._identity[:, None, :] * d_sigma[..., None, :, None]
+                - raised[..., :, None, None] * self.base_metric)
+
+class CallableMetric(MetricField):
+    """Metric from user functions; finite differences unless derivatives are supplied"""
+
+    def __init__(self, dimension: int, metric_function: Callable[[np.ndarray], np.ndarray],
+                 derivative_function: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+                 finite_difference_step: float = 1e-5):
+        super().__init__(dimension, finite_difference_step)
+        self.metric_function = metric_function
+        self.derivative_function = derivative_function
+
+    def metric(self, positions: np.ndarray) -> np.ndarray:
+        return self.metric_function(np.asarray(positions, dtype=float))
+
+    def metric_derivatives(self, positions: np.ndarray) -> np.ndarray:
+        if self.derivative_function is None:
+            return super().metric_derivatives(positions)
+        return self.derivative_function(np.asarray(positions, dtype=float))
+
+class PolynomialMetric(MetricField):
+    """
+    Base metric plus a polynomial correction g(x) = g₀ + Σ_s φ_s(x) C_s
+    φ_s are the non-constant monomials up to the given degree, so g(0) = g₀, and C_s
+    are symmetric coefficient matrices, e.g. as estimated by MetricEstimator
+    """
+
+    def __init__(self, base_metric: np.ndarray, coefficients: np.ndarray, degree: int):
+        base_metric = np.asarray(base_metric, dtype=float)
+        super().__init__(base_metric.shape[0])
+        self.base_metric = base_metric
+        self.degree = degree
+        self.exponents = monomial_exponents(self.dimension, degree)[1:]
+        # One symmetric (dimension × dimension) matrix per monomial
+        self.coefficients = np.asarray(coefficients, dtype=float).reshape(len(self.exponents),
+                                                                          self.dimension, self.dimension)
+
+    def metric(self, positions: np.ndarray) -> np.ndarray:
+        values, _ = monomial_basis(np.asarray(positions, dtype=float), self.exponents)
+        return self.base_metric + np.tensordot(values, self.coefficients, axes=(-1, 0))
+
+    def metric_derivatives(self, positions: np.ndarray) -> np.ndarray:
+        _, gradients = monomial_basis(np.asarray(positions, dtype=float), self.exponents)
+        return np.tensordot(gradients, self.coefficients, axes=(-1, 0))
+
+def monomial_exponents(dimension: int, degree: int) -> np.ndarray:
+    """Exponent table (n_monomials, dimension) of all monomials up to degree, constant first"""
+    exponents = [np.zeros(dimension, dtype=np.int64)]
+    for total in range(1, degree + 1):
+        for combination in itertools.combinations_with_replacement(range(dimension), total):
+            exponents.append(np.bincount(combination, minlength=dimension))
+    return np.array(exponents)
+
+def monomial_basis(positions: np.ndarray, exponents: np.ndarray):
+    """Monomial values (..., S) and gradients (..., dimension, S) at positions (..., dimension)"""
+    dimension = exponents.shape[1]
+    # Gather from a table of integer powers instead of evaluating float ** int arrays
+    degree = max(int(exponents.max()), 1) if exponents.size else 1
+    table = positions[..., None] ** np.arange(degree + 1)  # (..., dimension, degree + 1)
+    axes = np.arange(dimension)
+    values = np.prod(table[..., axes, exponents], axis=-1)
+    gradients = []
+    for k in range(dimension):
+        lowered = exponents.copy()
+        lowered[:, k] = np.maximum(lowered[:, k] - 1, 0)
+        gradients.append(exponents[:, k] * np.prod(table[..., axes, lowered], axis=-1))
+    return values, np.stack(gradients, axis=-2)
+
+class ChristoffelGridCache:
+    """
+    Christoffel symbols cached on a regular grid over a box of knowledge space
+    Grid nodes are computed lazily in batches and reused; lookups interpolate
+    multilinearly between the 2^dimension surrounding nodes
+    """
+
+    def __init__(self, metric_field: MetricField, lower: np.ndarray, upper: np.ndarray,
+                 resolution: int = 8, max_entries: int = 20_000_000):
+        self.metric_field = metric_field
+        self.dimension = metric_field.dimension
+        self.lower = np.broadcast_to(np.asarray(lower, dtype=float), (self.dimension,)).copy()
+        self.upper = np.broadcast_to(np.asarray(upper, dtype=float), (self.dimension,)).copy()
+        self.resolution = resolution
+        if resolution < 2:
+            raise ValueError("resolution must be at least 2")
+
+        self.grid_shape = (resolution,) * self.dimension
+        n_nodes = resolution ** self.dimension
+        if n_nodes * self.dimension ** 3 > max_entries:
+            raise ValueError(f"Christoffel grid of {n_nodes} nodes exceeds max_entries; "
+                             f"lower the resolution")
+
+        self.spacing = (self.upper - self.lower) / (resolution - 1)
+        self._values = np.zeros((n_nodes, self.dimension ** 3))
+        self._filled = np.zeros(n_nodes, dtype=bool)
+
+        # Corner bit patterns and their flat-index offsets from the lower node of a cell
+        self._corners = np.array(list(itertools.product((0, 1), repeat=self.dimension)), dtype=bool)
+        self._strides = np.array([resolution ** (self.dimension - 1 - k) for k in range(self.dimension)])
+        self._corner_offsets = self._corners.astype(np.int64) @ self._strides
+
+        self.hits = 0
+        self.misses = 0
+
+    def christoffel_symbols(self, positions: np.ndarray) -> np.ndarray:
+        """Interpolated Γ^m_ij for positions of shape (..., dimension)"""
+        positions = np.asarray(positions, dtype=float)
+        flat_positions = positions.reshape(-1, self.dimension)
+
+        u = (flat_positions - self.lower) / self.spacing
+        inside = np.all((u >= 0) & (u <= self.resolution - 1), axis=1)
+        if not inside.all():
+            # Outside the cached box fall back to direct evaluation
+            result = self.metric_field.christoffel_symbols(flat_positions).reshape(len(u), -1)
+            if inside.any():
+                result[inside] = self._interpolate(u[inside])
+        else:
+            result = self._interpolate(u)
+
+        return result.reshape(positions.shape[:-1] + (self.dimension,) * 3)
+
+    def _interpolate(self, u: np.ndarray) -> np.ndarray:
+        """Multilinear interpolation at grid coordinates u, shape (n, dimension)"""
+        base = np.minimum(u.astype(np.int64), self.resolution - 2)
+        fraction = u - base
+        node_index = (base @ self._strides)[:, None] + self._corner_offsets
+
+        filled = self._filled[node_index]
+        self.hits += int(filled.sum())
+        if not filled.all():
+            self._fill(node_index[~filled])
+
+        weights = np.where(self._corners, fraction[:, None, :], 1.0 - fraction[:, None, :]).prod(axis=2)
+        return np.matmul(weights[:, None, :], self._values[node_index])[:, 0]
+
+    def _fill(self, node_index: np.ndarray):
+        """Compute grid nodes not yet cached, in one batched call"""
+        missing = np.unique(node_index)
+        self.misses += len(missing)
+        coordinates = np.stack(np.unravel_index(missing, self.grid_shape), axis=1)
+        node_positions = self.lower + coordinates * self.spacing
+        self._values[missing] = self.metric_field.christoffel_symbols(node_positions).reshape(len(missing), -1)
+        self._filled[missing] = True
+
+    def clear(self):
+        self._filled[:] = False
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,170 @@
+import numpy as np
+from typing import Dict, Iterable, List, Optional
+
+from .metric_field import PolynomialMetric, monomial_exponents, monomial_basis
+
+class MetricEstimator:
+    """
+    Estimate the educational metric from observed learning paths
+    Observed paths are taken as stationary points of the action ∫ g(ẋ, ẋ) dt under the
+    manifold's target attraction, so their Euler–Lagrange residual
+        g(x)(a − f) + Γ_lowered(x)(v, v) = 0
+    must vanish. With g(x) = g₀ + Σ_s φ_s(x) C_s the residual is linear in the
+    coefficients, and streaming batches only accumulate the normal equations
+    """
+
+    def __init__(self, manifold, degree: int = 1, ridge: float = 1e-8,
+                 time_step: float = 1.0, chunk_size: int = 50000):
+        self.manifold = manifold
+        self.dimension = manifold.dimension
+        self.base_metric = np.asarray(manifold.metric_tensor, dtype=float)
+        self.degree = degree
+        self.ridge = ridge
+        self.time_step = time_step  # Spacing assumed when a path has no time points
+        self.chunk_size = chunk_size
+
+        if degree < 1:
+            raise ValueError("degree must be at least 1")
+        # No constant monomial: g(0) = g₀ pins the scale, which geodesics alone leave free
+        self.exponents = monomial_exponents(self.dimension, degree)[1:]
+        # Symmetric unit matrices E_b spanning each coefficient matrix C_s
+        pairs = [(p, q) for p in range(self.dimension) for q in range(p, self.dimension)]
+        self._symmetric_basis = np.zeros((len(pairs), self.dimension, self.dimension))
+        for b, (p, q) in enumerate(pairs):
+            self._symmetric_basis[b, p, q] = self._symmetric_basis[b, q, p] = 1.0
+
+        n_parameters = len(self.exponents) * len(pairs)
+        self._normal_matrix = np.zeros((n_parameters, n_parameters))
+        self._normal_vector = np.zeros(n_parameters)
+        self._baseline_residual = 0.0
+        self.segments = 0
+        self.paths = 0
+
+    def partial_fit(self, trajectories: Iterable) -> "MetricEstimator":
+        """
+        Accumulate a batch of recorded trajectories (JSON records or LearningTrajectory)
+        Records without path_coordinates are skipped
+        """
+        paths, times, targets = [], [], []
+        for record in trajectories:
+            if _field(record, 'path_coordinates') is None:
+                continue  # Not a recorded trajectory
+            paths.append(_field(record, 'path_coordinates'))
+            times.append(_field(record, 'time_points'))
+            targets.append(_field(record, 'target_knowledge'))
+        return self.partial_fit_paths(paths, times, targets)
+
+    def partial_fit_paths(self, paths: List[np.ndarray], times: Optional[List] = None,
+                          targets: Optional[List] = None) -> "MetricEstimator":
+        """Accumulate a batch of (T, dimension) paths with optional times and targets"""
+        times = times if times is not None else [None] * len(paths)
+        targets = targets if targets is not None else [None] * len(paths)
+
+        positions, stamps, path_ids, path_targets, has_target = [], [], [], [], []
+        for i, (path, path_times, target) in enumerate(zip(paths, times, targets)):
+            path = np.asarray(path, dtype=float)
+            if len(path) < 3:
+                continue
+            positions.append(path)
+            stamps.append(np.arange(len(path)) * self.time_step if path_times is None
+                          else np.asarray(path_times, dtype=float))
+            path_ids.append(np.full(len(path), i))
+            has_target.append(target is not None)
+            path_targets.append(np.zeros(self.dimension) if target is None
+                                else np.asarray(target, dtype=float))
+        if not positions:
+            return self
+
+        positions, stamps, path_ids = np.concatenate(positions), np.concatenate(stamps), np.concatenate(path_ids)
+        # Map path index -> row in the compact target table
+        target_rows = np.full(len(paths), -1)
+        target_rows[np.unique(path_ids)] = np.arange(len(path_targets))
+        path_targets, has_target = np.array(path_targets), np.array(has_target)
+
+        # Interior points: previous and next samples belong to the same path
+        interior = np.flatnonzero((path_ids[:-2] == path_ids[1:-1]) & (path_ids[2:] == path_ids[1:-1])) + 1
+        for begin in range(0, len(interior), self.chunk_size):
+            rows = interior[begin:begin + self.chunk_size]
+            x_prev, x, x_next = positions[rows - 1], positions[rows], positions[rows + 1]
+            h1 = (stamps[rows] - stamps[rows - 1])[:, None]
+            h2 = (stamps[rows + 1] - stamps[rows])[:, None]
+
+            # Second-order differences on a non-uniform grid
+            denominator = h1 * h2 * (h1 + h2)
+            velocity = (h1**2 * x_next - h2**2 * x_prev + (h2**2 - h1**2) * x) / denominator
+            acceleration = 2.0 * (h1 * x_next - (h1 + h2) * x + h2 * x_prev) / denominator
+
+            target_index = target_rows[path_ids[rows]]
+            forcing = np.where(has_target[target_index, None],
+                               self.manifold._target_attraction(x, path_targets[target_index]), 0.0)
+            self._accumulate(x, velocity, acceleration - forcing)
+
+        self.paths += len(path_targets)
+        self.segments += len(interior)
+        return self
+
+    def _accumulate(self, positions: np.ndarray, velocity: np.ndarray, net_acceleration: np.ndarray):
+        """Add one chunk of Euler–Lagrange residual rows to the normal equations"""
+        values, gradients = monomial_basis(positions, self.exponents)  # (n, S), (n, d, S)
+        basis = self._symmetric_basis
+        basis_velocity = np.tensordot(velocity, basis, axes=(1, 2))              # E_b v, (n, B, d)
+        basis_acceleration = np.tensordot(net_acceleration, basis, axes=(1, 2))  # E_b (a − f)
+        quadratic = np.einsum('nbi,ni->nb', basis_velocity, velocity)            # vᵀ E_b v
+        directional = np.einsum('nks,nk->ns', gradients, velocity)               # v·∇φ_s
+
+        # Residual row m, parameter (s, b): φ_s E_b(a−f) + (v·∇φ_s) E_b v − ½ ∂_mφ_s vᵀE_b v
+        shape = (len(positions), self.dimension, len(self.exponents), len(basis))
+        design, term = np.empty(shape), np.empty(shape)
+        np.multiply(values[:, None, :, None], basis_acceleration.transpose(0, 2, 1)[:, :, None, :], out=design)
+        np.multiply(directional[:, None, :, None], basis_velocity.transpose(0, 2, 1)[:, :, None, :], out=term)
+        design += term
+        np.multiply(gradients[:, :, :, None], (0.5 * quadratic)[:, None, None, :], out=term)
+        design -= term
+        design = design.reshape(len(positions) * self.dimension, -1)
+        baseline = (net_acceleration @ self.base_metric.T).ravel()  # g₀(a − f)
+
+        self._normal_matrix += design.T @ design
+        self._normal_vector += design.T @ baseline
+        self._baseline_residual += float(baseline @ baseline)
+
+    def fit(self, batches: Iterable[Iterable]) -> PolynomialMetric:
+        """Stream trajectory batches, e.g. LearningTrajectoryRecorder.iter_trajectory_batches()"""
+        for batch in batches:
+            self.partial_fit(batch)
+        return self.metric_field()
+
+    def _solve(self) -> np.ndarray:
+        """Ridge solution θ of the accumulated normal equations"""
+        scale = max(np.trace(self._normal_matrix) / max(len(self._normal_vector), 1), 1.0)
+        system = self._normal_matrix + self.ridge * scale * np.eye(len(self._normal_vector))
+        return -np.linalg.solve(system, self._normal_vector)
+
+    def coefficients(self) -> np.ndarray:
+        """Correction coefficient matrices C_s, shape (S, dimension, dimension)"""
+        theta = self._solve().reshape(len(self.exponents), -1)
+        return np.tensordot(theta, self._symmetric_basis, axes=(1, 0))
+
+    def metric_field(self) -> PolynomialMetric:
+        """Fitted metric, ready for EducationalManifold.set_metric_field"""
+        return PolynomialMetric(self.base_metric, self.coefficients(), self.degree)
+
+    def statistics(self) -> Dict:
+        """Residual of the base metric versus the fitted metric over all segments"""
+        theta = self._solve()
+        fitted_residual = (theta @ self._normal_matrix @ theta + 2 * theta @ self._normal_vector
+                           + self._baseline_residual)
+        return {
+            'paths': self.paths,
+            'segments': self.segments,
+            'parameters': len(self._normal_vector),
+            'baseline_residual': self._baseline_residual,
+            'fitted_residual': float(fitted_residual),
+            'residual_reduction': (1.0 - fitted_residual / self._baseline_residual
+                                   if self._baseline_residual > 0 else 0.0)
+        }
+
+def _field(record, name: str):
+    """Field of a JSON record or a LearningTrajectory-like object, None when absent"""
+    if isinstance(record, dict):
+        return record.get(name)
+    return getattr(record, name, None)
@@ -0,0 +1,36 @@
+import numpy as np
+
+def segment_distances(points: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """Euclidean distance of each point (n, dimension) to the segment [start, end]"""
+    direction = end - start
+    length_squared = float(direction @ direction)
+    if length_squared == 0.0:
+        return np.linalg.norm(points - start, axis=1)
+    fraction = np.clip((points - start) @ direction / length_squared, 0.0, 1.0)
+    return np.linalg.norm(points - start - fraction[:, None] * direction, axis=1)
+
+def simplify_path(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Ramer–Douglas–Peucker simplification of a (T, dimension) path
+    Returns sorted indices of the kept points; every dropped point lies within
+    tolerance of the simplified polyline, and both endpoints are always kept
+    """
+    points = np.asarray(points, dtype=float)
+    if len(points) <= 2:
+        return np.arange(len(points))
+
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        distances = segment_distances(points[first + 1:last], points[first], points[last])
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return np.flatnonzero(keep)
@@ -1,8 +1,46 @@
 import numpy as np
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+from .relationship_analyzer import MutualDeterminationAnalyzer
+
+def type_bitmasks(sources: np.ndarray, type_codes: np.ndarray, n_entities: int, n_types: int) -> np.ndarray:
+    """Per-entity bitmask words (n_entities, ⌈n_types / 64⌉) of outgoing relationship types"""
+    n_words = max(1, -(-n_types // 64))
+    masks = np.zeros((n_entities, n_words), dtype=np.uint64)
+    type_codes = np.asarray(type_codes, dtype=np.int64)
+    np.bitwise_or.at(masks, (sources, type_codes // 64), np.left_shift(np.uint64(1), (type_codes % 64).astype(np.uint64)))
+    return masks
+
+# SWAR popcount masks; np.bitwise_count would need NumPy 2, the repo pins 1.24
+_M1, _M2, _M4 = np.uint64(0x5555555555555555), np.uint64(0x3333333333333333), np.uint64(0x0F0F0F0F0F0F0F0F)
+_BYTE_SUM = np.uint64(0x0101010101010101)
+
+def bit_counts(words: np.ndarray) -> np.ndarray:
+    """Set bits of every uint64 word, by parallel bit summation within the word"""
+    words = words - ((words >> np.uint64(1)) & _M1)
+    words = (words & _M2) + ((words >> np.uint64(2)) & _M2)
+    words = (words + (words >> np.uint64(4))) & _M4
+    return (words * _BYTE_SUM) >> np.uint64(56)  # Top byte sums the byte counts
+
+def jaccard_complementarity(masks_a: np.ndarray, masks_b: np.ndarray) -> np.ndarray:
+    """1 - |A ∩ B| / |A ∪ B| for every pair of rows of two bitmask blocks; 0 when both are empty"""
+    if masks_a.shape[1] == 1:
+        # Up to 64 types: one word per entity, no reduction over words
+        intersection = bit_counts(masks_a[:, :1] & masks_b[:, 0]).astype(np.int64)
+    else:
+        intersection = bit_counts(masks_a[:, None, :] & masks_b[None, :, :]).sum(axis=2, dtype=np.int64)
+    # |A ∪ B| = |A| + |B| - |A ∩ B| saves a second pass over the pair block
+    union = (bit_counts(masks_a).sum(axis=1, dtype=np.int64)[:, None] +
+             bit_counts(masks_b).sum(axis=1, dtype=np.int64)[None, :] - intersection)
+    return np.where(union > 0, 1.0 - intersection / np.maximum(union, 1), 0.0)
+
+def creative_synergy(creative_a: np.ndarray, creative_b: np.ndarray) -> np.ndarray:
+    """0.8 when both entities of a pair are creative, 0.5 when one is, 0.2 otherwise"""
+    both = creative_a[:, None].astype(np.int8) + creative_b[None, :].astype(np.int8)
+    return np.array([0.2, 0.5, 0.8])[both]
+
 class CoCreationPhase(Enum):
     """Phases of co-creative process in mutual determination"""
     POTENTIAL_ALIGNMENT = 1
@@ -28,82 +66,134 @@ class CoCreationOptimizer:
     def __init__(self, mutual_analyzer: MutualDeterminationAnalyzer):
         self.analyzer = mutual_analyzer
         self.optimization_threshold = 0.6
+        self._profiles = None  # (store version, type bitmasks, creative flags)
+        self._groups = None  # (store version, signature groups)
     
-    def identify_co_creation_opportunities(self) -> List[CoCreationOpportunity]:
-        """Identify potential co-creation opportunities in the network"""
-        opportunities = []
-        entities = list(self.analyzer.relationship_graph.nodes())
+    def _entity_profiles(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Outgoing type bitmasks and creative flags of every entity, cached until the network changes"""
+        store = self.analyzer.store
+        if self._profiles is not None and self._profiles[0] == store.version:
+            return self._profiles[1], self._profiles[2]
+        columns = store.columns()
+        masks = type_bitmasks(columns['source'], columns['type'], store.n_entities, len(store.types))
+        creative = np.zeros(store.n_entities, dtype=bool)
+        if 'creative' in store.type_index:
+            code = store.type_index['creative']
+            creative = (masks[:, code // 64] >> np.uint64(code % 64)) & np.uint64(1) == 1
+        self._profiles = (store.version, masks, creative)
+        return masks, creative
+    
+    def _signature_groups(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Entities grouped by type signature (which includes the creative bit): group
+        bitmasks and creative flags, plus member entity codes ordered by group and
+        each group's start offset into them, cached until the network changes
+        """
+        store = self.analyzer.store
+        if self._groups is not None and self._groups[0] == store.version:
+            return self._groups[1]
+        masks, creative = self._entity_profiles()
+        signatures, first, groups = np.unique(masks, axis=0, return_index=True, return_inverse=True)
+        members = np.argsort(groups.ravel(), kind='stable')
+        starts = np.zeros(len(signatures) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(groups.ravel(), minlength=len(signatures)), out=starts[1:])
+        self._groups = (store.version, (signatures, creative[first], members, starts))
+        return self._groups[1]
+    
+    def _qualifying_group_pairs(self, signatures: np.ndarray, creative: np.ndarray, floor: float,
+                                block_size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Group pairs g < h scoring above floor, scored over block_size × block_size tiles"""
+        n_groups = len(signatures)
+        found = []
+        for begin_g in range(0, n_groups, block_size):
+            end_g = min(begin_g + block_size, n_groups)
+            for begin_h in range(begin_g, n_groups, block_size):
+                end_h = min(begin_h + block_size, n_groups)
+                potential = (jaccard_complementarity(signatures[begin_g:end_g], signatures[begin_h:end_h]) *
+                             creative_synergy(creative[begin_g:end_g], creative[begin_h:end_h]))
+                if begin_g == begin_h:
+                    # Entities sharing a signature have zero complementarity and never qualify
+                    potential = np.triu(potential, k=1)
+                rows, cols = np.nonzero(potential > floor)
+                found.append((rows + begin_g, cols + begin_h, potential[rows, cols]))
+        if not found:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+        return tuple(np.concatenate(parts) for parts in zip(*found))
+    
+    def score_pairs(self, top_k: Optional[int] = None, block_size: int = 256) -> List[Tuple[float, int, int]]:
+        """
+        (potential strength, i, j) for entity-code pairs i < j above the thresholds, strongest first
+        Potential depends only on the two type signatures, so each pair of signature
+        groups is scored once and only qualifying group pairs are expanded into entity
+        pairs; with top_k, expansion stops at the group pairs needed to fill it
+        """
+        signatures, creative, members, starts = self._signature_groups()
+        floor = max(self.optimization_threshold, 0.3)
+        g, h, strength = self._qualifying_group_pairs(signatures, creative, floor, block_size)
+        sizes = np.diff(starts)
+        counts = sizes[g] * sizes[h]
+        
+        order = np.argsort(-strength, kind='stable')
+        g, h, strength, counts = g[order], h[order], strength[order], counts[order]
+        if top_k is not None and counts.sum() > top_k:
+            # Expand every group pair at least as strong as the one holding the k-th pair
+            cutoff = strength[np.searchsorted(np.cumsum(counts), top_k)]
+            keep = strength >= cutoff
+            g, h, strength, counts = g[keep], h[keep], strength[keep], counts[keep]
         
-        # Analyze all entity pairs for co-creative potential
-        for i, entity1 in enumerate(entities):
-            for entity2 in entities[i+1:]:
-                opportunity = self._analyze_pair_potential(entity1, entity2)
-                if opportunity and opportunity.potential_strength > self.optimization_threshold:
-                    opportunities.append(opportunity)
+        # Pair t of group pair p is member t // |h| of g with member t % |h| of h
+        pair_of = np.repeat(np.arange(len(counts)), counts)
+        local = np.arange(len(pair_of)) - np.repeat(np.cumsum(counts) - counts, counts)
+        first = members[starts[g[pair_of]] + local // sizes[h[pair_of]]]
+        second = members[starts[h[pair_of]] + local % sizes[h[pair_of]]]
+        i, j = np.minimum(first, second), np.maximum(first, second)
+        strength = strength[pair_of]
         
-        return sorted(opportunities, key=lambda x: x.potential_strength, reverse=True)
+        # Strongest first; ties keep the pair order of a row-by-row scan
+        order = np.lexsort((j, i, -strength))[:top_k]
+        return list(zip(strength[order].tolist(), i[order].tolist(), j[order].tolist()))
+    
+    def identify_co_creation_opportunities(self, top_k: Optional[int] = None,
+                                           block_size: int = 256) -> List[CoCreationOpportunity]:
+        """Identify potential co-creation opportunities in the network"""
+        entities = self.analyzer.store.entities
+        return [self._build_opportunity(entities[i], entities[j], i, j, strength)
+                for strength, i, j in self.score_pairs(top_k, block_size)]
+    
+    def _pair_relationships(self, i: int, j: int) -> List[Dict]:
+        """Strength and type of every relationship between entity codes i and j, both directions"""
+        store = self.analyzer.store
+        columns = store.columns()
+        edge_ids = np.concatenate([store.edge_ids_between(i, j), store.edge_ids_between(j, i)])
+        return [{'strength': strength, 'type': store.types[code]}
+                for strength, code in zip(columns['strength'][edge_ids].tolist(), columns['type'][edge_ids].tolist())]
+    
+    def _build_opportunity(self, entity1: str, entity2: str, i: int, j: int,
+                           potential_strength: float) -> CoCreationOpportunity:
+        """Opportunity with its phase taken from the relationships already linking the pair"""
+        masks, _ = self._entity_profiles()
+        complementarity = float(jaccard_complementarity(masks[i:i + 1], masks[j:j + 1])[0, 0])
+        phase = self._determine_optimal_phase(self._pair_relationships(i, j), complementarity)
+        return CoCreationOpportunity(
+            entities=[entity1, entity2],
+            potential_strength=potential_strength,
+            phase=phase,
+            recommended_actions=self._generate_co_creation_actions(entity1, entity2, phase)
+        )
     
     def _analyze_pair_potential(self, entity1: str, entity2: str) -> CoCreationOpportunity:
         """Analyze co-creative potential between two entities"""
-        # Get existing relationship data
-        existing_relationships = list(self.analyzer.relationship_graph.edges(entity1, entity2, data=True))
-        existing_relationships.extend(self.analyzer.relationship_graph.edges(entity2, entity1, data=True))
-        
-        # Calculate complementarity
-        complementarity = self._calculate_complementarity(entity1, entity2)
-        
-        # Calculate creative synergy
-        synergy = self._calculate_creative_synergy(entity1, entity2)
-        
-        # Determine optimal phase
-        phase = self._determine_optimal_phase(existing_relationships, complementarity)
-        
-        potential_strength = complementarity * synergy
+        index = self.analyzer.store.entity_index
+        i, j = index[entity1], index[entity2]
+        masks, creative = self._entity_profiles()
+        potential_strength = float(jaccard_complementarity(masks[i:i + 1], masks[j:j + 1])[0, 0] *
+                                   creative_synergy(creative[i:i + 1], creative[j:j + 1])[0, 0])
         
         if potential_strength > 0.3:  # Minimum threshold for opportunity
-            return CoCreationOpportunity(
-                entities=[entity1, entity2],
-                potential_strength=potential_strength,
-                phase=phase,
-                recommended_actions=self._generate_co_creation_actions(entity1, entity2, phase)
-            )
+            return self._build_opportunity(entity1, entity2, i, j, potential_strength)
         
         return None
     
-    def _calculate_complementarity(self, entity1: str, entity2: str) -> float:
-        """Calculate how complementary two entities are for co-creation"""
-        # Analyze relationship patterns to find complementary strengths
-        entity1_relationships = list(self.analyzer.relationship_graph.edges(entity1, data=True))
-        entity2_relationships = list(self.analyzer.relationship_graph.edges(entity2, data=True))
-        
-        # Simple complementarity based on relationship type diversity
-        entity1_types = set(rel[2]['type'] for rel in entity1_relationships)
-        entity2_types = set(rel[2]['type'] for rel in entity2_relationships)
-        
-        # Complementarity is higher when entities have different relationship patterns
-        union_size = len(entity1_types.union(entity2_types))
-        intersection_size = len(entity1_types.intersection(entity2_types))
-        
-        if union_size == 0:
-            return 0.0
-        
-        return 1.0 - (intersection_size / union_size)
-    
-    def _calculate_creative_synergy(self, entity1: str, entity2: str) -> float:
-        """Calculate creative synergy potential between entities"""
-        # Creative synergy is higher when both entities have creative relationships
-        entity1_creative = any(rel[2]['type'] == 'creative' 
-                              for rel in self.analyzer.relationship_graph.edges(entity1, data=True))
-        entity2_creative = any(rel[2]['type'] == 'creative' 
-                              for rel in self.analyzer.relationship_graph.edges(entity2, data=True))
-        
-        if entity1_creative and entity2_creative:
-            return 0.8  # High synergy when both are creative
-        elif entity1_creative or entity2_creative:
-            return 0.5  # Medium synergy when one is creative
-        else:
-            return 0.2  # Low synergy
-    
     def _determine_optimal_phase(self, existing_relationships: List, 
                                complementarity: float) -> CoCreationPhase:
         """Determine the optimal co-creation phase for the entity pair"""
@@ -111,8 +201,8 @@ class CoCreationOptimizer:
             return CoCreationPhase.POTENTIAL_ALIGNMENT
         
         # Analyze existing relationship strength and type
-        avg_strength = np.mean([rel[2]['strength'] for rel in existing_relationships])
-        has_creative = any(rel[2]['type'] == 'creative' for rel in existing_relationships)
+        avg_strength = np.mean([rel['strength'] for rel in existing_relationships])
+        has_creative = any(rel['type'] == 'creative' for rel in existing_relationships)
         
         if avg_strength < 0.3:
             return CoCreationPhase.RELATIONSHIP_FORMATION
@@ -224,7 +314,7 @@ class CoCreationOptimizer:
 # Example demonstration
 def demonstrate_co_creation_optimization():
     """Demonstrate co-creation optimization"""
-    from relationship_analyzer import MutualDeterminationAnalyzer, Relationship
+    from .relationship_analyzer import Relationship
     
     # Create analyzer with sample data
     analyzer = MutualDeterminationAnalyzer()
@@ -0,0 +1,150 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .network_aggregates import PAIR_MASK, PAIR_SHIFT, pair_key
+
+# Loop graph shipped once to each process-pool worker, plus its extracted components
+_worker_graph = None
+_worker_components: Dict[int, Tuple] = {}
+
+def _initialize_loop_worker(graph):
+    global _worker_graph
+    _worker_graph = graph
+    _worker_components.clear()
+
+def _worker_loops(component_id: int, nodes: np.ndarray, start_begin: int, start_end: int,
+                  max_length: int, min_weight: float) -> List[Tuple[Tuple[int, ...], float]]:
+    if component_id not in _worker_components:
+        _worker_components.clear()  # Keep one component's adjacency lists at a time
+        _worker_components[component_id] = component_adjacency(_worker_graph, nodes)
+    adjacency = _worker_components[component_id]
+    return list(_component_cycles(nodes, adjacency, start_begin, start_end, max_length, min_weight))
+
+def loop_graph(sources: np.ndarray, targets: np.ndarray, weights: np.ndarray, n_entities: int) -> sparse.csr_matrix:
+    """Directed entity graph keeping the strongest strength·coherence over parallel edges"""
+    keys, inverse = np.unique(pair_key(sources, targets), return_inverse=True)
+    strongest = np.zeros(len(keys))
+    np.maximum.at(strongest, inverse, weights)
+    return sparse.csr_matrix((strongest, (keys >> PAIR_SHIFT, keys & PAIR_MASK)), shape=(n_entities, n_entities))
+
+def loop_components(graph: sparse.csr_matrix) -> List[np.ndarray]:
+    """Strongly connected components that can hold a loop: two or more entities, or a self-loop"""
+    if graph.shape[0] == 0:
+        return []
+    _, labels = connected_components(graph, directed=True, connection='strong')
+    order = np.argsort(labels, kind='stable')
+    boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+    self_loops = graph.diagonal() > 0
+    return [nodes for nodes in np.split(order, boundaries)
+            if len(nodes) > 1 or self_loops[nodes[0]]]
+
+def component_adjacency(graph: sparse.csr_matrix, nodes: np.ndarray) -> Tuple:
+    """Local successor, weight and predecessor lists of one component, plus its strongest edge"""
+    sub = graph[nodes][:, nodes].tocsr()
+    sub.sort_indices()
+    indptr, indices, data = sub.indptr.tolist(), sub.indices.tolist(), sub.data.tolist()
+    successors = [indices[indptr[v]:indptr[v + 1]] for v in range(len(nodes))]
+    weights = [data[indptr[v]:indptr[v + 1]] for v in range(len(nodes))]
+    transposed = sub.T.tocsr()
+    indptr, indices = transposed.indptr.tolist(), transposed.indices.tolist()
+    predecessors = [indices[indptr[v]:indptr[v + 1]] for v in range(len(nodes))]
+    return successors, weights, predecessors, max(data) if data else 0.0
+
+def _hops_to(start: int, predecessors: List[List[int]], max_hops: int) -> Dict[int, int]:
+    """Hop distance to start of every entity >= start that can reach it within max_hops"""
+    hops, frontier = {start: 0}, [start]
+    for distance in range(1, max_hops + 1):
+        frontier = [u for v in frontier for u in predecessors[v] if u > start and u not in hops]
+        for u in frontier:
+            hops.setdefault(u, distance)
+    return hops
+
+def _component_cycles(nodes: np.ndarray, adjacency: Tuple, start_begin: int, start_end: int,
+                      max_length: int, min_weight: float) -> Iterator[Tuple[Tuple[int, ...], float]]:
+    """
+    Simple cycles of at most max_length entities whose smallest local index lies in
+    [start_begin, start_end), each reported once from that smallest index
+    A backward search of max_length // 2 hops from each start prunes paths that
+    cannot close in time, and weight bounds prune paths that cannot reach min_weight
+    """
+    successors, weights, predecessors, strongest = adjacency
+    entity_codes = nodes.tolist()
+    horizon = max_length // 2
+    for start in range(start_begin, start_end):
+        hops = _hops_to(start, predecessors, horizon)
+        path, path_weights, on_path = [start], [1.0], {start}
+        positions = [0]
+        while positions:
+            node, position = path[-1], positions[-1]
+            if position == len(successors[node]):
+                positions.pop()
+                on_path.discard(path.pop())
+                path_weights.pop()
+                continue
+            positions[-1] += 1
+            successor = successors[node][position]
+            weight = path_weights[-1] * weights[node][position]
+            if successor == start:
+                if weight >= min_weight:
+                    yield tuple(entity_codes[v] for v in path), weight
+                continue
+            depth = len(path)
+            if successor < start or successor in on_path or depth >= max_length:
+                continue
+            # From successor at most max_length - depth edges may lead back to start
+            budget = max_length - depth
+            if budget <= horizon and hops.get(successor, budget + 1) > budget:
+                continue
+            # At least one edge must still close the loop, at most budget of them
+            if weight * strongest ** (budget if strongest > 1.0 else 1) < min_weight:
+                continue
+            path.append(successor)
+            path_weights.append(weight)
+            on_path.add(successor)
+            positions.append(0)
+
+def enumerate_feedback_loops(graph: sparse.csr_matrix, max_length: int = 4, min_weight: float = 0.0,
+                             n_workers: Optional[int] = 1, starts_per_task: int = 256,
+                             components: Optional[List[np.ndarray]] = None
+                             ) -> Iterator[Tuple[Tuple[int, ...], float]]:
+    """
+    Stream (entity codes, weight) for every simple directed cycle of at most max_length
+    entities whose product of edge weights reaches min_weight
+    Cycles never leave a strongly connected component, so components (from
+    loop_components unless given) are searched independently, split into tasks by
+    start entity; the search is serial unless n_workers > 1 (None: one per CPU)
+    """
+    if max_length < 1:
+        raise ValueError("max_length must be at least 1")
+    if components is None:
+        components = loop_components(graph)
+    tasks = [(component_id, nodes, begin, min(begin + starts_per_task, len(nodes)))
+             for component_id, nodes in enumerate(components)
+             for begin in range(0, len(nodes), starts_per_task)]
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = min(n_workers, len(tasks))
+
+    if n_workers > 1:
+        # Loops stream back task by task as workers finish
+        pool = ProcessPoolExecutor(max_workers=n_workers, initializer=_initialize_loop_worker,
+                                   initargs=(graph,))
+        try:
+            futures = [pool.submit(_worker_loops, component_id, nodes, begin, end, max_length, min_weight)
+                       for component_id, nodes, begin, end in tasks]
+            for future in as_completed(futures):
+                yield from future.result()
+        finally:
+            # A consumer stopping early (GeneratorExit) only waits for the running tasks
+            pool.shutdown(wait=True, cancel_futures=True)
+        return
+
+    adjacency, current = None, None
+    for component_id, nodes, begin, end in tasks:
+        if component_id != current:
+            adjacency, current = component_adjacency(graph, nodes), component_id
+        yield from _component_cycles(nodes, adjacency, begin, end, max_length, min_weight)
@@ -0,0 +1,332 @@
+import numpy as np
+from scipy import sparse
+from typing import Dict, Iterable, List, Tuple
+
+EDUCATIONAL_TYPES = ('educational', 'supportive')
+CREATIVE_TYPES = ('creative', 'challenging')
+
+# Directed pairs pack into one int64 key: source in the high 32 bits, target in the low
+PAIR_SHIFT = 32
+PAIR_MASK = (1 << PAIR_SHIFT) - 1
+
+def pair_key(sources, targets):
+    """Packed int64 key of directed entity pairs"""
+    return (np.asarray(sources, dtype=np.int64) << PAIR_SHIFT) | np.asarray(targets, dtype=np.int64)
+
+def column_health_metrics(sources: np.ndarray, targets: np.ndarray, strength: np.ndarray,
+                          type_codes: np.ndarray, types: List[str], coherence: np.ndarray) -> Dict[str, float]:
+    """
+    Health metrics of an edge list by sparse algebra and grouped reductions
+    Same definitions as NetworkAggregates; entities are those incident to the edges
+    """
+    n_relationships = len(sources)
+    if n_relationships == 0:
+        return {'reciprocity': 0.0, 'coherence': 0.0, 'complexity': 0.0,
+                'educational_efficiency': 0.0, 'creative_potential': 0.0}
+    n_entities = int(max(sources.max(), targets.max())) + 1
+    n_active = np.count_nonzero(np.bincount(sources, minlength=n_entities) +
+                                np.bincount(targets, minlength=n_entities))
+
+    # Reciprocal edges: Σ A∘(Aᵀ > 0) over the multiplicity matrix A (self-loops included)
+    multiplicity = sparse.csr_matrix((np.ones(n_relationships, dtype=np.int64), (sources, targets)),
+                                     shape=(n_entities, n_entities))
+    reciprocal = multiplicity.multiply(multiplicity.T.tocsr() > 0).sum()
+
+    # Per-type totals; entropy over the types present
+    type_counts = np.bincount(type_codes, minlength=len(types))
+    type_strength = np.bincount(type_codes, strength, minlength=len(types))
+    type_coherence = np.bincount(type_codes, coherence, minlength=len(types))
+    probabilities = type_counts[type_counts > 0] / n_relationships
+    max_possible_relationships = n_active * (n_active - 1)
+    density = n_relationships / max_possible_relationships if max_possible_relationships > 0 else 0
+
+    # Masks over type codes select the educational and creative totals
+    educational = np.array([t in EDUCATIONAL_TYPES for t in types], dtype=bool)
+    educational_count = type_counts[educational].sum()
+    creative = np.array([t in CREATIVE_TYPES for t in types], dtype=bool)
+    creative_count = type_counts[creative].sum()
+    return {
+        'reciprocity': float(reciprocal) / n_relationships,
+        'coherence': float(coherence.sum()) / n_relationships,
+        'complexity': density * float(-np.sum(probabilities * np.log2(probabilities))),
+        'educational_efficiency': (type_strength[educational].sum() / educational_count *
+                                   type_coherence[educational].sum() / educational_count
+                                   if educational_count else 0.0),
+        'creative_potential': (type_strength[creative].sum() / creative_count *
+                               np.count_nonzero(type_counts[creative]) / 2.0
+                               if creative_count else 0.0)
+    }
+
+class NetworkAggregates:
+    """
+    Running sums behind the mutual determination health metrics
+    Every added relationship updates them in O(1) and bulk loads fold in whole
+    batches vectorized, so health queries read a handful of totals instead of
+    rescanning the edge list
+    """
+
+    def __init__(self):
+        self.n_entities = 0  # Entity codes seen so far
+        self.active_entities = 0  # Entities with at least one incident relationship
+        self.relationship_count = 0
+        self.reciprocal_count = 0  # Edges u→v with at least one v→u edge
+        self.coherence_total = 0.0
+
+        # Per relationship type: count, strength sum, coherence sum
+        self.type_counts: Dict[str, int] = {}
+        self.type_strength: Dict[str, float] = {}
+        self.type_coherence: Dict[str, float] = {}
+
+        # Directed pair (i, j) -> [multiplicity, Σ strength·coherence]: sorted arrays keyed
+        # by pair_key from bulk loads, plus a dict of single adds made since
+        self._pair_keys = np.zeros(0, dtype=np.int64)
+        self._pair_counts = np.zeros(0, dtype=np.int64)
+        self._pair_weights = np.zeros(0)
+        self.pairs: Dict[Tuple[int, int], List] = {}
+
+        # Per entity over incident (in + out) edges: count, strength sum, coherence sum
+        self.incident_counts = np.zeros(0, dtype=np.int64)
+        self.incident_strength = np.zeros(0)
+        self.incident_coherence = np.zeros(0)
+
+    def _reserve(self, n_entities: int):
+        if n_entities > len(self.incident_counts):
+            capacity = max(1024, n_entities, 2 * len(self.incident_counts))
+            for name in ('incident_counts', 'incident_strength', 'incident_coherence'):
+                old = getattr(self, name)
+                new = np.zeros(capacity, dtype=old.dtype)
+                new[:len(old)] = old
+                setattr(self, name, new)
+        self.n_entities = max(self.n_entities, n_entities)
+
+    def add(self, i: int, j: int, strength: float, relationship_type: str, coherence: float):
+        """Fold one relationship between entity codes i → j into the totals"""
+        self._reserve(max(i, j) + 1)
+        self.relationship_count += 1
+        self.coherence_total += coherence
+        self.type_counts[relationship_type] = self.type_counts.get(relationship_type, 0) + 1
+        self.type_strength[relationship_type] = self.type_strength.get(relationship_type, 0.0) + strength
+        self.type_coherence[relationship_type] = self.type_coherence.get(relationship_type, 0.0) + coherence
+
+        count = self.pair_count(i, j)
+        reverse_count = count if i == j else self.pair_count(j, i)
+        if reverse_count > 0 or i == j:
+            self.reciprocal_count += 1  # The new edge itself is reciprocated
+        if count == 0 and i != j:
+            self.reciprocal_count += reverse_count  # Existing j→i edges gain a partner
+        pair = self.pairs.setdefault((i, j), [0, 0.0])
+        pair[0] += 1
+        pair[1] += strength * coherence
+
+        for k in (i, j):
+            if self.incident_counts[k] == 0:
+                self.active_entities += 1
+            self.incident_counts[k] += 1
+            self.incident_strength[k] += strength
+            self.incident_coherence[k] += coherence
+
+    def remove(self, i: int, j: int, strength: float, relationship_type: str, coherence: float):
+        """Retract one previously added relationship i → j from the totals"""
+        self.relationship_count -= 1
+        self.coherence_total -= coherence
+        self.type_counts[relationship_type] -= 1
+        self.type_strength[relationship_type] -= strength
+        self.type_coherence[relationship_type] -= coherence
+
+        # Mirror of add: the edge loses its own reciprocation, and removing the last
+        # i→j edge leaves every j→i edge without a partner
+        count = self.pair_count(i, j)
+        reverse_count = count if i == j else self.pair_count(j, i)
+        if reverse_count > 0 or i == j:
+            self.reciprocal_count -= 1
+        if count == 1 and i != j:
+            self.reciprocal_count -= reverse_count
+        pair = self.pairs.setdefault((i, j), [0, 0.0])
+        pair[0] -= 1
+        pair[1] -= strength * coherence
+        if pair[0] == 0:
+            del self.pairs[(i, j)]  # Drops accumulated rounding along with the entry
+
+        for k in (i, j):
+            self.incident_counts[k] -= 1
+            self.incident_strength[k] -= strength
+            self.incident_coherence[k] -= coherence
+            if self.incident_counts[k] == 0:
+                self.active_entities -= 1
+
+    def add_bulk(self, sources: np.ndarray, targets: np.ndarray, strength: np.ndarray,
+                 type_codes: np.ndarray, types: List[str], coherence: np.ndarray):
+        """Fold a batch of relationships (entity and type codes) into the totals in one vectorized pass"""
+        if len(sources) == 0:
+            return
+        self._reserve(int(max(sources.max(), targets.max())) + 1)
+        self._fold_bulk(1, sources, targets, strength, type_codes, types, coherence)
+
+    def remove_bulk(self, sources: np.ndarray, targets: np.ndarray, strength: np.ndarray,
+                    type_codes: np.ndarray, types: List[str], coherence: np.ndarray):
+        """Retract a batch of previously added relationships in one vectorized pass, mirroring add_bulk"""
+        if len(sources) == 0:
+            return
+        self._fold_bulk(-1, sources, targets, strength, type_codes, types, coherence)
+
+    def _fold_bulk(self, sign: int, sources: np.ndarray, targets: np.ndarray, strength: np.ndarray,
+                   type_codes: np.ndarray, types: List[str], coherence: np.ndarray):
+        """Add (sign 1) or retract (sign -1) a batch of relationships"""
+        self.relationship_count += sign * len(sources)
+        self.coherence_total += sign * float(coherence.sum())
+
+        n_types = len(types)
+        type_counts = np.bincount(type_codes, minlength=n_types)
+        type_strength = np.bincount(type_codes, strength, minlength=n_types)
+        type_coherence = np.bincount(type_codes, coherence, minlength=n_types)
+        for code in np.flatnonzero(type_counts).tolist():
+            relationship_type = types[code]
+            self.type_counts[relationship_type] = (self.type_counts.get(relationship_type, 0) +
+                                                   sign * int(type_counts[code]))
+            self.type_strength[relationship_type] = (self.type_strength.get(relationship_type, 0.0) +
+                                                     sign * type_strength[code])
+            self.type_coherence[relationship_type] = (self.type_coherence.get(relationship_type, 0.0) +
+                                                      sign * type_coherence[code])
+
+        # Incident edges are in-edges plus out-edges, so self-loops count twice
+        n_entities = self.n_entities
+        incident = np.concatenate([sources, targets])
+        self.incident_counts[:n_entities] += sign * np.bincount(incident, minlength=n_entities)
+        self.incident_strength[:n_entities] += sign * np.bincount(
+            incident, np.concatenate([strength, strength]), minlength=n_entities)
+        self.incident_coherence[:n_entities] += sign * np.bincount(
+            incident, np.concatenate([coherence, coherence]), minlength=n_entities)
+        self.active_entities = int(np.count_nonzero(self.incident_counts[:n_entities]))
+
+        # Pending single adds are already in reciprocal_count; the batch only changes
+        # the reciprocation of its own pairs and their reverses
+        if self.pairs:
+            overlay = np.array(list(self.pairs.keys()), dtype=np.int64)
+            overlay_values = np.array(list(self.pairs.values()), dtype=float)
+            overlay_keys = pair_key(overlay[:, 0], overlay[:, 1])
+            order = np.argsort(overlay_keys)
+            self._merge_pairs(overlay_keys[order], overlay_values[order, 0].astype(np.int64),
+                              overlay_values[order, 1])
+            self.pairs = {}
+        keys, inverse = np.unique(pair_key(sources, targets), return_inverse=True)
+        if len(self._pair_keys):
+            affected = np.unique(np.concatenate([keys, pair_key(keys & PAIR_MASK, keys >> PAIR_SHIFT)]))
+            before = self._reciprocated(affected)
+        else:
+            affected, before = keys, 0  # Only pairs of the batch itself can be reciprocated
+        self._merge_pairs(keys, sign * np.bincount(inverse, minlength=len(keys)),
+                          sign * np.bincount(inverse, strength * coherence, minlength=len(keys)))
+        self.reciprocal_count += self._reciprocated(affected) - before
+
+    def _merge_pairs(self, keys: np.ndarray, counts: np.ndarray, weights: np.ndarray):
+        """Fold per-pair count and weight changes (sorted unique keys) into the sorted pair arrays"""
+        position = np.searchsorted(self._pair_keys, keys)
+        found = position < len(self._pair_keys)
+        found[found] = self._pair_keys[position[found]] == keys[found]
+        self._pair_counts[position[found]] += counts[found]
+        self._pair_weights[position[found]] += weights[found]
+        new = ~found
+        self._pair_keys = np.insert(self._pair_keys, position[new], keys[new])
+        self._pair_counts = np.insert(self._pair_counts, position[new], counts[new])
+        self._pair_weights = np.insert(self._pair_weights, position[new], weights[new])
+        if np.any(counts < 0):
+            # Pairs whose last edge left are dropped, along with their accumulated rounding
+            present = self._pair_counts > 0
+            self._pair_keys = self._pair_keys[present]
+            self._pair_counts = self._pair_counts[present]
+            self._pair_weights = self._pair_weights[present]
+
+    def _stored_counts(self, keys: np.ndarray) -> np.ndarray:
+        """Edge counts of sorted pair keys in the pair arrays, 0 when absent"""
+        counts = np.zeros(len(keys), dtype=np.int64)
+        if len(self._pair_keys) == 0:
+            return counts
+        position = np.minimum(np.searchsorted(self._pair_keys, keys), len(self._pair_keys) - 1)
+        found = self._pair_keys[position] == keys
+        counts[found] = self._pair_counts[position[found]]
+        return counts
+
+    def _reciprocated(self, keys: np.ndarray) -> int:
+        """Edges among the pairs keys (sorted) whose reverse pair exists (self-loops always)"""
+        sources, targets = keys >> PAIR_SHIFT, keys & PAIR_MASK
+        # Searching with sorted needles keeps the lookups cache-friendly on large networks
+        reverse = pair_key(targets, sources)
+        order = np.argsort(reverse)
+        reverse_counts = np.empty(len(keys), dtype=np.int64)
+        reverse_counts[order] = self._stored_counts(reverse[order])
+        counts = self._stored_counts(keys)
+        return int(counts[(reverse_counts > 0) | (sources == targets)].sum())
+
+    def _base_pair(self, i: int, j: int) -> Tuple[int, float]:
+        keys = self._pair_keys
+        if len(keys) == 0:
+            return 0, 0.0
+        key = pair_key(i, j)
+        position = int(np.searchsorted(keys, key))
+        if position < len(keys) and keys[position] == key:
+            return int(self._pair_counts[position]), float(self._pair_weights[position])
+        return 0, 0.0
+
+    def pair_count(self, i: int, j: int) -> int:
+        """Number of edges i→j"""
+        pair = self.pairs.get((i, j))
+        return self._base_pair(i, j)[0] + (pair[0] if pair is not None else 0)
+
+    def pair_weight(self, i: int, j: int) -> float:
+        """Σ strength·coherence over edges i→j"""
+        pair = self.pairs.get((i, j))
+        return self._base_pair(i, j)[1] + (pair[1] if pair is not None else 0.0)
+
+    def self_determination(self, indices) -> np.ndarray:
+        """Mean incident strength × mean incident coherence, capped at 1; 0.1 when isolated"""
+        counts = self.incident_counts[indices]
+        safe_counts = np.maximum(counts, 1)
+        determination = np.minimum(1.0, self.incident_strength[indices] / safe_counts *
+                                   self.incident_coherence[indices] / safe_counts)
+        return np.where(counts > 0, determination, 0.1)
+
+    def reciprocity(self) -> float:
+        return self.reciprocal_count / self.relationship_count if self.relationship_count else 0.0
+
+    def coherence(self) -> float:
+        return self.coherence_total / self.relationship_count if self.relationship_count else 0.0
+
+    def complexity(self) -> float:
+        """Edge density over active entities times the Shannon entropy of relationship types"""
+        n_entities = self.active_entities
+        if n_entities == 0 or self.relationship_count == 0:
+            return 0.0
+        max_possible_relationships = n_entities * (n_entities - 1)
+        density = self.relationship_count / max_possible_relationships if max_possible_relationships > 0 else 0
+        probabilities = np.array([count for count in self.type_counts.values() if count > 0],
+                                 dtype=float) / self.relationship_count
+        return density * float(-np.sum(probabilities * np.log2(probabilities)))
+
+    def metrics(self) -> Dict[str, float]:
+        """All health metrics, keyed as in column_health_metrics"""
+        return {
+            'reciprocity': self.reciprocity(),
+            'coherence': self.coherence(),
+            'complexity': self.complexity(),
+            'educational_efficiency': self.educational_efficiency(),
+            'creative_potential': self.creative_potential()
+        }
+
+    def _type_totals(self, types: Iterable[str]):
+        count = sum(self.type_counts.get(t, 0) for t in types)
+        strength = sum(self.type_strength.get(t, 0.0) for t in types)
+        coherence = sum(self.type_coherence.get(t, 0.0) for t in types)
+        return count, strength, coherence
+
+    def educational_efficiency(self) -> float:
+        """Mean strength × mean coherence of educational and supportive relationships"""
+        count, strength, coherence = self._type_totals(EDUCATIONAL_TYPES)
+        return (strength / count) * (coherence / count) if count else 0.0
+
+    def creative_potential(self) -> float:
+        """Mean creative strength × number of creative types present / 2"""
+        count, strength, _ = self._type_totals(CREATIVE_TYPES)
+        if not count:
+            return 0.0
+        diversity = sum(1 for t in CREATIVE_TYPES if self.type_counts.get(t, 0) > 0)
+        return (strength / count) * diversity / 2.0
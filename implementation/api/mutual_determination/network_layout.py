@@ -0,0 +1,194 @@
+import numpy as np
+import networkx as nx
+from scipy import sparse
+from typing import Optional, Tuple
+
+EXACT_LAYOUT_LIMIT = 500  # Force-directed layout costs O(n²) per iteration; larger networks go multilevel
+
+def label_propagation(adjacency: sparse.csr_matrix, rounds: int = 10, seed: int = 0) -> np.ndarray:
+    """
+    Community labels 0..c-1 by weighted label propagation on a symmetric adjacency
+    Each round a random half of the entities adopts the label carrying the most
+    neighbour weight, which avoids the oscillation of fully synchronous updates
+    """
+    n_entities = adjacency.shape[0]
+    rng = np.random.default_rng(seed)
+    labels = np.arange(n_entities)
+    for _ in range(rounds):
+        membership = sparse.csr_matrix((np.ones(n_entities), (np.arange(n_entities), labels)),
+                                       shape=(n_entities, n_entities))
+        label_weights = (adjacency @ membership).tocsr()
+        if label_weights.nnz == 0:
+            break
+        # Heaviest label per row: compare each entry with its row maximum
+        counts = np.diff(label_weights.indptr)
+        rows = np.flatnonzero(counts)
+        row_max = np.maximum.reduceat(label_weights.data, label_weights.indptr[rows])
+        heaviest = np.flatnonzero(label_weights.data == np.repeat(row_max, counts[rows]))
+        heaviest_rows = np.repeat(np.arange(n_entities), counts)[heaviest]
+        first = np.r_[True, heaviest_rows[1:] != heaviest_rows[:-1]]
+        proposed = labels.copy()
+        proposed[heaviest_rows[first]] = label_weights.indices[heaviest[first]]
+        update = rng.random(n_entities) < 0.5
+        changed = update & (proposed != labels)
+        labels = np.where(update, proposed, labels)
+        if not changed.any():
+            break
+    return np.unique(labels, return_inverse=True)[1]
+
+def community_graph(adjacency: sparse.csr_matrix, labels: np.ndarray) -> sparse.csr_matrix:
+    """Super-node adjacency Sᵀ A S summing weights between communities"""
+    n_communities = int(labels.max()) + 1 if len(labels) else 0
+    membership = sparse.csr_matrix((np.ones(len(labels)), (np.arange(len(labels)), labels)),
+                                   shape=(len(labels), n_communities))
+    return (membership.T @ adjacency @ membership).tocsr()
+
+def bucket_communities(labels: np.ndarray, max_communities: int) -> np.ndarray:
+    """
+    Cap labels at max_communities: the largest half of the budget stays as is, and the
+    remaining, smaller communities are pooled by size into the other half
+    """
+    sizes = np.bincount(labels)
+    if len(sizes) <= max_communities:
+        return labels
+    n_kept = max_communities // 2
+    n_buckets = max_communities - n_kept
+    order = np.argsort(-sizes, kind='stable')
+    rest = len(sizes) - n_kept
+    mapping = np.empty(len(sizes), dtype=np.int64)
+    mapping[order[:n_kept]] = np.arange(n_kept)
+    mapping[order[n_kept:]] = n_kept + np.arange(rest) * n_buckets // rest
+    return mapping[labels]
+
+def coarsen(adjacency: sparse.csr_matrix, max_communities: int, seed: int = 0) -> np.ndarray:
+    """
+    Labels for at most max_communities communities: label propagation on the community
+    graph while it still merges, then size buckets for whatever it cannot merge
+    (isolated entities, disjoint small components)
+    """
+    labels = np.arange(adjacency.shape[0])
+    coarse = adjacency
+    while labels.max(initial=-1) + 1 > max_communities:
+        level = label_propagation(coarse, seed=seed)
+        if level.max() + 1 == coarse.shape[0]:
+            return bucket_communities(labels, max(max_communities, 1))
+        labels = level[labels]
+        coarse = community_graph(coarse, level)
+    return labels
+
+def spring_positions(adjacency: sparse.csr_matrix, initial: Optional[np.ndarray] = None,
+                     iterations: int = 50, seed: int = 0) -> np.ndarray:
+    """Fruchterman–Reingold positions (n, 2), optionally refined from initial positions"""
+    n_entities = adjacency.shape[0]
+    if n_entities == 0:
+        return np.zeros((0, 2))
+    graph = nx.from_scipy_sparse_array(adjacency)
+    pos = dict(enumerate(initial)) if initial is not None else None
+    layout = nx.spring_layout(graph, pos=pos, iterations=iterations, seed=seed)
+    return np.array([layout[v] for v in range(n_entities)])
+
+class NetworkLayout:
+    """
+    Entity positions cached by entity code and refined incrementally
+    A repeated call on an unchanged network returns the cached positions; after
+    growth, known entities keep their positions as the seed, new ones start at
+    the mean of their placed neighbours, and only a few refinement iterations
+    run. Networks above exact_limit are laid out multilevel: communities from
+    label propagation are placed as super-nodes, and members spread around them
+    """
+
+    def __init__(self, exact_limit: int = EXACT_LAYOUT_LIMIT, iterations: int = 50,
+                 refine_iterations: int = 10, seed: int = 0):
+        self.exact_limit = exact_limit
+        self.iterations = iterations
+        self.refine_iterations = refine_iterations
+        self.rng = np.random.default_rng(seed)
+        self.seed = seed
+        self.positions: Optional[np.ndarray] = None
+        self.version = None
+        self._communities: Optional[Tuple] = None  # ((version, max_communities), communities)
+
+    def communities(self, adjacency: sparse.csr_matrix, version, max_communities: int) -> Tuple:
+        """
+        Super-node labels, sizes, weighted community graph and positions for at most
+        max_communities communities, cached until the network changes
+        """
+        cached = self._communities
+        if cached is not None and cached[0] == (version, max_communities):
+            return cached[1]
+        labels = coarsen(adjacency, max_communities, self.seed)
+        coarse = community_graph(adjacency, labels)
+        coarse.setdiag(0)
+        coarse.eliminate_zeros()
+        sizes = np.bincount(labels, minlength=coarse.shape[0])
+        centers = NetworkLayout(self.exact_limit, self.iterations, self.refine_iterations,
+                                self.seed).layout(coarse, version)
+        self._communities = ((version, max_communities), (labels, sizes, coarse, centers))
+        return self._communities[1]
+
+    def layout(self, adjacency: sparse.csr_matrix, version) -> np.ndarray:
+        """Positions (n, 2) for a symmetric weighted adjacency; version identifies the network state"""
+        n_entities = adjacency.shape[0]
+        if self.version == version and self.positions is not None and len(self.positions) == n_entities:
+            return self.positions
+
+        initial = self._seed_positions(adjacency)
+        if n_entities <= self.exact_limit:
+            iterations = self.iterations if initial is None else self.refine_iterations
+            positions = spring_positions(adjacency, initial, iterations, self.seed)
+        elif initial is None:
+            positions = self._multilevel(adjacency, label_propagation(adjacency, seed=self.seed))
+        else:
+            positions = self._smooth(adjacency, initial, self.refine_iterations)
+
+        self.positions, self.version = positions, version
+        return positions
+
+    def _seed_positions(self, adjacency: sparse.csr_matrix) -> Optional[np.ndarray]:
+        """Previous positions extended to new entities, or None without a usable cache"""
+        previous = self.positions
+        n_entities = adjacency.shape[0]
+        if previous is None or len(previous) > n_entities:
+            return None
+        n_known = len(previous)
+        positions = np.vstack([previous, np.zeros((n_entities - n_known, 2))])
+        if n_entities > n_known:
+            # New entities start at the weighted mean of their already placed neighbours
+            to_known = adjacency[n_known:, :n_known]
+            weight = np.asarray(to_known.sum(axis=1)).ravel()
+            placed = weight > 0
+            neighbour_mean = (to_known @ previous)[placed] / weight[placed, None]
+            spread = previous.std(axis=0) if n_known > 1 else np.ones(2)
+            positions[n_known:] = self.rng.normal(0.0, 1.0, (n_entities - n_known, 2)) * spread
+            positions[n_known:][placed] = neighbour_mean + self.rng.normal(0.0, 0.05, (placed.sum(), 2)) * spread
+        return positions
+
+    def _multilevel(self, adjacency: sparse.csr_matrix, labels: np.ndarray) -> np.ndarray:
+        """Lay out communities as super-nodes, then spread members around them"""
+        coarse = community_graph(adjacency, labels)
+        n_communities = coarse.shape[0]
+        if n_communities == adjacency.shape[0]:
+            # Propagation found no structure: fall back to a random start and smoothing
+            return self._smooth(adjacency, self.rng.normal(size=(n_communities, 2)), self.iterations)
+        coarse.setdiag(0)
+        coarse.eliminate_zeros()
+        if n_communities <= self.exact_limit:
+            centers = spring_positions(coarse, iterations=self.iterations, seed=self.seed)
+        else:
+            centers = self._multilevel(coarse, label_propagation(coarse, seed=self.seed))
+
+        # Members scatter around their community centre with radius growing as √size
+        sizes = np.bincount(labels, minlength=n_communities)
+        radius = 0.5 * np.sqrt(sizes / len(labels))
+        positions = centers[labels] + self.rng.normal(size=(len(labels), 2)) * radius[labels, None]
+        return self._smooth(adjacency, positions, self.refine_iterations)
+
+    def _smooth(self, adjacency: sparse.csr_matrix, positions: np.ndarray, iterations: int) -> np.ndarray:
+        """O(E)-per-step refinement pulling each entity halfway towards its neighbours' weighted mean"""
+        degree = np.asarray(adjacency.sum(axis=1)).ravel()
+        connected = degree > 0
+        for _ in range(iterations):
+            neighbour_mean = adjacency @ positions
+            positions = positions.copy()
+            positions[connected] = 0.5 * positions[connected] + 0.5 * neighbour_mean[connected] / degree[connected, None]
+        return positions
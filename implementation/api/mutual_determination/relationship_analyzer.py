@@ -1,9 +1,18 @@
+import heapq
 import numpy as np
-import networkx as nx
 from scipy import sparse
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
+
+from .feedback_loops import enumerate_feedback_loops, loop_components, loop_graph
+from .network_aggregates import NetworkAggregates, column_health_metrics
+from .network_layout import NetworkLayout
+from .relationship_ingest import iter_relationship_chunks
+from .relationship_store import ColumnarRelationshipStore
+from .spectral_analysis import SpectralAnalyzer
 
 @dataclass
 class Relationship:
@@ -21,183 +30,337 @@ class MutualDeterminationAnalyzer:
     Implements relationship tensor field theory from Ontologica
     """
     
-    def __init__(self):
-        self.relationship_graph = nx.MultiDiGraph()
+    def __init__(self, store: Optional[ColumnarRelationshipStore] = None):
+        # Columnar by default; pass a NetworkXRelationshipStore to keep a live MultiDiGraph
+        self.store = store if store is not None else ColumnarRelationshipStore()
         self.tensor_field = None
         self.coherence_threshold = 0.7
         
+        # Health totals and tensor entries changed since tensor_field was built
+        self.aggregates = NetworkAggregates()
+        self._dirty_pairs = set()
+        self._dirty_entities = set()
+        self._fold_store()
+        
+        # Keep the last modes, influence scores and positions to warm-start the next call
+        self.spectral = SpectralAnalyzer()
+        self.layout = NetworkLayout()
+    
+    @property
+    def relationship_graph(self):
+        """
+        networkx MultiDiGraph of all relationships: a frozen, read-only export for
+        columnar stores, the live graph for NetworkXRelationshipStore
+        """
+        return self.store.to_networkx()
+        
     def add_relationship(self, relationship: Relationship):
         """Add a relationship to the network"""
-        self.relationship_graph.add_edge(
+        i, j = self.store.add(
             relationship.source_entity,
             relationship.target_entity,
             strength=relationship.strength,
-            type=relationship.type,
+            relationship_type=relationship.type,
             coherence=relationship.coherence,
             timestamp=relationship.timestamp
         )
+        self.aggregates.add(i, j, relationship.strength, relationship.type, relationship.coherence)
+        if self.tensor_field is not None:
+            self._dirty_entities.update((i, j))
+            if i != j:
+                self._dirty_pairs.add((min(i, j), max(i, j)))
+    
+    def add_relationships_bulk(self, relationships, chunk_size: int = 1_000_000) -> int:
+        """
+        Add many relationships at once; returns how many were added
+        relationships is a mapping of column arrays or DataFrame with Relationship's field
+        names, an iterable of those, or a CSV / JSON-lines path read in chunk_size chunks
+        """
+        added = 0
+        for chunk in iter_relationship_chunks(relationships, chunk_size):
+            sources, targets, type_codes = self.store.add_bulk(
+                chunk['source_entity'], chunk['target_entity'], chunk['strength'],
+                chunk['type'], chunk['coherence'], chunk['timestamp'])
+            self.aggregates.add_bulk(sources, targets, chunk['strength'], type_codes,
+                                     self.store.types, chunk['coherence'])
+            added += len(sources)
+        if added:
+            # A bulk load touches most of the tensor, and a full build is one vectorized pass
+            self.tensor_field = None
+            self._dirty_pairs.clear()
+            self._dirty_entities.clear()
+        return added
     
-    def compute_mutual_determination_tensor(self) -> np.ndarray:
+    def rebuild(self):
+        """Recompute aggregates and drop the tensor, e.g. after editing a networkx-backed graph"""
+        refresh = getattr(self.store, 'refresh', None)
+        if refresh is not None:
+            refresh()
+        self.aggregates = NetworkAggregates()
+        self.tensor_field = None
+        self._dirty_pairs.clear()
+        self._dirty_entities.clear()
+        self._fold_store()
+        # Entity codes may have been reassigned, so previous modes no longer apply
+        self.spectral.eigenvectors = None
+        self.spectral.pagerank_scores = None
+        self.layout = NetworkLayout()
+    
+    def _fold_store(self):
+        """Fold relationships already held by the store into the aggregates"""
+        columns = self.store.columns()
+        self.aggregates.add_bulk(columns['source'], columns['target'], columns['strength'],
+                                 columns['type'], self.store.types, columns['coherence'])
+    
+    def compute_mutual_determination_tensor(self) -> sparse.csr_matrix:
         """
         Compute mutual determination tensor G_μν
-        Represents the strength and structure of Cᵢ ⇄ {R} feedback loops
+        Represents the strength and structure of Cᵢ ⇄ {R} feedback loops.
+        Built from the edge list in one vectorized pass as a sparse CSR matrix, so
+        time and memory are O(E); rows and columns follow store.entities
         """
-        entities = list(self.relationship_graph.nodes())
-        n_entities = len(entities)
-        
-        # Initialize tensor with educational coupling constant
-        tensor = np.zeros((n_entities, n_entities))
-        
-        for i, entity_i in enumerate(entities):
-            for j, entity_j in enumerate(entities):
-                if i == j:
-                    # Self-determination strength (reflexive relationship)
-                    tensor[i, j] = self._calculate_self_determination(entity_i)
-                else:
-                    # Mutual determination strength
-                    tensor[i, j] = self._calculate_mutual_strength(entity_i, entity_j)
+        if self.tensor_field is not None:
+            return self._patch_tensor()
+        
+        columns = self.store.columns()
+        n_entities = self.store.n_entities
+        sources, targets = columns['source'], columns['target']
+        strength, coherence = columns['strength'], columns['coherence']
+        
+        # Mutual determination strength min(1, (Σ s·c over i→j + Σ s·c over j→i) / 2):
+        # each edge lands at (i, j) and (j, i) and CSR conversion sums duplicates
+        between = sources != targets
+        weight = (strength * coherence)[between] / 2.0
+        rows = np.concatenate([sources[between], targets[between]])
+        cols = np.concatenate([targets[between], sources[between]])
+        mutual = sparse.csr_matrix((np.concatenate([weight, weight]), (rows, cols)),
+                                   shape=(n_entities, n_entities))
+        np.minimum(mutual.data, 1.0, out=mutual.data)
+        
+        # Self-determination strength (reflexive relationship) on the diagonal
+        self_determination = self._calculate_self_determination(
+            sources, targets, strength, coherence, n_entities)
+        tensor = (mutual + sparse.diags(self_determination, format='csr')).tocsr()
+        tensor.eliminate_zeros()
         
         self.tensor_field = tensor
+        self._dirty_pairs.clear()
+        self._dirty_entities.clear()
         return tensor
     
-    def _calculate_self_determination(self, entity: str) -> float:
-        """Calculate entity's self-determination strength"""
-        in_edges = list(self.relationship_graph.in_edges(entity, data=True))
-        out_edges = list(self.relationship_graph.out_edges(entity, data=True))
+    def _patch_tensor(self) -> sparse.csr_matrix:
+        """Rewrite only the tensor entries touched since the last build"""
+        tensor = self.tensor_field
+        n_entities = self.store.n_entities
+        if not self._dirty_entities and tensor.shape[0] == n_entities:
+            return tensor
+        
+        # New entities append empty rows and columns
+        n_old = tensor.shape[0]
+        if n_old < n_entities:
+            indptr = np.concatenate([tensor.indptr, np.full(n_entities - n_old, tensor.indptr[-1])])
+            tensor = sparse.csr_matrix((tensor.data, tensor.indices, indptr), shape=(n_entities, n_entities))
+        
+        pairs = np.array(sorted(self._dirty_pairs), dtype=np.int64).reshape(-1, 2)
+        pair_values = np.array([min(1.0, (self.aggregates.pair_weight(i, j) +
+                                          self.aggregates.pair_weight(j, i)) / 2.0)
+                                for i, j in pairs.tolist()])
+        diagonal = np.array(sorted(self._dirty_entities), dtype=np.int64)
+        rows = np.concatenate([pairs[:, 0], pairs[:, 1], diagonal])
+        cols = np.concatenate([pairs[:, 1], pairs[:, 0], diagonal])
+        values = np.concatenate([pair_values, pair_values, self.aggregates.self_determination(diagonal)])
+        
+        # Adding the difference to the current entries keeps the update vectorized
+        current = np.asarray(tensor[rows, cols]).ravel()
+        tensor = (tensor + sparse.csr_matrix((values - current, (rows, cols)),
+                                             shape=(n_entities, n_entities))).tocsr()
+        tensor.eliminate_zeros()
         
-        if not in_edges and not out_edges:
-            return 0.1  # Minimal self-awareness
-        
-        # Self-determination grows with relationship complexity
-        total_strength = sum(edge[2]['strength'] for edge in in_edges + out_edges)
-        avg_coherence = np.mean([edge[2]['coherence'] for edge in in_edges + out_edges])
-        
-        return min(1.0, total_strength * avg_coherence / len(in_edges + out_edges))
+        self.tensor_field = tensor
+        self._dirty_pairs.clear()
+        self._dirty_entities.clear()
+        return tensor
     
-    def _calculate_mutual_strength(self, entity1: str, entity2: str) -> float:
-        """Calculate mutual determination strength between two entities"""
-        edges_1_to_2 = list(self.relationship_graph.edges(entity1, entity2, data=True))
-        edges_2_to_1 = list(self.relationship_graph.edges(entity2, entity1, data=True))
-        
-        if not edges_1_to_2 and not edges_2_to_1:
-            return 0.0  # No direct relationship
-        
-        # Calculate bidirectional strength with coherence weighting
-        forward_strength = sum(edge[2]['strength'] * edge[2]['coherence'] 
-                              for edge in edges_1_to_2)
-        backward_strength = sum(edge[2]['strength'] * edge[2]['coherence'] 
-                               for edge in edges_2_to_1)
-        
-        mutual_strength = (forward_strength + backward_strength) / 2.0
-        return min(1.0, mutual_strength)
+    def _calculate_self_determination(self, sources: np.ndarray, targets: np.ndarray,
+                                      strength: np.ndarray, coherence: np.ndarray,
+                                      n_entities: int) -> np.ndarray:
+        """Calculate every entity's self-determination strength by grouped reductions"""
+        # Incident edges are in-edges plus out-edges, so self-loops count twice
+        incident = np.concatenate([sources, targets])
+        counts = np.bincount(incident, minlength=n_entities)
+        total_strength = np.bincount(incident, np.concatenate([strength, strength]), minlength=n_entities)
+        total_coherence = np.bincount(incident, np.concatenate([coherence, coherence]), minlength=n_entities)
+        
+        # Self-determination grows with relationship complexity; isolated entities
+        # keep a minimal self-awareness of 0.1
+        safe_counts = np.maximum(counts, 1)
+        determination = np.minimum(1.0, total_strength * (total_coherence / safe_counts) / safe_counts)
+        return np.where(counts > 0, determination, 0.1)
     
-    def analyze_network_health(self) -> Dict:
-        """Analyze overall health of the mutual determination network"""
+    def analyze_spectrum(self, k: int = 6, top_n: int = 10, damping: float = 0.85) -> Dict:
+        """
+        Dominant feedback modes of the mutual determination tensor and PageRank influence
+        Solves on the sparse tensor, warm-started from the previous call's results
+        """
         tensor = self.compute_mutual_determination_tensor()
-        entities = list(self.relationship_graph.nodes())
-        
-        # Network metrics
-        reciprocity = self._calculate_reciprocity()
-        coherence_score = self._calculate_network_coherence()
-        complexity = self._calculate_network_complexity()
-        
-        # Educational optimization metrics
-        educational_efficiency = self._calculate_educational_efficiency()
-        creative_potential = self._calculate_creative_potential()
-        
+        modes = self.spectral.dominant_modes(tensor, k)
+        influence = self.spectral.pagerank(tensor, damping=damping)
+        top = np.argsort(influence)[::-1][:top_n]
+        return {
+            'eigenvalues': modes['eigenvalues'],
+            'eigenvectors': modes['eigenvectors'],
+            'spectral_gap': modes['spectral_gap'],
+            'method': modes['method'],
+            'warm_started': modes['warm_started'],
+            'converged': modes['converged'],
+            'lobpcg_fallback': modes['lobpcg_fallback'],
+            'pagerank': influence,
+            'top_influencers': [(self.store.entities[i], float(influence[i])) for i in top.tolist()]
+        }
+    
+    def _loop_graph(self):
+        columns = self.store.columns()
+        return loop_graph(columns['source'], columns['target'], columns['strength'] * columns['coherence'],
+                          self.store.n_entities)
+    
+    def iter_feedback_loops(self, max_length: int = 4, min_weight: float = 0.0,
+                            n_workers: Optional[int] = 1) -> Iterator[Tuple[Tuple[str, ...], float]]:
+        """
+        Stream every simple feedback loop Cᵢ → … → Cᵢ of at most max_length entities
+        A loop's weight is the product of the strongest strength × coherence on each of
+        its edges; loops below min_weight are pruned during the search
+        """
+        entities = self.store.entities
+        for loop, weight in enumerate_feedback_loops(self._loop_graph(), max_length, min_weight, n_workers):
+            yield tuple(entities[i] for i in loop), weight
+    
+    def analyze_feedback_loops(self, max_length: int = 4, min_weight: float = 0.0,
+                               n_workers: Optional[int] = 1, top_n: int = 10) -> Dict:
+        """Loop statistics per length and the strongest loops, gathered from the loop stream"""
+        graph = self._loop_graph()
+        components = loop_components(graph)
+        counts = np.zeros(max_length + 1, dtype=np.int64)
+        weight_totals = np.zeros(max_length + 1)
+        strongest = []  # Min-heap of (weight, loop) holding the top_n loops
+        for loop, weight in enumerate_feedback_loops(graph, max_length, min_weight, n_workers,
+                                                     components=components):
+            counts[len(loop)] += 1
+            weight_totals[len(loop)] += weight
+            if len(strongest) < top_n:
+                heapq.heappush(strongest, (weight, loop))
+            elif weight > strongest[0][0]:
+                heapq.heapreplace(strongest, (weight, loop))
+        
+        entities = self.store.entities
+        return {
+            'loop_count': int(counts.sum()),
+            'loops_by_length': {length: int(counts[length]) for length in range(1, max_length + 1)},
+            'mean_weight_by_length': {length: float(weight_totals[length] / counts[length]) if counts[length] else 0.0
+                                      for length in range(1, max_length + 1)},
+            'strongly_connected_components': len(components),
+            'largest_component': max((len(nodes) for nodes in components), default=0),
+            'strongest_loops': [(tuple(entities[i] for i in loop), weight)
+                                for weight, loop in sorted(strongest, reverse=True)]
+        }
+    
+    def analyze_network_health(self, recompute: bool = False) -> Dict:
+        """
+        Analyze overall health of the mutual determination network
+        Reads the running aggregates; recompute=True derives every metric afresh from
+        the store columns with sparse algebra instead
+        """
+        if recompute:
+            columns = self.store.columns()
+            metrics = column_health_metrics(columns['source'], columns['target'], columns['strength'],
+                                            columns['type'], self.store.types, columns['coherence'])
+        else:
+            metrics = self.aggregates.metrics()
+        return self._health_report(metrics, self.store.n_entities, self.store.n_relationships)
+    
+    def analyze_window(self, start: float, end: float) -> Dict:
+        """Network health over relationships with start <= timestamp < end"""
+        edge_ids = self.store.edge_ids_in_window(start, end)
+        columns = {name: column[edge_ids] for name, column in self.store.columns().items()}
+        metrics = column_health_metrics(columns['source'], columns['target'], columns['strength'],
+                                        columns['type'], self.store.types, columns['coherence'])
+        entity_count = len(np.union1d(columns['source'], columns['target']))
+        return self._health_report(metrics, entity_count, len(edge_ids))
+    
+    def health_time_series(self, window: float, step: Optional[float] = None,
+                           start: Optional[float] = None, end: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """
+        Health metrics over windows [t, t + window) for t = start, start + step, ... < end
+        step defaults to window (e.g. hourly or daily buckets); a smaller step slides
+        the window. One streaming pass over the temporal index adds entering
+        relationships to running aggregates and retracts leaving ones, each slice
+        folded in as one vectorized batch
+        """
+        step = window if step is None else step
+        if window <= 0 or step <= 0:
+            raise ValueError("window and step must be positive")
+        timestamps, edge_ids = self.store.temporal_index()
+        if start is None:
+            start = float(timestamps[0]) if len(timestamps) else 0.0
+        if end is None:
+            end = float(timestamps[-1]) + step if len(timestamps) else start
+        window_starts = np.arange(start, end, step)
+        
+        columns = self.store.columns()
+        sources, targets = columns['source'][edge_ids], columns['target'][edge_ids]
+        strength, coherence = columns['strength'][edge_ids], columns['coherence'][edge_ids]
+        type_codes, types = columns['type'][edge_ids], list(self.store.types)
+        first_positions = np.searchsorted(timestamps, window_starts)
+        last_positions = np.searchsorted(timestamps, window_starts + window)
+        
+        def edges(begin: int, stop: int) -> Tuple:
+            """Columns of time-sorted positions [begin, stop), as add_bulk takes them"""
+            return (sources[begin:stop], targets[begin:stop], strength[begin:stop],
+                    type_codes[begin:stop], types, coherence[begin:stop])
+        
+        series = {name: np.zeros(len(window_starts)) for name in
+                  ('reciprocity', 'coherence', 'complexity', 'educational_efficiency', 'creative_potential')}
+        series['entity_count'] = np.zeros(len(window_starts), dtype=np.int64)
+        series['relationship_count'] = np.zeros(len(window_starts), dtype=np.int64)
+        
+        # The window covers time-sorted positions [low, high)
+        aggregates, low, high = NetworkAggregates(), 0, 0
+        for w, (first, last) in enumerate(zip(first_positions.tolist(), last_positions.tolist())):
+            if first >= high:
+                # No overlap with the previous window: start over rather than retract everything
+                aggregates, low, high = NetworkAggregates(), first, first
+            aggregates.add_bulk(*edges(high, last))
+            aggregates.remove_bulk(*edges(low, first))
+            low, high = first, max(last, high)
+            
+            for name, value in aggregates.metrics().items():
+                series[name][w] = value
+            series['entity_count'][w] = aggregates.active_entities
+            series['relationship_count'][w] = aggregates.relationship_count
+        
+        series['window_start'] = window_starts
+        series['window_end'] = window_starts + window
+        return series
+    
+    def _health_report(self, metrics: Dict[str, float], entity_count: int, relationship_count: int) -> Dict:
+        """Arrange health metrics into the analyze_network_health report"""
         return {
             'network_health': {
-                'reciprocity': reciprocity,
-                'coherence': coherence_score,
-                'complexity': complexity,
-                'entity_count': len(entities),
-                'relationship_count': self.relationship_graph.number_of_edges()
+                'reciprocity': metrics['reciprocity'],
+                'coherence': metrics['coherence'],
+                'complexity': metrics['complexity'],
+                'entity_count': entity_count,
+                'relationship_count': relationship_count
             },
             'educational_metrics': {
-                'efficiency': educational_efficiency,
-                'creative_potential': creative_potential,
+                'efficiency': metrics['educational_efficiency'],
+                'creative_potential': metrics['creative_potential'],
                 'optimal_range': (0.6, 1.0)  # Predicted healthy range
             },
             'recommendations': self._generate_network_recommendations(
-                reciprocity, coherence_score, educational_efficiency
+                metrics['reciprocity'], metrics['coherence'], metrics['educational_efficiency']
             )
         }
     
-    def _calculate_reciprocity(self) -> float:
-        """Calculate reciprocity of relationships in the network"""
-        reciprocal_edges = 0
-        total_edges = 0
-        
-        for edge in self.relationship_graph.edges():
-            source, target = edge[0], edge[1]
-            if self.relationship_graph.has_edge(target, source):
-                reciprocal_edges += 1
-            total_edges += 1
-        
-        return reciprocal_edges / total_edges if total_edges > 0 else 0.0
-    
-    def _calculate_network_coherence(self) -> float:
-        """Calculate overall coherence of the relationship network"""
-        coherences = [data['coherence'] for _, _, data in self.relationship_graph.edges(data=True)]
-        return np.mean(coherences) if coherences else 0.0
-    
-    def _calculate_network_complexity(self) -> float:
-        """Calculate complexity of the relationship network"""
-        n_entities = self.relationship_graph.number_of_nodes()
-        n_relationships = self.relationship_graph.number_of_edges()
-        
-        if n_entities == 0:
-            return 0.0
-        
-        # Complexity measure based on relationship diversity and structure
-        max_possible_relationships = n_entities * (n_entities - 1)
-        density = n_relationships / max_possible_relationships if max_possible_relationships > 0 else 0
-        
-        # Shannon entropy of relationship types
-        type_counts = {}
-        for _, _, data in self.relationship_graph.edges(data=True):
-            rel_type = data['type']
-            type_counts[rel_type] = type_counts.get(rel_type, 0) + 1
-        
-        total_relationships = sum(type_counts.values())
-        if total_relationships == 0:
-            return 0.0
-        
-        entropy = 0.0
-        for count in type_counts.values():
-            probability = count / total_relationships
-            entropy -= probability * np.log2(probability)
-        
-        return density * entropy
-    
-    def _calculate_educational_efficiency(self) -> float:
-        """Calculate educational efficiency of the network"""
-        # Educational efficiency is higher when relationships support learning
-        educational_edges = [data for _, _, data in self.relationship_graph.edges(data=True) 
-                           if data['type'] in ['educational', 'supportive']]
-        
-        if not educational_edges:
-            return 0.0
-        
-        avg_educational_strength = np.mean([edge['strength'] for edge in educational_edges])
-        avg_educational_coherence = np.mean([edge['coherence'] for edge in educational_edges])
-        
-        return avg_educational_strength * avg_educational_coherence
-    
-    def _calculate_creative_potential(self) -> float:
-        """Calculate creative potential of the network"""
-        # Creative relationships enable novel pattern creation
-        creative_edges = [data for _, _, data in self.relationship_graph.edges(data=True) 
-                        if data['type'] in ['creative', 'challenging']]
-        
-        if not creative_edges:
-            return 0.0
-        
-        creative_strength = np.mean([edge['strength'] for edge in creative_edges])
-        creative_diversity = len(set(edge['type'] for edge in creative_edges))
-        
-        return creative_strength * creative_diversity / 2.0  # Normalize
-    
     def _generate_network_recommendations(self, reciprocity: float, 
                                         coherence: float, 
                                         efficiency: float) -> List[str]:
@@ -220,37 +383,68 @@ class MutualDeterminationAnalyzer:
         
         return recommendations
     
-    def visualize_network(self, save_path: str = None):
-        """Visualize the mutual determination network"""
+    def visualize_network(self, save_path: str = None, max_nodes: int = 2000):
+        """
+        Visualize the mutual determination network
+        Positions come from the cached layout; networks above max_nodes entities are
+        drawn as at most max_nodes community super-nodes
+        """
         plt.figure(figsize=(12, 10))
         
-        # Create layout
-        pos = nx.spring_layout(self.relationship_graph, k=1, iterations=50)
-        
-        # Draw nodes
-        nx.draw_networkx_nodes(self.relationship_graph, pos, node_size=500,
-                              node_color='lightblue', alpha=0.9)
+        # Symmetric off-diagonal tensor weights drive the layout
+        tensor = self.compute_mutual_determination_tensor()
+        adjacency = (tensor - sparse.diags(tensor.diagonal())).tocsr()
+        adjacency.eliminate_zeros()
         
-        # Draw edges with strength-based width and type-based color
+        # Edge colours by relationship type
         edge_colors = {
             'educational': 'green',
             'creative': 'purple', 
             'supportive': 'blue',
             'challenging': 'orange'
         }
+        type_colors = np.array([to_rgba(edge_colors.get(t, 'gray'), alpha=0.7) for t in self.store.types]).reshape(-1, 4)
+        columns = self.store.columns()
+        ax = plt.gca()
         
-        for edge in self.relationship_graph.edges(data=True):
-            source, target, data = edge
-            color = edge_colors.get(data['type'], 'gray')
-            width = data['strength'] * 3  # Scale width by strength
+        if self.store.n_entities <= max_nodes:
+            pos = self.layout.layout(adjacency, self.store.version)
             
-            nx.draw_networkx_edges(self.relationship_graph, pos,
-                                  edgelist=[(source, target)],
-                                  width=width, alpha=0.7,
-                                  edge_color=color, arrows=True)
-        
-        # Draw labels
-        nx.draw_networkx_labels(self.relationship_graph, pos, font_size=8)
+            # One LineCollection for every relationship, width scaled by strength
+            segments = np.stack([pos[columns['source']], pos[columns['target']]], axis=1)
+            ax.add_collection(LineCollection(segments, colors=type_colors[columns['type']],
+                                             linewidths=columns['strength'] * 3, zorder=1))
+            ax.scatter(pos[:, 0], pos[:, 1], s=500 if self.store.n_entities <= 100 else 20,
+                       c='lightblue', alpha=0.9, zorder=2)
+            if self.store.n_entities <= 100:
+                for entity, (x, y) in zip(self.store.entities, pos):
+                    ax.text(x, y, entity, fontsize=8, ha='center', va='center', zorder=3)
+        else:
+            # Community super-nodes sized by membership, laid out on the community graph
+            labels, sizes, _, centers = self.layout.communities(adjacency, self.store.version, max_nodes)
+            n_communities = len(sizes)
+            
+            # One segment per community pair, coloured by its dominant relationship type
+            source_community = labels[columns['source']]
+            target_community = labels[columns['target']]
+            between = source_community != target_community
+            keys = (np.minimum(source_community, target_community) * n_communities +
+                    np.maximum(source_community, target_community))[between]
+            pair_keys, inverse = np.unique(keys, return_inverse=True)
+            strength = np.bincount(inverse, columns['strength'][between], minlength=len(pair_keys))
+            type_strength = np.zeros((len(pair_keys), max(len(self.store.types), 1)))
+            np.add.at(type_strength, (inverse, columns['type'][between]), columns['strength'][between])
+            if len(pair_keys) > 5 * max_nodes:
+                # Only the strongest community links stay legible
+                strongest = np.argpartition(strength, -5 * max_nodes)[-5 * max_nodes:]
+                pair_keys, strength, type_strength = pair_keys[strongest], strength[strongest], type_strength[strongest]
+            segments = np.stack([centers[pair_keys // n_communities], centers[pair_keys % n_communities]], axis=1)
+            ax.add_collection(LineCollection(segments, colors=type_colors[type_strength.argmax(axis=1)],
+                                             linewidths=0.5 + 3 * strength / max(strength.max(initial=0.0), 1e-12),
+                                             zorder=1))
+            ax.scatter(centers[:, 0], centers[:, 1], s=20 + 500 * sizes / sizes.max(),
+                       c='lightblue', alpha=0.9, edgecolors='steelblue', zorder=2)
+        ax.autoscale_view()
         
         # Create legend
         legend_elements = [plt.Line2D([0], [0], color=color, lw=3, label=rel_type)
@@ -298,7 +492,7 @@ def demonstrate_mutual_determination():
     # Compute and display tensor
     tensor = analyzer.compute_mutual_determination_tensor()
     print(f"\nMutual Determination Tensor (G_μν):")
-    print(tensor)
+    print(tensor.toarray())
     
     # Visualize network
     analyzer.visualize_network("mutual_determination_network.png")
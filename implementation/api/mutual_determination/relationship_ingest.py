@@ -0,0 +1,49 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterator, Mapping
+
+RELATIONSHIP_COLUMNS = ('source_entity', 'target_entity', 'strength', 'type', 'coherence', 'timestamp')
+REQUIRED_COLUMNS = RELATIONSHIP_COLUMNS[:5]
+
+def read_relationship_file(path, chunk_size: int = 1_000_000) -> Iterator[pd.DataFrame]:
+    """Chunked reader for a CSV or JSON-lines relationship file"""
+    extension = os.path.splitext(str(path))[1].lower()
+    names = {'source_entity': str, 'target_entity': str, 'type': str}
+    if extension == '.csv':
+        return pd.read_csv(path, chunksize=chunk_size, dtype=names)
+    if extension in ('.jsonl', '.ndjson', '.json'):
+        return pd.read_json(path, lines=True, chunksize=chunk_size, dtype=names)
+    raise ValueError(f"Unsupported relationship file format: {extension}")
+
+def relationship_columns(chunk) -> Dict[str, np.ndarray]:
+    """Normalize a DataFrame or mapping of columns to the relationship column arrays"""
+    missing = [name for name in REQUIRED_COLUMNS if name not in chunk]
+    if missing:
+        raise ValueError(f"Relationship columns missing: {missing}")
+    columns = {
+        'source_entity': np.asarray(chunk['source_entity']),
+        'target_entity': np.asarray(chunk['target_entity']),
+        'type': np.asarray(chunk['type']),
+        'strength': np.asarray(chunk['strength'], dtype=float),
+        'coherence': np.asarray(chunk['coherence'], dtype=float)
+    }
+    n_rows = len(columns['source_entity'])
+    columns['timestamp'] = (np.asarray(chunk['timestamp'], dtype=float) if 'timestamp' in chunk
+                            else np.zeros(n_rows))
+    if any(len(column) != n_rows for column in columns.values()):
+        raise ValueError("Relationship columns must all have the same length")
+    return columns
+
+def iter_relationship_chunks(relationships, chunk_size: int = 1_000_000) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Relationship column arrays from any supported bulk source
+    Accepts a mapping of column arrays, a pandas DataFrame, an iterable of either
+    (e.g. a chunked pandas reader), or a path to a CSV / JSON-lines file
+    """
+    if isinstance(relationships, (str, os.PathLike)):
+        relationships = read_relationship_file(relationships, chunk_size)
+    if isinstance(relationships, (pd.DataFrame, Mapping)):
+        relationships = [relationships]
+    for chunk in relationships:
+        yield relationship_columns(chunk)
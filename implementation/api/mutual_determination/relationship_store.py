@@ -0,0 +1,273 @@
+import numpy as np
+from itertools import repeat
+import networkx as nx
+import pandas as pd
+from scipy import sparse
+from typing import Dict, List, Optional, Tuple
+
+COLUMN_NAMES = ('source', 'target', 'type', 'strength', 'coherence', 'timestamp')
+
+class ColumnarRelationshipStore:
+    """
+    Relationships as integer-coded NumPy columns
+    Entities and relationship types are interned to dense integer codes (each distinct
+    name is hashed once per bulk batch); strength, coherence and timestamp live in
+    growable float arrays. CSR (outgoing) and CSC (incoming) edge indexes are rebuilt
+    lazily after appends, and networkx is only an export format
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.entity_index: Dict[str, int] = {}
+        self.entities: List[str] = []
+        self.type_index: Dict[str, int] = {}
+        self.types: List[str] = []
+        self.n_relationships = 0
+        self.version = 0  # Bumped on every change so derived views know when to rebuild
+
+        self._columns = {
+            'source': np.zeros(capacity, dtype=np.int64),
+            'target': np.zeros(capacity, dtype=np.int64),
+            'type': np.zeros(capacity, dtype=np.int32),
+            'strength': np.zeros(capacity),
+            'coherence': np.zeros(capacity),
+            'timestamp': np.zeros(capacity)
+        }
+        self._indexes: Dict[str, Tuple] = {}  # 'out' / 'in' / 'time' -> (version, keys, edge ids)
+        self._graph: Optional[Tuple[int, nx.MultiDiGraph]] = None
+
+    @property
+    def n_entities(self) -> int:
+        return len(self.entities)
+
+    def intern_entity(self, entity: str) -> int:
+        return self._intern(self.entity_index, self.entities, entity)
+
+    def intern_type(self, relationship_type: str) -> int:
+        return self._intern(self.type_index, self.types, relationship_type)
+
+    @staticmethod
+    def _intern(index: Dict, names: List, value) -> int:
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(names)
+            names.append(value)
+        return code
+
+    def _intern_array(self, index: Dict, names: List, values: np.ndarray) -> np.ndarray:
+        """Codes for an array of names, hashing each distinct name once"""
+        local_codes, uniques = pd.factorize(values)
+        if len(local_codes) and local_codes.min() < 0:
+            raise ValueError("Relationship entities and types must not be missing")
+        uniques = np.asarray(uniques)
+        mapping = np.fromiter(map(index.get, uniques.tolist(), repeat(-1)), dtype=np.int64, count=len(uniques))
+        new = np.flatnonzero(mapping < 0)
+        if len(new):
+            new_names = uniques[new].tolist()
+            mapping[new] = np.arange(len(names), len(names) + len(new))
+            index.update(zip(new_names, range(len(names), len(names) + len(new))))
+            names.extend(new_names)
+        return mapping[local_codes]
+
+    def _reserve(self, n_rows: int):
+        capacity = len(self._columns['source'])
+        if n_rows <= capacity:
+            return
+        capacity = max(n_rows, 2 * capacity)
+        for name, column in self._columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.n_relationships] = column[:self.n_relationships]
+            self._columns[name] = grown
+
+    def add(self, source: str, target: str, strength: float, relationship_type: str,
+            coherence: float, timestamp: float) -> Tuple[int, int]:
+        """Append one relationship; returns its (source, target) entity codes"""
+        i, j = self.intern_entity(source), self.intern_entity(target)
+        row = self.n_relationships
+        self._reserve(row + 1)
+        columns = self._columns
+        columns['source'][row] = i
+        columns['target'][row] = j
+        columns['type'][row] = self.intern_type(relationship_type)
+        columns['strength'][row] = strength
+        columns['coherence'][row] = coherence
+        columns['timestamp'][row] = timestamp
+        self.n_relationships += 1
+        self.version += 1
+        return i, j
+
+    def add_bulk(self, sources: np.ndarray, targets: np.ndarray, strength: np.ndarray,
+                 relationship_types: np.ndarray, coherence: np.ndarray,
+                 timestamp: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Append a batch of relationships; returns their source, target and type codes"""
+        n_rows = len(sources)
+        # Interleaving sources and targets assigns codes in the order single adds would
+        endpoints = self._intern_array(self.entity_index, self.entities,
+                                       np.column_stack([sources, targets]).ravel())
+        source_codes, target_codes = endpoints[0::2], endpoints[1::2]
+        type_codes = self._intern_array(self.type_index, self.types, np.asarray(relationship_types)).astype(np.int32)
+
+        start = self.n_relationships
+        self._reserve(start + n_rows)
+        rows = slice(start, start + n_rows)
+        columns = self._columns
+        columns['source'][rows] = source_codes
+        columns['target'][rows] = target_codes
+        columns['type'][rows] = type_codes
+        columns['strength'][rows] = strength
+        columns['coherence'][rows] = coherence
+        columns['timestamp'][rows] = timestamp
+        self.n_relationships += n_rows
+        self.version += 1
+        return source_codes, target_codes, type_codes
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Views of the filled part of every column"""
+        return {name: column[:self.n_relationships] for name, column in self._columns.items()}
+
+    def type_mask(self, types) -> np.ndarray:
+        """Boolean mask of relationships whose type is in types"""
+        codes = [self.type_index[t] for t in types if t in self.type_index]
+        return np.isin(self.columns()['type'], codes)
+
+    def _edge_index(self, direction: str):
+        """Edge ids grouped by source ('out', CSR order) or target ('in', CSC order)"""
+        cached = self._indexes.get(direction)
+        if cached is not None and cached[0] == self.version:
+            return cached[1], cached[2]
+        keys = self.columns()['source' if direction == 'out' else 'target']
+        edge_ids = np.argsort(keys, kind='stable')
+        indptr = np.zeros(self.n_entities + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys, minlength=self.n_entities), out=indptr[1:])
+        self._indexes[direction] = (self.version, indptr, edge_ids)
+        return indptr, edge_ids
+
+    def out_edge_ids(self, entity: int) -> np.ndarray:
+        indptr, edge_ids = self._edge_index('out')
+        return edge_ids[indptr[entity]:indptr[entity + 1]]
+
+    def in_edge_ids(self, entity: int) -> np.ndarray:
+        indptr, edge_ids = self._edge_index('in')
+        return edge_ids[indptr[entity]:indptr[entity + 1]]
+
+    def edge_ids_between(self, source: int, target: int) -> np.ndarray:
+        out_ids = self.out_edge_ids(source)
+        return out_ids[self.columns()['target'][out_ids] == target]
+
+    def temporal_index(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Timestamps in ascending order and the edge ids they belong to, cached until the next change"""
+        cached = self._indexes.get('time')
+        if cached is not None and cached[0] == self.version:
+            return cached[1], cached[2]
+        timestamps = self.columns()['timestamp']
+        edge_ids = np.argsort(timestamps, kind='stable')
+        sorted_timestamps = timestamps[edge_ids]
+        self._indexes['time'] = (self.version, sorted_timestamps, edge_ids)
+        return sorted_timestamps, edge_ids
+
+    def edge_ids_in_window(self, start: float, end: float) -> np.ndarray:
+        """Ids of relationships with start <= timestamp < end, in time order"""
+        timestamps, edge_ids = self.temporal_index()
+        return edge_ids[np.searchsorted(timestamps, start):np.searchsorted(timestamps, end)]
+
+    def adjacency_matrix(self, weights: Optional[np.ndarray] = None) -> sparse.csr_matrix:
+        """Entity × entity CSR summing weights (default: edge multiplicity) over parallel edges"""
+        columns = self.columns()
+        data = np.ones(self.n_relationships) if weights is None else weights
+        return sparse.csr_matrix((data, (columns['source'], columns['target'])),
+                                 shape=(self.n_entities, self.n_entities))
+
+    def to_networkx(self) -> nx.MultiDiGraph:
+        """
+        Read-only MultiDiGraph export, cached until the next change
+        It is frozen because edits to it would be lost at the next version bump;
+        add relationships through the store, or use NetworkXRelationshipStore
+        """
+        if self._graph is not None and self._graph[0] == self.version:
+            return self._graph[1]
+        graph = nx.MultiDiGraph()
+        graph.add_nodes_from(self.entities)
+        columns = self.columns()
+        entities, types = self.entities, self.types
+        graph.add_edges_from(
+            (entities[i], entities[j], {'strength': s, 'type': types[t], 'coherence': c, 'timestamp': ts})
+            for i, j, t, s, c, ts in zip(columns['source'].tolist(), columns['target'].tolist(),
+                                         columns['type'].tolist(), columns['strength'].tolist(),
+                                         columns['coherence'].tolist(), columns['timestamp'].tolist())
+        )
+        nx.freeze(graph)
+        self._graph = (self.version, graph)
+        return graph
+
+class NetworkXRelationshipStore(ColumnarRelationshipStore):
+    """
+    Relationships kept in a networkx MultiDiGraph with per-edge attribute dicts
+    Columns are kept alongside the graph so every analyzer method runs unchanged;
+    call refresh() after editing the graph directly
+    """
+
+    def __init__(self, graph: Optional[nx.MultiDiGraph] = None):
+        super().__init__(capacity=0)
+        self.graph = graph if graph is not None else nx.MultiDiGraph()
+        self._synced_version = -1
+        self._sync()
+
+    def add(self, source: str, target: str, strength: float, relationship_type: str,
+            coherence: float, timestamp: float) -> Tuple[int, int]:
+        self.graph.add_edge(source, target, strength=strength, type=relationship_type,
+                            coherence=coherence, timestamp=timestamp)
+        # Columns grow alongside the graph; codes follow its node order, which is insertion order
+        codes = super().add(source, target, strength, relationship_type, coherence, timestamp)
+        self._synced_version = self.version
+        return codes
+
+    def add_bulk(self, sources: np.ndarray, targets: np.ndarray, strength: np.ndarray,
+                 relationship_types: np.ndarray, coherence: np.ndarray,
+                 timestamp: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        self.graph.add_edges_from(
+            (u, v, {'strength': s, 'type': t, 'coherence': c, 'timestamp': ts})
+            for u, v, s, t, c, ts in zip(np.asarray(sources).tolist(), np.asarray(targets).tolist(),
+                                         np.asarray(strength).tolist(), np.asarray(relationship_types).tolist(),
+                                         np.asarray(coherence).tolist(), np.asarray(timestamp).tolist())
+        )
+        codes = super().add_bulk(sources, targets, strength, relationship_types, coherence, timestamp)
+        self._synced_version = self.version
+        return codes
+
+    def refresh(self):
+        """Re-derive the columns after editing self.graph directly"""
+        self.version += 1
+        self._sync()
+
+    def _sync(self):
+        """Re-extract the columns from the graph after it changed"""
+        if self._synced_version == self.version:
+            return
+        # Re-intern from scratch so codes follow the graph's current node order
+        self.entity_index, self.entities = {}, []
+        self.type_index, self.types = {}, []
+        for entity in self.graph.nodes():
+            self.intern_entity(entity)
+        rows = {name: [] for name in COLUMN_NAMES}
+        # adjacency() yields the raw neighbour dicts, much cheaper than edge views
+        for source, neighbours in self.graph.adjacency():
+            source_index = self.entity_index[source]
+            for target, keyed_edges in neighbours.items():
+                target_index = self.entity_index[target]
+                for data in keyed_edges.values():
+                    rows['source'].append(source_index)
+                    rows['target'].append(target_index)
+                    rows['type'].append(self.intern_type(data['type']))
+                    rows['strength'].append(data['strength'])
+                    rows['coherence'].append(data['coherence'])
+                    rows['timestamp'].append(data.get('timestamp', 0.0))
+        self._columns = {name: np.array(values, dtype=self._column_dtype(name))
+                         for name, values in rows.items()}
+        self.n_relationships = len(rows['source'])
+        self._synced_version = self.version
+
+    @staticmethod
+    def _column_dtype(name: str):
+        return {'source': np.int64, 'target': np.int64, 'type': np.int32}.get(name, float)
+
+    def to_networkx(self) -> nx.MultiDiGraph:
+        return self.graph
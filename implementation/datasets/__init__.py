@@ -13,6 +13,7 @@ from .learning_geodesics.learning_trajectory_recorder import (
     LearningTrajectory,
     demonstrate_learning_trajectory_recording
 )
+from .learning_geodesics.knowledge_state_index import KnowledgeStateIndex
 
 from .relationship_networks.network_analyzer import (
     RelationshipNetworkAnalyzer,
@@ -28,6 +29,7 @@ __all__ = [
     # Learning trajectories  
     'LearningTrajectoryRecorder',
     'LearningTrajectory',
+    'KnowledgeStateIndex',
     'demonstrate_learning_trajectory_recording',
     
     # Relationship networks
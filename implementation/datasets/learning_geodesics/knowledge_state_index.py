@@ -0,0 +1,172 @@
+import numpy as np
+from pathlib import Path
+from scipy.spatial import cKDTree
+from typing import Dict, List
+
+class KnowledgeStateIndex:
+    """
+    Persistent nearest-neighbour index over (start_knowledge, target_knowledge) pairs
+    Rows are appended to a binary file as trajectories are recorded; queries use a
+    cKDTree over the bulk of the rows plus a brute-force scan of rows added since the
+    last rebuild, so inserts stay cheap and the tree is rebuilt only occasionally
+    """
+
+    def __init__(self, index_dir, dimension: int, rebuild_fraction: float = 0.01,
+                 min_rebuild_rows: int = 1024):
+        self.index_dir = Path(index_dir)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.dimension = dimension
+        self.rebuild_fraction = rebuild_fraction
+        self.min_rebuild_rows = min_rebuild_rows
+
+        self._vector_file = self.index_dir / f"knowledge_states_d{dimension}.bin"
+        self._id_file = self.index_dir / f"knowledge_state_ids_d{dimension}.txt"
+
+        self._vectors = np.zeros((0, 2 * dimension))
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._size = 0
+        # Query space -> (tree, number of rows it covers)
+        self._trees: Dict[str, tuple] = {}
+        self._load()
+
+    def _load(self):
+        """Read persisted rows; a torn final write is ignored"""
+        if not (self._vector_file.exists() and self._id_file.exists()):
+            return
+        vectors = np.fromfile(self._vector_file, dtype=np.float64)
+        vectors = vectors[:len(vectors) - len(vectors) % (2 * self.dimension)].reshape(-1, 2 * self.dimension)
+        ids = self._id_file.read_text(encoding='utf-8').splitlines()
+        n = min(len(vectors), len(ids))
+
+        self._grow(max(n, 1024))
+        self._vectors[:n] = vectors[:n]
+        self._ids = ids[:n]
+        self._size = n
+        self._alive[:n] = True
+        # Re-recorded trajectories keep only their latest row
+        for row, trajectory_id in enumerate(self._ids):
+            previous = self._rows.get(trajectory_id)
+            if previous is not None:
+                self._alive[previous] = False
+            self._rows[trajectory_id] = row
+
+    def _grow(self, capacity: int):
+        vectors = np.zeros((capacity, 2 * self.dimension))
+        alive = np.zeros(capacity, dtype=bool)
+        vectors[:self._size] = self._vectors[:self._size]
+        alive[:self._size] = self._alive[:self._size]
+        self._vectors, self._alive = vectors, alive
+
+    def add(self, trajectory_id: str, start_knowledge, target_knowledge):
+        """Append one trajectory's endpoints to memory and disk"""
+        row_vector = np.concatenate([np.asarray(start_knowledge, dtype=np.float64),
+                                     np.asarray(target_knowledge, dtype=np.float64)])
+        if row_vector.shape != (2 * self.dimension,):
+            raise ValueError(f"Expected {self.dimension}-dimensional start and target knowledge")
+        if '\n' in trajectory_id:
+            raise ValueError("Trajectory ids cannot contain newlines")
+
+        if self._size == len(self._vectors):
+            self._grow(max(1024, 2 * len(self._vectors)))
+        previous = self._rows.get(trajectory_id)
+        if previous is not None:
+            self._alive[previous] = False
+
+        row = self._size
+        self._vectors[row] = row_vector
+        self._alive[row] = True
+        self._ids.append(trajectory_id)
+        self._rows[trajectory_id] = row
+        self._size += 1
+
+        # Vector first: a crash between the two writes leaves an unreferenced row
+        with open(self._vector_file, 'ab') as f:
+            f.write(row_vector.tobytes())
+        with open(self._id_file, 'a', encoding='utf-8') as f:
+            f.write(trajectory_id + '\n')
+
+    def _columns(self, space: str) -> slice:
+        d = self.dimension
+        return {'joint': slice(0, 2 * d), 'start': slice(0, d), 'target': slice(d, 2 * d)}[space]
+
+    def _tree(self, space: str):
+        """Tree for a query space, rebuilt once the unindexed tail grows too long"""
+        tree, covered = self._trees.get(space, (None, 0))
+        pending = self._size - covered
+        if tree is None or pending > max(self.min_rebuild_rows, self.rebuild_fraction * covered):
+            covered = self._size
+            tree = cKDTree(self._vectors[:covered, self._columns(space)]) if covered else None
+            self._trees[space] = (tree, covered)
+        return tree, covered
+
+    def _query_vector(self, start_knowledge, target_knowledge):
+        if start_knowledge is None:
+            return 'target', np.asarray(target_knowledge, dtype=float)
+        if target_knowledge is None:
+            return 'start', np.asarray(start_knowledge, dtype=float)
+        return 'joint', np.concatenate([np.asarray(start_knowledge, dtype=float),
+                                        np.asarray(target_knowledge, dtype=float)])
+
+    def query(self, start_knowledge=None, target_knowledge=None, k: int = 5) -> Dict:
+        """k nearest trajectories by start, target, or both endpoints jointly"""
+        space, point = self._query_vector(start_knowledge, target_knowledge)
+        tree, covered = self._tree(space)
+
+        distances, rows = np.zeros(0), np.zeros(0, dtype=np.int64)
+        if tree is not None:
+            # Superseded rows can crowd out live ones: widen the search until k survive
+            n_neighbours = min(k, covered)
+            while True:
+                tree_distances, tree_rows = tree.query(point, k=n_neighbours)
+                tree_distances, tree_rows = np.atleast_1d(tree_distances), np.atleast_1d(tree_rows)
+                keep = self._alive[tree_rows]
+                if keep.sum() >= k or n_neighbours == covered:
+                    break
+                n_neighbours = min(2 * n_neighbours, covered)
+            distances, rows = tree_distances[keep], tree_rows[keep]
+
+        tail_distances, tail_rows = self._scan_tail(space, point, covered)
+        if len(tail_distances) > k:
+            nearest = np.argpartition(tail_distances, k)[:k]
+            tail_distances, tail_rows = tail_distances[nearest], tail_rows[nearest]
+        distances = np.concatenate([distances, tail_distances])
+        rows = np.concatenate([rows, tail_rows])
+        order = np.argsort(distances, kind='stable')[:k]
+        return self._result(rows[order], distances[order])
+
+    def query_radius(self, start_knowledge=None, target_knowledge=None, radius: float = 0.1) -> Dict:
+        """All trajectories within radius, nearest first"""
+        space, point = self._query_vector(start_knowledge, target_knowledge)
+        tree, covered = self._tree(space)
+
+        rows = np.zeros(0, dtype=np.int64)
+        if tree is not None:
+            rows = np.asarray(tree.query_ball_point(point, radius), dtype=np.int64)
+            rows = rows[self._alive[rows]]
+        distances = np.linalg.norm(self._vectors[rows, self._columns(space)] - point, axis=1)
+
+        tail_distances, tail_rows = self._scan_tail(space, point, covered)
+        within = tail_distances <= radius
+        distances = np.concatenate([distances, tail_distances[within]])
+        rows = np.concatenate([rows, tail_rows[within]])
+        order = np.argsort(distances, kind='stable')
+        return self._result(rows[order], distances[order])
+
+    def _scan_tail(self, space: str, point: np.ndarray, covered: int):
+        """Brute-force distances to live rows added after the last rebuild"""
+        offset = self._vectors[covered:self._size, self._columns(space)] - point
+        tail_distances = np.sqrt(np.einsum('ij,ij->i', offset, offset))
+        alive = self._alive[covered:self._size]
+        tail_rows = covered + np.flatnonzero(alive)
+        return tail_distances[alive], tail_rows
+
+    def _result(self, rows: np.ndarray, distances: np.ndarray) -> Dict:
+        return {
+            'trajectory_ids': [self._ids[row] for row in rows],
+            'distances': distances
+        }
+
+    def __len__(self) -> int:
+        return len(self._rows)
@@ -6,6 +6,11 @@ from pathlib import Path
 from dataclasses import dataclass, asdict
 from typing import Dict, List, Optional
 
+from .knowledge_state_index import KnowledgeStateIndex
+
+# Fields every recorded trajectory file carries; other JSON files in data_dir are skipped
+TRAJECTORY_RECORD_FIELDS = {'trajectory_id', 'start_knowledge', 'target_knowledge', 'path_coordinates'}
+
 @dataclass
 class LearningTrajectory:
     """Record of a learning path in educational manifold"""
@@ -20,6 +25,7 @@ class LearningTrajectory:
     educational_quality: float
     learner_metadata: Dict
     timestamp: str
+    time_points: Optional[List[float]] = None  # Observation time of each path coordinate
 
 class LearningTrajectoryRecorder:
     """Record and analyze learning trajectories in educational manifold"""
@@ -27,11 +33,15 @@ class LearningTrajectoryRecorder:
     def __init__(self, data_dir: str = "data/learning_geodesics"):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.index_dir = self.data_dir / "knowledge_index"
+        self._knowledge_indexes: Dict[int, KnowledgeStateIndex] = {}
         
     def record_learning_trajectory(self, trajectory: LearningTrajectory) -> str:
         """Record a complete learning trajectory"""
         # Validate trajectory data
         self._validate_trajectory(trajectory)
+        # Load or rebuild the spatial index before this trajectory's files exist on disk
+        knowledge_index = self._knowledge_index(len(trajectory.start_knowledge))
         
         # Save detailed trajectory data
         trajectory_file = self.data_dir / f"{trajectory.trajectory_id}.json"
@@ -40,6 +50,8 @@ class LearningTrajectoryRecorder:
         
         # Update trajectory index
         self._update_trajectory_index(trajectory)
+        knowledge_index.add(
+            trajectory.trajectory_id, trajectory.start_knowledge, trajectory.target_knowledge)
         
         return trajectory.trajectory_id
     
@@ -50,6 +62,9 @@ class LearningTrajectoryRecorder:
             "Start and target must have same dimension"
         assert 0 <= trajectory.efficiency_score <= 1, "Efficiency must be between 0 and 1"
         assert 0 <= trajectory.educational_quality <= 1, "Educational quality must be between 0 and 1"
+        assert trajectory.time_points is None or \
+            len(trajectory.time_points) == len(trajectory.path_coordinates), \
+            "Time points must match path coordinates"
     
     def _update_trajectory_index(self, trajectory: LearningTrajectory):
         """Update the master index of all learning trajectories"""
@@ -77,6 +92,63 @@ class LearningTrajectoryRecorder:
         
         index_df.to_csv(index_file, index=False)
     
+    def _knowledge_index(self, dimension: int) -> KnowledgeStateIndex:
+        """Spatial index for one knowledge-space dimension, built from JSON files on first use"""
+        if dimension not in self._knowledge_indexes:
+            needs_rebuild = (not self.index_dir.exists() and
+                             (self.data_dir / "trajectory_index.csv").exists())
+            if needs_rebuild:
+                self.rebuild_knowledge_index()
+            if dimension not in self._knowledge_indexes:
+                self._knowledge_indexes[dimension] = KnowledgeStateIndex(self.index_dir, dimension)
+        return self._knowledge_indexes[dimension]
+    
+    def rebuild_knowledge_index(self):
+        """Rebuild the spatial index by scanning every recorded trajectory file"""
+        for index_file in self.index_dir.glob("knowledge_state*"):
+            index_file.unlink()
+        self._knowledge_indexes = {}
+        
+        for data in self._iter_trajectory_records():
+            dimension = len(data['start_knowledge'])
+            if dimension not in self._knowledge_indexes:
+                self._knowledge_indexes[dimension] = KnowledgeStateIndex(self.index_dir, dimension)
+            self._knowledge_indexes[dimension].add(
+                data['trajectory_id'], data['start_knowledge'], data['target_knowledge'])
+    
+    def iter_trajectory_batches(self, batch_size: int = 1000):
+        """Stream recorded trajectory records from disk in batches of JSON dicts"""
+        batch = []
+        for data in self._iter_trajectory_records():
+            batch.append(data)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    def _iter_trajectory_records(self):
+        """Every trajectory record in data_dir, skipping JSON files that are not trajectories"""
+        for trajectory_file in sorted(self.data_dir.glob("*.json")):
+            with open(trajectory_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict) and TRAJECTORY_RECORD_FIELDS <= data.keys():
+                yield data
+    
+    def find_similar_trajectories(self, start_knowledge: Optional[List[float]] = None,
+                                  target_knowledge: Optional[List[float]] = None,
+                                  k: int = 5) -> Dict:
+        """k recorded trajectories nearest in start, target, or both endpoints"""
+        reference = start_knowledge if start_knowledge is not None else target_knowledge
+        return self._knowledge_index(len(reference)).query(start_knowledge, target_knowledge, k)
+    
+    def find_trajectories_within(self, start_knowledge: Optional[List[float]] = None,
+                                 target_knowledge: Optional[List[float]] = None,
+                                 radius: float = 0.1) -> Dict:
+        """Recorded trajectories within a radius in start, target, or both endpoints"""
+        reference = start_knowledge if start_knowledge is not None else target_knowledge
+        return self._knowledge_index(len(reference)).query_radius(start_knowledge, target_knowledge, radius)
+    
     def analyze_trajectory_efficiency(self, domain: str = None) -> Dict:
         """Analyze learning efficiency across recorded trajectories"""
         index_file = self.data_dir / "trajectory_index.csv"
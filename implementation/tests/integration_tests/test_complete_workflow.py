@@ -1,10 +1,13 @@
 import unittest
 import numpy as np
 from implementation.api.educational_manifold.geodesic_navigator import EducationalManifold
+from implementation.api.educational_manifold.metric_learning import MetricEstimator
 from implementation.api.consciousness_field.phi_calculator import PhiActivationCalculator, ConsciousnessState
 from implementation.api.consciousness_field.field_operator import ConsciousnessFieldOperator
 from implementation.datasets.learning_geodesics.learning_trajectory_recorder import LearningTrajectoryRecorder, LearningTrajectory
 from datetime import datetime
+import shutil
+import tempfile
 
 class TestCompleteWorkflow(unittest.TestCase):
     """Integration tests for complete Ontologica workflow"""
@@ -63,6 +66,59 @@ class TestCompleteWorkflow(unittest.TestCase):
         analysis = self.trajectory_recorder.analyze_trajectory_efficiency('mathematics')
         self.assertIn('average_efficiency', analysis)
     
+    def test_trajectory_similarity_search(self):
+        """Integration test: recorded trajectories are searchable by knowledge state"""
+        recorder = LearningTrajectoryRecorder(tempfile.mkdtemp())
+        rng = np.random.default_rng(0)
+        starts, targets = rng.random((40, 4)), rng.random((40, 4))
+        
+        for i, (start, target) in enumerate(zip(starts, targets)):
+            recorder.record_learning_trajectory(LearningTrajectory(
+                trajectory_id=f"similar_{i}",
+                start_knowledge=start.tolist(),
+                target_knowledge=target.tolist(),
+                path_coordinates=[start.tolist(), target.tolist()],
+                optimal_geodesic=[start.tolist(), target.tolist()],
+                learning_velocity=[0.02],
+                complexity_profile=[0.5, 0.9],
+                efficiency_score=0.8,
+                educational_quality=0.9,
+                learner_metadata={'domain': 'mathematics'},
+                timestamp=datetime.now().isoformat()
+            ))
+        
+        # Nearest neighbours agree with a brute-force scan
+        query_start, query_target = starts[7] + 0.01, targets[7] - 0.01
+        result = recorder.find_similar_trajectories(query_start, query_target, k=5)
+        distances = np.linalg.norm(np.hstack([starts, targets]) - np.concatenate([query_start, query_target]), axis=1)
+        self.assertEqual(result['trajectory_ids'], [f"similar_{i}" for i in np.argsort(distances)[:5]])
+        
+        within = recorder.find_trajectories_within(start_knowledge=query_start, radius=0.3)
+        expected = np.sum(np.linalg.norm(starts - query_start, axis=1) <= 0.3)
+        self.assertEqual(len(within['trajectory_ids']), expected)
+        
+        # Every trajectory, the first included, is written to the index exactly once
+        indexed_ids = (recorder.index_dir / "knowledge_state_ids_d4.txt").read_text(encoding='utf-8').splitlines()
+        self.assertEqual(indexed_ids, [f"similar_{i}" for i in range(40)])
+        
+        # Index is persistent
+        reopened = LearningTrajectoryRecorder(str(recorder.data_dir))
+        reopened_result = reopened.find_similar_trajectories(query_start, query_target, k=5)
+        self.assertEqual(reopened_result['trajectory_ids'], result['trajectory_ids'])
+        
+        # ...and rebuilt from trajectory files when missing, skipping unrelated JSON files
+        shutil.rmtree(recorder.index_dir)
+        (recorder.data_dir / "notes.json").write_text('{"comment": "not a trajectory"}')
+        rebuilt = LearningTrajectoryRecorder(str(recorder.data_dir))
+        rebuilt_result = rebuilt.find_similar_trajectories(query_start, query_target, k=5)
+        self.assertEqual(rebuilt_result['trajectory_ids'], result['trajectory_ids'])
+        
+        # Batches for metric learning skip the stray JSON file too
+        batches = list(rebuilt.iter_trajectory_batches(batch_size=16))
+        self.assertEqual(sorted(record['trajectory_id'] for batch in batches for record in batch),
+                         sorted(f"similar_{i}" for i in range(40)))
+        MetricEstimator(EducationalManifold(dimension=4)).fit(batches)
+    
     def test_consciousness_field_actualization(self):
         """Integration test: actualization through consciousness field"""
         # 1. Create potential state
@@ -178,7 +234,14 @@ class TestCompleteWorkflow(unittest.TestCase):
             
             # Verify calculation completed successfully
             self.assertIn('trajectory', result)
-            self.assertGreater(len(result['trajectory']), 10)
+            trajectory = result['trajectory']
+            np.testing.assert_allclose(trajectory[0], start)
+            self.assertTrue(np.all(np.diff(result['time']) > 0))
+            if result['converged']:
+                self.assertLessEqual(np.linalg.norm(trajectory[-1] - target),
+                                     manifold.convergence_tolerance + 1e-9)
+            else:
+                self.assertAlmostEqual(result['time'][-1], 50.0)
         
         # Verify computation time grows reasonably with dimensionality
         for i in range(1, len(computation_times)):
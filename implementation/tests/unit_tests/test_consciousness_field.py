@@ -2,6 +2,7 @@ import unittest
 import numpy as np
 from implementation.api.consciousness_field.phi_calculator import PhiActivationCalculator, ConsciousnessState
 from implementation.api.consciousness_field.field_operator import ConsciousnessFieldOperator, DoubleSlitSimulator
+from implementation.api.consciousness_field.phi_monitor import StreamingPhiMonitor
 
 class TestConsciousnessField(unittest.TestCase):
     
@@ -136,6 +137,29 @@ class TestConsciousnessField(unittest.TestCase):
         self.assertGreater(properties['coherence_length'], 0)
         self.assertGreater(properties['decoherence_time'], 0)
         self.assertEqual(len(properties['energy_levels']), 5)
+    
+    def test_streaming_phi_monitor(self):
+        """Test sliding-window φ(S) monitoring and threshold events"""
+        monitor = StreamingPhiMonitor(window_size=3, activation_threshold=0.8,
+                                      deactivation_threshold=0.7)
+        
+        samples = [(0.95, 0.95, 0.95), (0.9, 0.9, 0.9), (0.5, 0.5, 0.5), (0.5, 0.5, 0.5)]
+        events = [monitor.update('learner', *sample, timestamp=t) for t, sample in enumerate(samples)]
+        
+        # Activation on the first sample, deactivation once the window average drops
+        self.assertEqual(events[0].event_type, 'activation')
+        self.assertIsNone(events[1])
+        self.assertEqual(events[2].event_type, 'deactivation')
+        self.assertIsNone(events[3])
+        
+        # Windowed φ matches recomputation over the last window_size samples
+        expected = np.mean([np.prod(sample) for sample in samples[-3:]])
+        self.assertAlmostEqual(monitor.windowed_phi('learner')['phi_total'], expected)
+        
+        # Batch updates with repeated subjects match sequential updates
+        batch_monitor = StreamingPhiMonitor(window_size=3)
+        batch_monitor.update_batch(['learner'] * 4, *zip(*samples))
+        self.assertAlmostEqual(batch_monitor.windowed_phi('learner')['phi_total'], expected)
 
 if __name__ == '__main__':
     unittest.main()
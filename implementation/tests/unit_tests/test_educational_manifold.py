@@ -1,6 +1,12 @@
+import os
+import tempfile
 import unittest
 import numpy as np
 from implementation.api.educational_manifold.geodesic_navigator import EducationalManifold, LearningState
+from implementation.api.educational_manifold.metric_field import ComplexityMetric, CallableMetric
+from implementation.api.educational_manifold.metric_learning import MetricEstimator
+from implementation.api.educational_manifold.path_compression import segment_distances
+from implementation.api.educational_manifold.curriculum_planner import CurriculumGraph
 
 class TestEducationalManifold(unittest.TestCase):
     
@@ -38,6 +44,28 @@ class TestEducationalManifold(unittest.TestCase):
                 for j in range(4):
                     self.assertAlmostEqual(christoffel[m, i, j], christoffel[m, j, i])
     
+    def test_curved_metric_christoffel_symbols(self):
+        """Test position-dependent metric and cached Christoffel symbols"""
+        metric = ComplexityMetric(self.manifold.metric_tensor, self.manifold.complexity_weights)
+        curved = EducationalManifold(dimension=4, metric_field=metric)
+        positions = np.random.random((20, 4))
+        
+        # Analytic symbols agree with finite differences of the same metric
+        analytic = curved.compute_christoffel_symbols(positions)
+        numerical = CallableMetric(4, metric.metric).christoffel_symbols(positions)
+        self.assertEqual(analytic.shape, (20, 4, 4, 4))
+        np.testing.assert_allclose(analytic, numerical, atol=1e-6)
+        self.assertGreater(np.abs(analytic).max(), 0.0)
+        
+        # Grid cache interpolates close to the exact values and reuses nodes
+        cache = curved.enable_christoffel_cache(0.0, 1.0, resolution=9)
+        np.testing.assert_allclose(curved.compute_christoffel_symbols(positions), analytic, atol=1e-2)
+        curved.compute_christoffel_symbols(positions)
+        self.assertGreater(cache.hits, 0)
+        
+        result = curved.compute_learning_geodesic(self.start_state, self.target_state, max_time=50.0)
+        self.assertTrue(np.all(np.isfinite(result['trajectory'])))
+    
     def test_geodesic_computation(self):
         """Test geodesic computation"""
         result = self.manifold.compute_learning_geodesic(
@@ -51,8 +79,120 @@ class TestEducationalManifold(unittest.TestCase):
         self.assertLessEqual(result['efficiency'], 1.0)
         
         trajectory = result['trajectory']
-        self.assertGreater(len(trajectory), 10)
         self.assertEqual(trajectory.shape[1], 4)
+        np.testing.assert_allclose(trajectory[0], self.start_state)
+        
+        # Terminal events end the path at the target, or it runs to max_time
+        self.assertEqual(len(result['time']), len(trajectory))
+        self.assertTrue(np.all(np.diff(result['time']) > 0))
+        if result['converged']:
+            self.assertLessEqual(np.linalg.norm(trajectory[-1] - self.target_state),
+                                 self.manifold.convergence_tolerance + 1e-9)
+        else:
+            self.assertAlmostEqual(result['time'][-1], 50.0)
+    
+    def test_geodesic_early_termination(self):
+        """Test terminal convergence events and near-target stability"""
+        result = self.manifold.compute_learning_geodesic(
+            self.start_state, self.target_state, max_time=100.0, dense_output=True
+        )
+        
+        self.assertTrue(result['converged'])
+        self.assertLess(result['time'][-1], 100.0)
+        self.assertGreater(result['rhs_evaluations'], 0)
+        self.assertLessEqual(np.linalg.norm(result['final_position'] - self.target_state), 0.01 + 1e-9)
+        np.testing.assert_allclose(result['dense_solution'](result['time'][-1])[:4],
+                                   result['final_position'])
+        
+        # Starting right next to the target must not blow up the acceleration term
+        near_start = self.target_state + 0.015 / np.sqrt(4)
+        near_result = self.manifold.compute_learning_geodesic(near_start, self.target_state)
+        self.assertTrue(np.all(np.isfinite(near_result['trajectory'])))
+        self.assertNotIn('dense_solution', near_result)
+    
+    def test_geodesic_cache(self):
+        """Test memoized geodesics for nearly identical requests"""
+        self.manifold.enable_geodesic_cache(max_entries=8, interpolation_tolerance=0.02)
+        
+        first = self.manifold.compute_learning_geodesic(self.start_state, self.target_state)
+        exact = self.manifold.compute_learning_geodesic(self.start_state + 1e-5, self.target_state)
+        shifted_start = self.start_state + 0.01
+        nearby = self.manifold.compute_learning_geodesic(shifted_start, self.target_state)
+        
+        self.assertEqual(exact['cache_hit'], 'exact')
+        np.testing.assert_array_equal(exact['trajectory'], first['trajectory'])
+        self.assertEqual(nearby['cache_hit'], 'interpolated')
+        np.testing.assert_allclose(nearby['trajectory'][0], shifted_start)
+        
+        stats = self.manifold.geodesic_cache_statistics()
+        self.assertEqual((stats['hits'], stats['interpolated_hits'], stats['misses']), (1, 1, 1))
+        
+        # A new metric version never serves stale paths
+        self.manifold.set_metric_field(self.manifold.metric_field)
+        fresh = self.manifold.compute_learning_geodesic(self.start_state, self.target_state)
+        self.assertNotIn('cache_hit', fresh)
+        
+        # Callers get their own arrays: editing one result leaves later hits intact
+        expected = fresh['trajectory'].copy()
+        fresh['trajectory'][:] = 0.0
+        hit = self.manifold.compute_learning_geodesic(self.start_state, self.target_state)
+        np.testing.assert_array_equal(hit['trajectory'], expected)
+        hit['velocity'][:] = 0.0
+        again = self.manifold.compute_learning_geodesic(self.start_state, self.target_state)
+        self.assertTrue(np.any(again['velocity'] != 0.0))
+        
+        # Solver options that change the path are part of the key
+        self.manifold.convergence_tolerance = 0.05
+        loose = self.manifold.compute_learning_geodesic(self.start_state, self.target_state)
+        self.assertNotIn('cache_hit', loose)
+    
+    def test_boundary_value_geodesic(self):
+        """Test two-point boundary-value geodesic solver"""
+        result = self.manifold.solve_geodesic_bvp(self.start_state, self.target_state)
+        
+        self.assertTrue(result['converged'])
+        np.testing.assert_array_equal(result['trajectory'][0], self.start_state)
+        np.testing.assert_array_equal(result['final_position'], self.target_state)
+        self.assertAlmostEqual(result['efficiency'], 1.0)
+        
+        # A neighbouring pair is warm-started from the stored solution
+        neighbour = self.manifold.solve_geodesic_bvp(self.start_state + 0.02, self.target_state - 0.01)
+        self.assertTrue(neighbour['warm_started'])
+        self.assertLessEqual(neighbour['collocation_iterations'], result['collocation_iterations'])
+    
+    def test_batch_geodesic_computation(self):
+        """Test vectorized geodesic integration for many learners"""
+        starts = np.random.random((50, 4))
+        targets = np.random.random((50, 4))
+        
+        result = self.manifold.compute_learning_geodesics_batch(
+            starts, targets, max_time=50.0, n_points=26
+        )
+        
+        self.assertEqual(result['trajectories'].shape, (50, 26, 4))
+        self.assertEqual(result['efficiencies'].shape, (50,))
+        self.assertEqual(result['converged'].shape, (50,))
+        np.testing.assert_allclose(result['trajectories'][:, 0], starts)
+        
+        # Converged rows end within tolerance of their own target
+        distances = np.linalg.norm(result['final_positions'] - targets, axis=1)
+        self.assertTrue(np.all(distances[result['converged']] < 0.01))
+        self.assertTrue(np.all(result['efficiencies'] <= 1.0))
+    
+    def test_batch_geodesic_non_finite_rows(self):
+        """Test that non-finite learners fail without stalling the rest of the batch"""
+        starts = np.random.random((5, 4))
+        starts[2, 1] = np.nan
+        targets = np.random.random((5, 4))
+        
+        result = self.manifold.compute_learning_geodesics_batch(starts, targets, max_time=50.0, n_points=11)
+        
+        np.testing.assert_array_equal(result['failed'], [False, False, True, False, False])
+        self.assertFalse(result['converged'][2])
+        reference = self.manifold.compute_learning_geodesics_batch(
+            np.delete(starts, 2, axis=0), np.delete(targets, 2, axis=0), max_time=50.0, n_points=11
+        )
+        np.testing.assert_allclose(np.delete(result['trajectories'], 2, axis=0), reference['trajectories'])
     
     def test_learning_efficiency_calculation(self):
         """Test learning efficiency calculation"""
@@ -99,6 +239,149 @@ class TestEducationalManifold(unittest.TestCase):
         self.assertGreaterEqual(skill_21, 0.0)
         self.assertLessEqual(skill_21, 1.0)
     
+    def test_curriculum_graph_planning(self):
+        """Test A* with landmark heuristics on a discretized curriculum"""
+        from scipy.sparse.csgraph import dijkstra
+        
+        plain = CurriculumGraph.from_grid(self.manifold, 0.0, 1.0, resolution=6, n_landmarks=0)
+        landmarks = CurriculumGraph.from_grid(self.manifold, 0.0, 1.0, resolution=6, n_landmarks=8, seed=0)
+        
+        source = landmarks.nearest_node(self.start_state)
+        target = landmarks.nearest_node(self.target_state)
+        expected = dijkstra(landmarks.adjacency, directed=False, indices=source)[target]
+        
+        result = landmarks.plan(self.start_state, self.target_state)
+        baseline = plain.shortest_path(source, target)
+        self.assertTrue(result['found'])
+        self.assertAlmostEqual(result['cost'], expected)
+        self.assertAlmostEqual(baseline['cost'], expected)
+        self.assertEqual(result['path'][0], source)
+        self.assertEqual(result['path'][-1], target)
+        self.assertLess(result['nodes_expanded'], baseline['nodes_expanded'])
+        
+        # Heuristic never overestimates the remaining cost
+        exact = dijkstra(landmarks.adjacency, directed=False, indices=target)
+        bound = landmarks.heuristic(np.arange(landmarks.n_nodes), target)
+        self.assertTrue(np.all(bound <= exact + 1e-9))
+    
+    def test_metric_learning_from_trajectories(self):
+        """Test recovering a curved metric from its own geodesics"""
+        truth = EducationalManifold(dimension=3)
+        truth.set_metric_field(ComplexityMetric(truth.metric_tensor, truth.complexity_weights, 0.5))
+        rng = np.random.default_rng(0)
+        starts, targets = rng.random((40, 3)), rng.random((40, 3))
+        batch = truth.compute_learning_geodesics_batch(
+            starts, targets, max_time=4.0, n_points=401, rtol=1e-10, atol=1e-12
+        )
+        
+        # Samples after convergence are frozen, not geodesic: keep the moving part
+        stop = np.nan_to_num(batch['convergence_time'], nan=np.inf)
+        records = []
+        for i in range(len(starts)):
+            moving = batch['time'] < stop[i] - 0.05
+            records.append({
+                'path_coordinates': batch['trajectories'][i][moving].tolist(),
+                'time_points': batch['time'][moving].tolist(),
+                'target_knowledge': targets[i].tolist()
+            })
+        
+        estimator = MetricEstimator(EducationalManifold(dimension=3), degree=2)
+        # Records without path coordinates (e.g. stray JSON files) are skipped
+        learned = estimator.fit([records[:20], records[20:] + [{'comment': 'not a trajectory'}]])
+        self.assertEqual(estimator.statistics()['paths'], 40)
+        self.assertGreater(estimator.statistics()['residual_reduction'], 0.99)
+        
+        probes = rng.random((5, 3))
+        np.testing.assert_allclose(learned.metric(probes), truth.metric_field.metric(probes), atol=1e-3)
+        np.testing.assert_allclose(learned.metric(np.zeros(3)), truth.metric_tensor)
+    
+    def test_geodesic_distance_matrix(self):
+        """Test closed-form flat distances and graph distances written to a memmap"""
+        states = np.random.default_rng(0).random((300, 4))
+        flat = self.manifold.geodesic_distance_matrix(states, block_size=64)
+        eigenvalues, eigenvectors = np.linalg.eigh(self.manifold.metric_tensor)
+        offset = states[5] - states[17]
+        projected = eigenvectors.T @ offset
+        self.assertAlmostEqual(flat[5, 17], np.sqrt(np.sum(np.abs(eigenvalues) * projected**2)))
+        
+        curved = EducationalManifold(dimension=4)
+        curved.set_metric_field(ComplexityMetric(curved.metric_tensor, curved.complexity_weights, 0.5))
+        path = os.path.join(tempfile.mkdtemp(), 'distances.npy')
+        curved.geodesic_distance_matrix(states, path, block_size=64, n_neighbors=8, n_workers=2)
+        distances = np.load(path, mmap_mode='r')
+        self.assertEqual(distances.shape, (300, 300))
+        self.assertTrue(np.allclose(distances, distances.T))
+        self.assertTrue(np.all(np.diag(distances) == 0))
+        # The metric only grows away from the origin, so curved distances dominate flat ones
+        self.assertTrue(np.all(np.asarray(distances) >= flat - 1e-9))
+        # Serial by default, with the same distances as the pool
+        serial = curved.geodesic_distance_matrix(states, block_size=64, n_neighbors=8)
+        self.assertTrue(np.allclose(serial, distances))
+    
+    def test_batch_learning_curve_fitting(self):
+        """Test broadcasting curves and batched per-learner fits"""
+        days = np.array([1, 3, 7, 14, 30, 60, 90, 180], dtype=float)
+        grid = self.manifold.knowledge_retention_curve(
+            np.ones((10, 1, 1)), days[None, :, None], np.array([0.8, 1.0, 1.2])
+        )
+        self.assertEqual(grid.shape, (10, len(days), 3))
+        
+        rng = np.random.default_rng(0)
+        tau = rng.uniform(30, 60, 500)
+        retention = self.manifold.knowledge_retention_curve(1.0, days, tau[:, None] / 45.0)
+        retention[0, 2] = np.nan  # Missing sample
+        fit = self.manifold.fit_retention_curves(days, retention)
+        self.assertTrue(np.all(fit['converged']))
+        self.assertTrue(np.allclose(fit['tau'], tau, rtol=1e-3))
+        
+        beta = rng.uniform(0.5, 0.9, 500)
+        skills = self.manifold.skill_acquisition_curve(days, 1.0)[None, :] ** (beta[:, None] / 0.67)
+        fit = self.manifold.fit_skill_curves(days, skills, max_skill=1.0)
+        self.assertTrue(np.allclose(fit['beta'], beta, rtol=1e-3))
+        self.assertTrue(np.allclose(fit['tau'], 21.0, rtol=1e-3))
+    
+    def test_geodesic_output_modes(self):
+        """Test endpoint, resampled and simplified geodesic output"""
+        full = self.manifold.compute_learning_geodesic(self.start_state, self.target_state)
+        
+        endpoints = self.manifold.compute_learning_geodesic(self.start_state, self.target_state,
+                                                            output='endpoints')
+        self.assertEqual(endpoints['trajectory'].shape, (2, 4))
+        np.testing.assert_allclose(endpoints['trajectory'][-1], full['final_position'])
+        
+        resampled = self.manifold.compute_learning_geodesic(self.start_state, self.target_state,
+                                                            output='resampled', n_output_points=30)
+        self.assertEqual(resampled['trajectory'].shape, (30, 4))
+        self.assertEqual(resampled['complexity_profile'].shape, (30,))
+        self.assertAlmostEqual(resampled['time'][-1], full['time'][-1])
+        np.testing.assert_allclose(resampled['trajectory'][[0, -1]], full['trajectory'][[0, -1]], atol=1e-12)
+        
+        # Every dropped solver point lies within tolerance of the simplified polyline
+        simplified = self.manifold.compute_learning_geodesic(self.start_state, self.target_state,
+                                                             output='simplified', simplify_tolerance=1e-3)
+        self.assertEqual(simplified['solver_points'], len(full['time']))
+        polyline = simplified['trajectory']
+        for point in full['trajectory']:
+            nearest = min(segment_distances(point[None], a, b)[0] for a, b in zip(polyline[:-1], polyline[1:]))
+            self.assertLessEqual(nearest, 1e-3 + 1e-12)
+        
+        with self.assertRaises(ValueError):
+            self.manifold.compute_learning_geodesic(self.start_state, self.target_state, output='every')
+    
+    def test_complexity_profile(self):
+        """Test vectorized complexity profiles for paths and stacked batches"""
+        result = self.manifold.compute_learning_geodesic(self.start_state, self.target_state)
+        profile = result['complexity_profile']
+        self.assertEqual(profile.shape, (len(result['trajectory']),))
+        expected = [np.dot(np.abs(point), self.manifold.complexity_weights) / 4 for point in result['trajectory']]
+        self.assertTrue(np.allclose(profile, expected))
+        
+        starts = np.random.default_rng(0).random((6, 4))
+        batch = self.manifold.compute_learning_geodesics_batch(starts, self.target_state, n_points=21)
+        self.assertEqual(batch['complexity_profiles'].shape, (6, 21))
+        self.assertTrue(np.allclose(batch['complexity_profiles'][2],
+                                    self.manifold.calculate_complexity_profile(batch['trajectories'][2])))
+    
     def test_constrained_optimization(self):
         """Test constrained optimization"""
         constraints = {
@@ -117,6 +400,40 @@ class TestEducationalManifold(unittest.TestCase):
         if result['constraints_met']:
             self.assertLessEqual(np.max(result['complexity_profile']), 1.5)
             self.assertGreaterEqual(result['efficiency'], 0.7)
+    
+    def test_constrained_optimization_pruning(self):
+        """Test candidate pruning and violation reporting"""
+        # Target complexity exceeds the limit: every candidate is pruned
+        result = self.manifold.find_optimal_learning_path(
+            self.start_state, self.target_state, {'max_complexity': 0.9}, seed=0
+        )
+        self.assertFalse(result['constraints_met'])
+        self.assertIn('max_complexity', result['constraint_violations'])
+        self.assertEqual(result['candidates_pruned'], result['candidates_evaluated'])
+        
+        # A start already above the limit is pruned before integrating
+        result = self.manifold.find_optimal_learning_path(
+            self.target_state, self.start_state, {'max_complexity': 0.9}, seed=0
+        )
+        self.assertEqual(result['candidates_pruned'], result['candidates_evaluated'])
+        
+        # The process pool is opt-in and finds the same path as the serial default
+        serial = self.manifold.find_optimal_learning_path(
+            self.start_state, self.target_state, n_starts=2, refine_evaluations=10, seed=0
+        )
+        pooled = self.manifold.find_optimal_learning_path(
+            self.start_state, self.target_state, n_starts=2, refine_evaluations=10, seed=0, n_workers=2
+        )
+        np.testing.assert_allclose(pooled['initial_velocity'], serial['initial_velocity'])
+        
+        # A tight deadline needs a faster start than the default geodesic
+        default = self.manifold.compute_learning_geodesic(self.start_state, self.target_state)
+        result = self.manifold.find_optimal_learning_path(
+            self.start_state, self.target_state, {'max_time': 3.0}, seed=0
+        )
+        self.assertGreater(default['time'][-1], 3.0)
+        self.assertTrue(result['constraints_met'])
+        self.assertLessEqual(result['time'][-1], 3.0)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,406 @@
+import os
+import tempfile
+import unittest
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+import networkx as nx
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from dataclasses import asdict
+from implementation.api.mutual_determination.co_creation_optimizer import (
+    CoCreationOptimizer, CoCreationPhase, bit_counts
+)
+from implementation.api.mutual_determination.network_aggregates import (
+    NetworkAggregates, column_health_metrics
+)
+from implementation.api.mutual_determination.network_layout import coarsen
+from implementation.api.mutual_determination.relationship_analyzer import (
+    MutualDeterminationAnalyzer, Relationship
+)
+from implementation.api.mutual_determination.relationship_store import NetworkXRelationshipStore
+from implementation.api.mutual_determination.spectral_analysis import SpectralAnalyzer
+
+RELATIONSHIP_TYPES = ['educational', 'creative', 'supportive', 'challenging']
+
+def random_relationships(n_entities, n_relationships, seed=0):
+    """Random multigraph of relationships, with repeated pairs and self-loops"""
+    rng = np.random.default_rng(seed)
+    sources = rng.integers(0, n_entities, n_relationships)
+    targets = rng.integers(0, n_entities, n_relationships)
+    return [
+        Relationship(f"Entity_{sources[i]}", f"Entity_{targets[i]}", float(rng.random()),
+                     RELATIONSHIP_TYPES[rng.integers(4)], float(rng.random()), float(i))
+        for i in range(n_relationships)
+    ]
+
+class TestMutualDetermination(unittest.TestCase):
+
+    def setUp(self):
+        self.analyzer = MutualDeterminationAnalyzer()
+        for relationship in random_relationships(40, 300):
+            self.analyzer.add_relationship(relationship)
+
+    def test_mutual_determination_tensor(self):
+        """Test the sparse tensor against a pairwise reference"""
+        tensor = self.analyzer.compute_mutual_determination_tensor()
+        graph = self.analyzer.relationship_graph
+        entities = list(graph.nodes())
+        self.assertEqual(tensor.shape, (len(entities), len(entities)))
+
+        def weight(source, target):
+            edges = (graph.get_edge_data(source, target) or {}).values()
+            return sum(data['strength'] * data['coherence'] for data in edges)
+
+        dense = tensor.toarray()
+        for i, entity_i in enumerate(entities):
+            incident = [data for _, _, data in graph.in_edges(entity_i, data=True)]
+            incident += [data for _, _, data in graph.out_edges(entity_i, data=True)]
+            expected = min(1.0, np.mean([data['strength'] for data in incident]) *
+                           np.mean([data['coherence'] for data in incident]))
+            self.assertAlmostEqual(dense[i, i], expected)
+            for j, entity_j in enumerate(entities):
+                if i != j:
+                    expected = min(1.0, (weight(entity_i, entity_j) + weight(entity_j, entity_i)) / 2)
+                    self.assertAlmostEqual(dense[i, j], expected)
+
+    def test_incremental_tensor_and_health(self):
+        """Test dirty-entry tensor patches and running health aggregates"""
+        self.analyzer.compute_mutual_determination_tensor()
+        for relationship in random_relationships(60, 200, seed=1):
+            self.analyzer.add_relationship(relationship)
+        patched = self.analyzer.compute_mutual_determination_tensor().toarray()
+
+        self.analyzer.tensor_field = None
+        rebuilt = self.analyzer.compute_mutual_determination_tensor().toarray()
+        np.testing.assert_allclose(patched, rebuilt, atol=1e-12)
+
+        # Running totals match a rescan of the edge list
+        graph = self.analyzer.relationship_graph
+        edges = list(graph.edges(data=True))
+        reciprocal = sum(1 for source, target, _ in edges if graph.has_edge(target, source))
+        educational = [data for _, _, data in edges if data['type'] in ['educational', 'supportive']]
+        health = self.analyzer.analyze_network_health()
+        self.assertAlmostEqual(health['network_health']['reciprocity'], reciprocal / len(edges))
+        self.assertAlmostEqual(health['network_health']['coherence'],
+                               np.mean([data['coherence'] for _, _, data in edges]))
+        self.assertAlmostEqual(health['educational_metrics']['efficiency'],
+                               np.mean([data['strength'] for data in educational]) *
+                               np.mean([data['coherence'] for data in educational]))
+        self.assertEqual(health['network_health']['relationship_count'], 500)
+
+        # Sparse-algebra recomputation from the store columns agrees with the running totals
+        recomputed = self.analyzer.analyze_network_health(recompute=True)
+        for section in ('network_health', 'educational_metrics'):
+            for metric, value in health[section].items():
+                self.assertAlmostEqual(recomputed[section][metric], value)
+
+    def test_store_backends(self):
+        """Test the columnar store against the networkx backend"""
+        networkx_analyzer = MutualDeterminationAnalyzer(store=NetworkXRelationshipStore())
+        for relationship in random_relationships(40, 300):
+            networkx_analyzer.add_relationship(relationship)
+        np.testing.assert_allclose(self.analyzer.compute_mutual_determination_tensor().toarray(),
+                                   networkx_analyzer.compute_mutual_determination_tensor().toarray())
+        self.assertEqual(self.analyzer.analyze_network_health(), networkx_analyzer.analyze_network_health())
+
+        # Edge indexes agree with the exported graph
+        store = self.analyzer.store
+        graph = store.to_networkx()
+        self.assertEqual(graph.number_of_edges(), 300)
+        self.assertIs(self.analyzer.relationship_graph, graph)
+        with self.assertRaises(nx.NetworkXError):
+            graph.add_edge('Entity_0', 'Entity_1')  # Exports are read-only
+        columns = store.columns()
+        for entity, code in store.entity_index.items():
+            self.assertEqual(len(store.out_edge_ids(code)), graph.out_degree(entity))
+            self.assertEqual(len(store.in_edge_ids(code)), graph.in_degree(entity))
+            self.assertTrue(np.all(columns['source'][store.out_edge_ids(code)] == code))
+        between = store.edge_ids_between(store.entity_index['Entity_0'], store.entity_index['Entity_1'])
+        self.assertEqual(len(between), graph.number_of_edges('Entity_0', 'Entity_1'))
+
+        # Wrapping an existing graph, then editing it directly, round-trips through refresh
+        wrapped = MutualDeterminationAnalyzer(store=NetworkXRelationshipStore(graph.copy()))
+        np.testing.assert_allclose(wrapped.compute_mutual_determination_tensor().toarray(),
+                                   self.analyzer.compute_mutual_determination_tensor().toarray())
+        wrapped.store.graph.add_edge('Entity_0', 'Entity_1', strength=1.0, type='creative',
+                                     coherence=1.0, timestamp=0.0)
+        wrapped.rebuild()
+        self.assertEqual(wrapped.analyze_network_health()['network_health']['relationship_count'], 301)
+
+    def test_bulk_ingestion(self):
+        """Test bulk loads from arrays, DataFrames and files against single adds"""
+        frame = pd.DataFrame([asdict(relationship) for relationship in random_relationships(40, 300)])
+        expected_tensor = self.analyzer.compute_mutual_determination_tensor().toarray()
+        expected_health = self.analyzer.analyze_network_health()
+
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, 'relationships.csv')
+            jsonl_path = os.path.join(directory, 'relationships.jsonl')
+            frame.to_csv(csv_path, index=False)
+            frame.to_json(jsonl_path, orient='records', lines=True)
+            sources = {
+                'arrays': {name: frame[name].to_numpy() for name in frame.columns},
+                'dataframe': frame,
+                'chunks': [frame.iloc[:120], frame.iloc[120:]],
+                'csv': csv_path,
+                'jsonl': jsonl_path
+            }
+            for name, relationships in sources.items():
+                with self.subTest(source=name):
+                    analyzer = MutualDeterminationAnalyzer()
+                    self.assertEqual(analyzer.add_relationships_bulk(relationships, chunk_size=70), 300)
+                    self.assertEqual(analyzer.store.entities, self.analyzer.store.entities)
+                    np.testing.assert_allclose(analyzer.compute_mutual_determination_tensor().toarray(),
+                                               expected_tensor)
+                    health = analyzer.analyze_network_health()
+                    for section in ('network_health', 'educational_metrics'):
+                        for metric, value in expected_health[section].items():
+                            self.assertAlmostEqual(health[section][metric], value)
+
+        # Single adds after a bulk load keep the pair totals and tensor patches consistent
+        analyzer = MutualDeterminationAnalyzer()
+        analyzer.add_relationships_bulk(frame.iloc[:150])
+        analyzer.compute_mutual_determination_tensor()
+        for row in frame.iloc[150:].itertuples(index=False):
+            analyzer.add_relationship(Relationship(*row))
+        np.testing.assert_allclose(analyzer.compute_mutual_determination_tensor().toarray(), expected_tensor)
+        self.assertAlmostEqual(analyzer.analyze_network_health()['network_health']['reciprocity'],
+                               expected_health['network_health']['reciprocity'])
+        with self.assertRaises(ValueError):
+            analyzer.add_relationships_bulk({'source_entity': ['Entity_0']})
+
+    def test_windowed_health(self):
+        """Test streaming window health against per-window recomputation"""
+        # Timestamps run 0..299; windows of 50 sliding by 20, then tumbling by 75
+        for window, step in [(50.0, 20.0), (75.0, None), (10.0, 40.0)]:
+            series = self.analyzer.health_time_series(window, step)
+            self.assertEqual(series['window_start'][0], 0.0)
+            for w, window_start in enumerate(series['window_start']):
+                expected = self.analyzer.analyze_window(window_start, window_start + window)
+                self.assertEqual(series['relationship_count'][w],
+                                 expected['network_health']['relationship_count'])
+                self.assertEqual(series['entity_count'][w], expected['network_health']['entity_count'])
+                for metric in ('reciprocity', 'coherence', 'complexity'):
+                    self.assertAlmostEqual(series[metric][w], expected['network_health'][metric])
+                self.assertAlmostEqual(series['educational_efficiency'][w],
+                                       expected['educational_metrics']['efficiency'])
+                self.assertAlmostEqual(series['creative_potential'][w],
+                                       expected['educational_metrics']['creative_potential'])
+
+        # A window spanning all history matches the full network
+        full = self.analyzer.analyze_window(0.0, 300.0)
+        self.assertAlmostEqual(full['network_health']['reciprocity'],
+                               self.analyzer.analyze_network_health()['network_health']['reciprocity'])
+        self.assertEqual(self.analyzer.analyze_window(300.0, 400.0)['network_health']['relationship_count'], 0)
+
+        # Bulk retraction, also of single adds, leaves the totals of the remaining edges
+        rng = np.random.default_rng(1)
+        sources, targets = rng.integers(0, 30, 500), rng.integers(0, 30, 500)
+        strength, coherence, type_codes = rng.random(500), rng.random(500), rng.integers(0, 4, 500)
+        aggregates = NetworkAggregates()
+        aggregates.add_bulk(sources[:400], targets[:400], strength[:400], type_codes[:400],
+                            RELATIONSHIP_TYPES, coherence[:400])
+        for k in range(400, 500):
+            aggregates.add(int(sources[k]), int(targets[k]), strength[k],
+                           RELATIONSHIP_TYPES[type_codes[k]], coherence[k])
+        aggregates.remove_bulk(sources[:250], targets[:250], strength[:250], type_codes[:250],
+                               RELATIONSHIP_TYPES, coherence[:250])
+        expected = column_health_metrics(sources[250:], targets[250:], strength[250:], type_codes[250:],
+                                         RELATIONSHIP_TYPES, coherence[250:])
+        for metric, value in aggregates.metrics().items():
+            self.assertAlmostEqual(value, expected[metric])
+        self.assertEqual(aggregates.active_entities,
+                         len(np.union1d(sources[250:], targets[250:])))
+
+    def test_spectral_analysis(self):
+        """Test sparse and warm-started modes against a dense eigendecomposition"""
+        analyzer = MutualDeterminationAnalyzer()
+        frame = pd.DataFrame([asdict(relationship) for relationship in random_relationships(800, 4000)])
+        analyzer.add_relationships_bulk(frame.iloc[:3900])
+        spectrum = analyzer.analyze_spectrum(k=4)
+        self.assertEqual(spectrum['method'], 'arpack')
+
+        def dense_modes():
+            return np.linalg.eigh(analyzer.compute_mutual_determination_tensor().toarray())
+
+        eigenvalues, eigenvectors = dense_modes()
+        np.testing.assert_allclose(spectrum['eigenvalues'], eigenvalues[::-1][:4], atol=1e-6)
+        self.assertAlmostEqual(spectrum['spectral_gap'], eigenvalues[-1] - eigenvalues[-2], places=6)
+        self.assertAlmostEqual(abs(spectrum['eigenvectors'][:, 0] @ eigenvectors[:, -1]), 1.0, places=6)
+
+        # A slightly changed network warm-starts LOBPCG from the previous modes
+        analyzer.add_relationships_bulk(frame.iloc[3900:])
+        spectrum = analyzer.analyze_spectrum(k=4)
+        self.assertEqual(spectrum['method'], 'lobpcg')
+        self.assertTrue(spectrum['warm_started'])
+        self.assertTrue(spectrum['converged'])
+        eigenvalues, _ = dense_modes()
+        np.testing.assert_allclose(spectrum['eigenvalues'], eigenvalues[::-1][:4], atol=1e-6)
+
+        # LOBPCG stopped before its residuals reach the tolerance falls back to ARPACK
+        capped = SpectralAnalyzer(method='lobpcg', max_iterations=2).dominant_modes(
+            analyzer.compute_mutual_determination_tensor(), k=4)
+        self.assertEqual((capped['method'], capped['lobpcg_fallback'], capped['converged']), ('arpack', True, True))
+        np.testing.assert_allclose(capped['eigenvalues'], eigenvalues[::-1][:4], atol=1e-6)
+
+        # PageRank over the off-diagonal weights matches networkx
+        tensor = analyzer.compute_mutual_determination_tensor().tocoo()
+        graph = nx.Graph()
+        graph.add_nodes_from(range(tensor.shape[0]))
+        graph.add_weighted_edges_from((i, j, w) for i, j, w in zip(tensor.row, tensor.col, tensor.data) if i != j)
+        expected = nx.pagerank(graph, alpha=0.85, tol=1e-12)
+        np.testing.assert_allclose(spectrum['pagerank'], [expected[i] for i in range(tensor.shape[0])], atol=1e-8)
+        self.assertEqual(spectrum['top_influencers'][0][0],
+                         analyzer.store.entities[max(expected, key=expected.get)])
+        with self.assertRaises(ValueError):
+            SpectralAnalyzer(method='power')
+
+    def test_feedback_loops(self):
+        """Test bounded loop enumeration against networkx simple cycles"""
+        graph = nx.DiGraph()
+        for source, target, data in self.analyzer.relationship_graph.edges(data=True):
+            weight = data['strength'] * data['coherence']
+            if weight > graph.get_edge_data(source, target, {'weight': -1.0})['weight']:
+                graph.add_edge(source, target, weight=weight)
+
+        def loop_weight(loop):
+            return np.prod([graph[u][v]['weight'] for u, v in zip(loop, loop[1:] + loop[:1])])
+
+        def canonical(loop):
+            # Rotate so the first entity is the smallest, as the same cycle may start anywhere
+            start = loop.index(min(loop))
+            return tuple(loop[start:] + loop[:start])
+
+        expected = {canonical(loop): loop_weight(loop) for loop in nx.simple_cycles(graph, length_bound=3)}
+        loops = dict((canonical(list(loop)), weight) for loop, weight in self.analyzer.iter_feedback_loops(3))
+        self.assertEqual(set(loops), set(expected))
+        for loop, weight in loops.items():
+            self.assertAlmostEqual(weight, expected[loop])
+
+        # Weight pruning keeps exactly the loops above the bound; workers find the same loops
+        threshold = float(np.median(list(expected.values())))
+        pruned = {canonical(list(loop)) for loop, _ in self.analyzer.iter_feedback_loops(3, threshold, n_workers=2)}
+        self.assertEqual(pruned, {loop for loop, weight in expected.items() if weight >= threshold})
+
+        # A consumer may stop early; pending pool tasks are cancelled on close
+        stream = self.analyzer.iter_feedback_loops(3, n_workers=2)
+        first_loop, _ = next(stream)
+        stream.close()
+        self.assertIn(canonical(list(first_loop)), expected)
+
+        statistics = self.analyzer.analyze_feedback_loops(max_length=3, top_n=5)
+        self.assertEqual(statistics['loop_count'], len(expected))
+        self.assertEqual(sum(statistics['loops_by_length'].values()), len(expected))
+        self.assertAlmostEqual(statistics['strongest_loops'][0][1], max(expected.values()))
+
+        # An empty network has no loops
+        empty = MutualDeterminationAnalyzer()
+        self.assertEqual(list(empty.iter_feedback_loops()), [])
+        self.assertEqual(empty.analyze_feedback_loops()['loop_count'], 0)
+
+    def test_cached_layout_and_rendering(self):
+        """Test layout reuse and single-collection rendering, plain and aggregated"""
+        with tempfile.TemporaryDirectory() as directory:
+            self.analyzer.visualize_network(os.path.join(directory, 'network.png'))
+            collections = [c for c in plt.gcf().axes[0].collections if isinstance(c, LineCollection)]
+            self.assertEqual(len(collections), 1)
+            self.assertEqual(len(collections[0].get_segments()), 300)
+            plt.close('all')
+
+            # Unchanged network: the cached positions come back as is
+            positions = self.analyzer.layout.positions
+            self.analyzer.visualize_network()
+            self.assertIs(self.analyzer.layout.positions, positions)
+            plt.close('all')
+
+            # Growth seeds the refinement from the previous positions: known entities barely move
+            seeds = positions.copy()
+            for relationship in random_relationships(45, 20, seed=2):
+                self.analyzer.add_relationship(relationship)
+            self.analyzer.visualize_network()
+            plt.close('all')
+            refined = self.analyzer.layout.positions
+            self.assertEqual(refined.shape, (self.analyzer.store.n_entities, 2))
+            moved = np.linalg.norm(refined[:len(seeds)] - seeds, axis=1)
+            spread = np.ptp(seeds, axis=0).max()
+            self.assertLess(np.median(moved), 0.15 * spread)
+            self.assertLess(moved.max(), 0.35 * spread)
+
+            # Above max_nodes, communities are drawn as super-nodes
+            self.analyzer.visualize_network(os.path.join(directory, 'communities.png'), max_nodes=10)
+            tensor = self.analyzer.compute_mutual_determination_tensor()
+            labels = coarsen((tensor - sparse.diags(tensor.diagonal())).tocsr(), 10)
+            self.assertLessEqual(labels.max() + 1, 10)
+            scatter = plt.gcf().axes[0].collections[-1]
+            self.assertEqual(len(scatter.get_offsets()), labels.max() + 1)
+            self.assertTrue(os.path.exists(os.path.join(directory, 'communities.png')))
+            plt.close('all')
+
+        # Structure that propagation cannot merge (disjoint pairs) is bucketed down to the cap
+        pairs = sparse.csr_matrix((np.ones(600), (np.arange(600), np.arange(600) ^ 1)), shape=(600, 600))
+        labels = coarsen(pairs, 10)
+        self.assertEqual(labels.max() + 1, 10)
+        self.assertTrue(np.all(labels[0::2] == labels[1::2]))
+
+    def test_co_creation_scoring(self):
+        """Test signature-grouped scoring and top-k against a pair-by-pair reference"""
+        rng = np.random.default_rng(3)
+        types = RELATIONSHIP_TYPES + ['mentoring', 'reflective', 'playful', 'critical']
+        analyzer = MutualDeterminationAnalyzer()
+        for k in range(150):
+            analyzer.add_relationship(Relationship(
+                f"Entity_{rng.integers(70)}", f"Entity_{rng.integers(70)}", float(rng.random()),
+                types[rng.integers(len(types))], float(rng.random()), float(k)))
+        optimizer = CoCreationOptimizer(analyzer)
+        optimizer.optimization_threshold = 0.3
+
+        # Reference: Jaccard over outgoing type sets, synergy from creative flags
+        graph = analyzer.relationship_graph
+        entities = analyzer.store.entities
+        out_types = {e: {d['type'] for _, _, d in graph.out_edges(e, data=True)} for e in entities}
+        expected = {}
+        for a in range(len(entities)):
+            for b in range(a + 1, len(entities)):
+                t1, t2 = out_types[entities[a]], out_types[entities[b]]
+                union = t1 | t2
+                complementarity = 1 - len(t1 & t2) / len(union) if union else 0.0
+                synergy = 0.2 + 0.3 * ('creative' in t1) + 0.3 * ('creative' in t2)
+                if complementarity * synergy > 0.3:
+                    expected[(entities[a], entities[b])] = complementarity * synergy
+        self.assertGreater(len(expected), 0)
+
+        # Portable popcount over full 64-bit words
+        words = rng.integers(0, np.iinfo(np.int64).max, 200, dtype=np.int64).astype(np.uint64)
+        words[:2] = [0, np.iinfo(np.uint64).max]
+        self.assertEqual(bit_counts(words).tolist(), [bin(int(word)).count('1') for word in words])
+
+        # Signature groups: a stricter threshold keeps exactly the stronger reference pairs
+        optimizer.optimization_threshold = 0.45
+        strict = optimizer.score_pairs()
+        self.assertEqual({(entities[i], entities[j]) for _, i, j in strict},
+                         {pair for pair, strength in expected.items() if strength > 0.45})
+        optimizer.optimization_threshold = 0.3
+
+        opportunities = optimizer.identify_co_creation_opportunities(block_size=16)
+        scores = {tuple(op.entities): op.potential_strength for op in opportunities}
+        self.assertEqual(scores.keys(), expected.keys())
+        for pair, strength in expected.items():
+            self.assertAlmostEqual(scores[pair], strength)
+        strengths = [op.potential_strength for op in opportunities]
+        self.assertEqual(strengths, sorted(strengths, reverse=True))
+
+        # Top-k keeps the head of the full ranking, whatever the tiling
+        top = optimizer.identify_co_creation_opportunities(top_k=10, block_size=7)
+        self.assertEqual([op.entities for op in top], [op.entities for op in opportunities[:10]])
+
+        # Phases come from the relationships already linking each pair
+        for op in opportunities:
+            e1, e2 = op.entities
+            if not graph.has_edge(e1, e2) and not graph.has_edge(e2, e1):
+                self.assertEqual(op.phase, CoCreationPhase.POTENTIAL_ALIGNMENT)
+
+if __name__ == '__main__':
+    unittest.main()